@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Measure files/sec of ClassificationAgent's per-file scan on a synthetic corpus.
+
+Usage:
+    python benchmarks/classification_benchmark.py --notes 100000
+    python benchmarks/classification_benchmark.py --notes 100000 --workers 1 2 4 8
+    python benchmarks/classification_benchmark.py --notes 1000 --large-mb 200
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crew.utils.note_scanner import scan_note
+from crew.utils.note_classifier import classify_many
+
+TAGS = ["youtube", "video", "article", "blog", "book", "process", "workflow", "idea", "inbox", "meeting"]
+WORDS = "the of and to in is that for it as with was on be by this are from at or an have not".split()
+
+
+def generate(root: Path, count: int, seed: int = 7) -> list:
+    """Write count notes of varying length with frontmatter and hashtags."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(50, 1500))]
+        for _ in range(rng.randint(0, 4)):
+            words.insert(rng.randrange(len(words)), f"#{rng.choice(TAGS)}")
+        path = root / f"note-{i:06d}.md"
+        path.write_text(
+            f"---\ntitle: Note {i}\ncreated: 2024-01-{i % 28 + 1:02d}\nsource: synthetic\n---\n"
+            f"# Note {i}\n\n{' '.join(words)}\n",
+            encoding="utf-8"
+        )
+        paths.append(path)
+    return paths
+
+
+def legacy_scan(path: Path):
+    """The previous implementation: two full reads and decodes per file."""
+    with open(path, 'r', encoding='utf-8') as file:
+        hashtags = list(set(tag.lower() for tag in re.findall(r'#(\w+)', file.read())))
+    metadata = {}
+    with open(path, 'r', encoding='utf-8') as file:
+        match = re.search(r'^---\s+(.*?)\s+---', file.read(), re.DOTALL)
+        if match:
+            for line in match.group(1).split('\n'):
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    metadata[key.strip()] = value.strip()
+    return metadata, hashtags
+
+
+def measure(scan, paths) -> float:
+    started = time.perf_counter()
+    for path in paths:
+        scan(path)
+    return len(paths) / (time.perf_counter() - started)
+
+
+def peak_memory(scan, path: Path) -> int:
+    """Peak bytes allocated while scanning one file."""
+    tracemalloc.start()
+    try:
+        scan(path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def generate_large(path: Path, megabytes: int) -> None:
+    """Write a transcript-like note of roughly the given size."""
+    line = "speaker: and then we talked about the #roadmap and the café #東京 plans\n"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("---\ntitle: Transcript\n---\n")
+        for _ in range(megabytes * 1024 * 1024 // len(line.encode("utf-8"))):
+            f.write(line)
+
+
+def measure_bulk(paths, workers: int, chunk_size: int) -> float:
+    started = time.perf_counter()
+    for _ in classify_many(paths, workers=workers, chunk_size=chunk_size):
+        pass
+    return len(paths) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--notes", type=int, default=100000)
+    parser.add_argument("--workers", type=int, nargs="*", default=[],
+                        help="Also measure classify_many with these worker counts")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--large-mb", type=int, default=0,
+                        help="Also compare peak memory on a single note of this many MiB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = generate(Path(tmp), args.notes)
+        # Warm the page cache so both variants measure parsing, not disk reads
+        measure(scan_note, paths)
+        legacy = measure(legacy_scan, paths)
+        single = measure(scan_note, paths)
+        bulk = {workers: measure_bulk(paths, workers, args.chunk_size) for workers in args.workers}
+        if args.large_mb:
+            large = Path(tmp) / "large.md"
+            generate_large(large, args.large_mb)
+            legacy_peak = peak_memory(legacy_scan, large)
+            streaming_peak = peak_memory(scan_note, large)
+    print(f"{args.notes} notes ({os.cpu_count()} CPUs)")
+    print(f"  two reads + decodes: {legacy:>10.0f} files/sec")
+    print(f"  streaming scan:      {single:>10.0f} files/sec ({single / legacy:.2f}x)")
+    for workers, rate in bulk.items():
+        print(f"  classify_many x{workers:<3}  {rate:>10.0f} files/sec ({rate / single:.2f}x)")
+    if args.large_mb:
+        print(f"{args.large_mb} MiB note, peak memory")
+        print(f"  two reads + decodes: {legacy_peak / 2 ** 20:>10.1f} MiB")
+        print(f"  streaming scan:      {streaming_peak / 2 ** 20:>10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
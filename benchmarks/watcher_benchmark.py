@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare detection latency and idle CPU of the file watcher's event sources.
+
+Usage:
+    python benchmarks/watcher_benchmark.py --files 10000 100000 --poll-interval 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crew.utils.file_events import PollingEventSource, InotifyEventSource, inotify_available
+
+
+def populate(root: Path, count: int) -> None:
+    """Create count small notes in root."""
+    for i in range(count):
+        with open(root / f"note-{i:06d}.md", "w") as f:
+            f.write(f"# Note {i}\n\n#inbox\n")
+
+
+def measure(source, root: Path, idle_seconds: float, trials: int) -> dict:
+    """Measure one started source: CPU while idle and latency of new-file detection."""
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    while time.perf_counter() - wall_start < idle_seconds:
+        source.poll(0.1)
+    idle_cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+
+    latencies = []
+    for trial in range(trials):
+        path = root / f"incoming-{trial}.md"
+        written = time.perf_counter()
+        path.write_text("new")
+        while not any(event.path == path for event in source.poll(0.1)):
+            pass
+        latencies.append(time.perf_counter() - written)
+    return {"idle_cpu": idle_cpu, "latency_median": statistics.median(latencies), "latency_max": max(latencies)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--idle-seconds", type=float, default=10.0)
+    parser.add_argument("--trials", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'files':>8}  {'source':<8}  {'start s':>8}  {'idle CPU':>8}  {'median s':>9}  {'max s':>7}")
+    for count in args.files:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            populate(root, count)
+            sources = {"polling": lambda: PollingEventSource(root, poll_interval=args.poll_interval)}
+            if inotify_available():
+                sources["inotify"] = lambda: InotifyEventSource(root)
+            for name, factory in sources.items():
+                source = factory()
+                started = time.perf_counter()
+                source.start()
+                start_seconds = time.perf_counter() - started
+                result = measure(source, root, args.idle_seconds, args.trials)
+                source.close()
+                for path in root.glob("incoming-*.md"):
+                    path.unlink()
+                print(f"{count:>8}  {name:<8}  {start_seconds:>8.3f}  {result['idle_cpu']:>7.1%}  "
+                      f"{result['latency_median']:>9.4f}  {result['latency_max']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     # file_watche settings
     watcher_path: Optional[str] = None  # Matches your env variable name
     watch_poll_interval: int = 5
+    watcher_journal_path: Optional[str] = None  # Defaults to <watcher_path>/.crew/watcher_journal.db
     
     # Application settings
     debug: bool = False
@@ -1,8 +1,10 @@
 from crew.agents.base_agent import BaseAgent
 from crewai import Agent
 from typing import List, Optional, Dict, Any
-import re
 from pathlib import Path
+from crew.utils.note_scanner import scan_note
+from crew.utils.classification_rules import ClassificationRules, default_rules
+from crew.utils.note_classifier import classify_note, classify_many, classify_directory
 
 
 class ClassificationAgent:
@@ -16,7 +18,8 @@ class ClassificationAgent:
         backstory: Optional[str] = None,
         verbose: bool = False,
         allow_delegation: bool = True,
-        tools: List = None
+        tools: List = None,
+        rules: Optional[ClassificationRules] = None
     ) -> Agent:
         """
         Create a Classification Agent using the BaseAgent factory.
@@ -29,6 +32,8 @@ class ClassificationAgent:
             verbose: Whether to enable verbose output
             allow_delegation: Whether to allow delegation to other agents
             tools: List of tools the agent can use
+            rules: Classification rules, e.g. ClassificationRules.from_yaml(path);
+                   defaults to DEFAULT_CLASSIFICATION_RULES
             
         Returns:
             Agent: A CrewAI agent configured for content classification
@@ -53,10 +58,15 @@ class ClassificationAgent:
             tools=tools or []
         )
         
+        agent.classification_rules = rules or default_rules()
+        
         # Add classification methods to the agent
         agent.detect_hashtags = ClassificationAgent._detect_hashtags.__get__(agent)
         agent.extract_frontmatter = ClassificationAgent._extract_frontmatter.__get__(agent)
         agent.classify_content = ClassificationAgent._classify_content.__get__(agent)
+        agent.classify_many = ClassificationAgent._classify_many.__get__(agent)
+        agent.classify_directory = ClassificationAgent._classify_directory.__get__(agent)
+        agent.reclassify = ClassificationAgent._reclassify.__get__(agent)
         
         return agent
     
@@ -77,17 +87,11 @@ class ClassificationAgent:
             if isinstance(file_path, str):
                 file_path = Path(file_path)
                 
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-                # Find all hashtags using regex
-                hashtags = re.findall(r'#(\w+)', content)
-                
-                # Deduplicate and normalize
-                hashtags = list(set([tag.lower() for tag in hashtags]))
-                
-                print(f"Detected hashtags in {file_path.name}: {hashtags}")
-                return hashtags
+            # Deduplicated, lowercased hashtags of the body
+            hashtags = scan_note(file_path).hashtags
+            
+            print(f"Detected hashtags in {file_path.name}: {hashtags}")
+            return hashtags
         except Exception as e:
             print(f"Error detecting hashtags in {file_path}: {e}")
             return []
@@ -109,19 +113,8 @@ class ClassificationAgent:
             if isinstance(file_path, str):
                 file_path = Path(file_path)
                 
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-                # Check for frontmatter between --- markers
-                frontmatter_match = re.search(r'^---\s+(.*?)\s+---', content, re.DOTALL)
-                if frontmatter_match:
-                    frontmatter_content = frontmatter_match.group(1)
-                    
-                    # Parse key-value pairs
-                    for line in frontmatter_content.split('\n'):
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            metadata[key.strip()] = value.strip()
+            # YAML frontmatter between the leading --- markers, read without the body
+            metadata = scan_note(file_path).metadata
             
             print(f"Extracted frontmatter from {file_path.name}: {metadata}")
             return metadata
@@ -145,41 +138,9 @@ class ClassificationAgent:
             if isinstance(file_path, str):
                 file_path = Path(file_path)
                 
-            # Detect hashtags and extract metadata
-            hashtags = self.detect_hashtags(file_path)
-            metadata = self.extract_frontmatter(file_path)
-            
-            # Determine content type based on hashtags or file extension
-            content_type = "unknown"
-            if any(tag in hashtags for tag in ["youtube", "video"]):
-                content_type = "video"
-            elif any(tag in hashtags for tag in ["article", "blog"]):
-                content_type = "article"
-            elif any(tag in hashtags for tag in ["book"]):
-                content_type = "book"
-            elif any(tag in hashtags for tag in ["process", "workflow"]):
-                content_type = "process"
-            else:
-                # Fallback to file extension
-                if file_path.suffix.lower() in [".md", ".txt"]:
-                    content_type = "note"
-                elif file_path.suffix.lower() in [".pdf"]:
-                    content_type = "document"
-            
-            # Build classification result
-            classification = {
-                "file_path": str(file_path),
-                "filename": file_path.name,
-                "content_type": content_type,
-                "hashtags": hashtags,
-                "metadata": metadata,
-                # Storage decisions based on source partitioning via hashtags
-                "storage": {
-                    "obsidian": True,  # Always store in Obsidian
-                    "vector_db": len(hashtags) > 0,  # Store in vector DB if hashtags exist
-                    "sql_db": content_type in ["process", "workflow"]  # Store process info in SQL
-                }
-            }
+            # Detect hashtags and extract metadata in a single read of the file
+            classification = classify_note(file_path, getattr(self, "classification_rules", None))
+            content_type = classification["content_type"]
             
             print(f"Classified {file_path.name} as {content_type} with storage decisions: {classification['storage']}")
             return classification
@@ -191,5 +152,55 @@ class ClassificationAgent:
                 "content_type": "unknown",
                 "hashtags": [],
                 "metadata": {},
-                "storage": {"obsidian": True, "vector_db": False, "sql_db": False}
-            }
\ No newline at end of file
+                "storage": (getattr(self, "classification_rules", None) or default_rules()).storage("unknown", [])
+            }
+    
+    @staticmethod
+    def _classify_many(self, paths, workers=None, chunk_size=256, ordered=False, output=None):
+        """
+        Classify many files across a process pool, without per-file output.
+        
+        Args:
+            paths: Paths of the files to classify
+            workers: Number of worker processes (defaults to the CPU count)
+            chunk_size: Paths per submitted chunk
+            ordered: Yield records in input order instead of as chunks complete
+            output: Optional .jsonl or .parquet file to write the records to
+            
+        Returns:
+            Iterator: Compact records with path, content_type, hashtags, metadata and storage
+        """
+        return classify_many(paths, workers=workers, chunk_size=chunk_size, ordered=ordered, output=output,
+                             rules=getattr(self, "classification_rules", None))
+    
+    @staticmethod
+    def _classify_directory(self, root, include=None, exclude=None, **kwargs):
+        """
+        Classify every file below a directory across a process pool.
+        
+        Args:
+            root: Directory to classify, recursively
+            include: File patterns to classify, e.g. ["*.md"]
+            exclude: Directory and file patterns to skip
+            **kwargs: Options for classify_many (workers, chunk_size, ordered, output)
+            
+        Returns:
+            Iterator: Compact records with path, content_type, hashtags, metadata and storage
+        """
+        kwargs.setdefault("rules", getattr(self, "classification_rules", None))
+        return classify_directory(root, include=include, exclude=exclude, **kwargs)
+    
+    @staticmethod
+    def _reclassify(self, records, rules=None):
+        """
+        Re-apply classification rules to already-scanned records without reading the files.
+        
+        Args:
+            records: Records from classify_many, classify_directory or read_records
+            rules: Rules to apply (defaults to the agent's rules)
+            
+        Returns:
+            Iterator: Records with content_type and storage recomputed
+        """
+        rules = rules or getattr(self, "classification_rules", None) or default_rules()
+        return rules.reclassify(records)
\ No newline at end of file
@@ -1,10 +1,19 @@
 from crew.agents.base_agent import BaseAgent
 from crewai import Agent
 from typing import List, Optional
+from collections import Counter
 import os
 import time
 from pathlib import Path
 from config.settings import settings  # Import your settings module
+from crew.utils.file_events import create_event_source, PollingEventSource
+from crew.utils.file_journal import FileJournal, DONE, FAILED
+from crew.utils.snapshot_scanner import SnapshotScanner
+from crew.utils.debouncer import Debouncer
+from crew.utils.work_queue import WorkQueue
+from crew.utils.content_hash import content_hash
+from crew.utils.result_cache import ResultCache
+import threading
 
 
 class FileWatchingAgent:
@@ -18,6 +27,17 @@ class FileWatchingAgent:
         backstory: Optional[str] = None,
         watch_directory: Optional[str] = None,
         poll_interval: int = 5,
+        watch_mode: str = "auto",
+        journal_path: Optional[str] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        quiet_period: float = 2.0,
+        batch_size: int = 16,
+        max_batch_delay: float = 0.5,
+        workers: int = 4,
+        max_queue_size: int = 8,
+        drain_timeout: Optional[float] = 60.0,
+        result_cache: Optional[ResultCache] = None,
         verbose: bool = False,
         allow_delegation: bool = True,
         tools: List = None
@@ -31,7 +51,20 @@ class FileWatchingAgent:
             goal: The goal the agent is trying to achieve
             backstory: The backstory of the agent
             watch_directory: Directory to monitor for new files (overrides env setting)
-            poll_interval: Interval in seconds between file system checks
+            poll_interval: Interval in seconds between file system checks (polling mode)
+            watch_mode: "inotify", "polling", or "auto" (inotify where available, else polling)
+            journal_path: SQLite journal of processed files (overrides env setting)
+            include: File patterns to process, e.g. ["*.md"]; None processes every file
+            exclude: Directory ("name/") and file patterns to skip (defaults to DEFAULT_EXCLUDES)
+            quiet_period: Seconds a file's size and mtime must stay unchanged before it is processed
+            batch_size: Maximum number of files handed to process_batch at once
+            max_batch_delay: Seconds a settled file may wait for its batch to fill
+            workers: Number of worker threads running process_batch
+            max_queue_size: Maximum number of batches waiting for a worker; when reached,
+                            settled files are held back until a worker is free
+            drain_timeout: Seconds stop_watching waits for queued batches (None waits indefinitely)
+            result_cache: Cache of processing results by content hash, reused for renamed and
+                          copied files (defaults to watcher_results.db next to the journal)
             verbose: Whether to enable verbose output
             allow_delegation: Whether to allow delegation to other agents
             tools: List of tools the agent can use
@@ -50,6 +83,13 @@ class FileWatchingAgent:
         # Use Path to handle spaces in path properly
         watch_directory = Path(watch_directory)
         
+        # The journal survives restarts so unchanged files are not reprocessed
+        journal_path = (
+            journal_path
+            or getattr(settings, "watcher_journal_path", None)
+            or watch_directory / ".crew" / "watcher_journal.db"
+        )
+        
         # Create default backstory if none provided
         if not backstory:
             backstory = (
@@ -72,13 +112,30 @@ class FileWatchingAgent:
         # Add file watching specific attributes
         agent.watch_directory = watch_directory
         agent.poll_interval = poll_interval
-        agent.processed_files = set()
+        agent.watch_mode = watch_mode
+        agent.event_source = None
+        agent.journal = FileJournal(journal_path)
+        agent.result_cache = result_cache or ResultCache(Path(journal_path).parent / "watcher_results.db")
+        agent.include = include
+        agent.exclude = exclude
+        agent.scanner = SnapshotScanner(watch_directory, include=include, exclude=exclude)
+        agent.debouncer = Debouncer(quiet_period=quiet_period, batch_size=batch_size,
+                                    max_batch_delay=max_batch_delay)
+        agent.workers = workers
+        agent.max_queue_size = max_queue_size
+        agent.drain_timeout = drain_timeout
+        agent.work_queue = None
+        agent.event_counts = Counter()
+        agent.dedupe_stats = Counter()
+        agent.stats_lock = threading.Lock()
         agent.should_stop = False
         
         # Add file watching methods to the agent
         agent.start_watching = FileWatchingAgent._start_watching.__get__(agent)
         agent.stop_watching = FileWatchingAgent._stop_watching.__get__(agent)
         agent.process_new_file = FileWatchingAgent._process_new_file.__get__(agent)
+        agent.process_batch = FileWatchingAgent._process_batch.__get__(agent)
+        agent.get_metrics = FileWatchingAgent._get_metrics.__get__(agent)
         
         return agent
     
@@ -89,32 +146,179 @@ class FileWatchingAgent:
             self.watch_directory.mkdir(parents=True, exist_ok=True)
             print(f"Created watch directory: {self.watch_directory}")
             
-        print(f"Started watching directory: {self.watch_directory}")
         self.should_stop = False
+        source = create_event_source(self.watch_directory, self.watch_mode, self.poll_interval,
+                                     include=self.include, exclude=self.exclude)
+        try:
+            source.start()
+        except OSError as e:
+            if self.watch_mode != "auto":
+                raise
+            print(f"inotify unavailable ({e}), falling back to polling")
+            source = PollingEventSource(self.watch_directory, poll_interval=self.poll_interval,
+                                        include=self.include, exclude=self.exclude)
+            source.start()
+        self.event_source = source
+        self.work_queue = WorkQueue(self.process_batch, workers=self.workers,
+                                    max_queue_size=self.max_queue_size, name="process").start()
+        print(f"Started watching directory: {self.watch_directory} ({type(source).__name__})")
         
         try:
+            # Files that arrived, changed or disappeared while the watcher was not running
+            self.scanner.scan()
+            files = self.scanner.files
+            removed = self.journal.prune(files)
+            pending = self.journal.changed_files(files)
+            print(f"{len(pending)} new or changed files since last run, {removed} removed "
+                  f"({len(files)} files in {self.scanner.stats['dirs_listed']} directories)")
+            for file_path in sorted(pending):
+                self.debouncer.add(file_path)
+            
             while not self.should_stop:
-                # Get all files in the directory
-                current_files = set(self.watch_directory.glob('*.*'))
-                
-                # Find new files
-                new_files = current_files - self.processed_files
+                # Wait until the next batch could be due; at most a second so stop requests are seen promptly
+                timeout = 0.05 if self.work_queue.full() else self.debouncer.next_timeout(min(self.poll_interval, 1.0))
+                for event in source.poll(timeout):
+                    self.event_counts[event.kind] += 1
+                    if event.kind == "overflow":
+                        # Events were dropped; recover by diffing a new snapshot
+                        diff = self.scanner.scan()
+                        for file_path in diff.removed:
+                            self.debouncer.discard(file_path)
+                            self.journal.remove(file_path)
+                        for file_path in sorted(diff.added + diff.modified):
+                            self.debouncer.add(file_path)
+                    elif event.kind == "moved":
+                        self.debouncer.discard(event.path)
+                        # A processed file that was moved only needs its record updated
+                        try:
+                            moved = self.journal.rename(event.path, event.dest_path)
+                        except FileNotFoundError:
+                            moved = None
+                        if moved is not None:
+                            with self.stats_lock:
+                                self.dedupe_stats["renamed"] += 1
+                        else:
+                            self.debouncer.add(event.dest_path)
+                    elif event.kind in ("created", "modified"):
+                        self.debouncer.add(event.path)
+                    elif event.kind == "deleted":
+                        self.debouncer.discard(event.path)
+                        self.journal.remove(event.path)
                 
-                for file_path in new_files:
-                    print(f"New file detected: {file_path}")
-                    self.process_new_file(file_path)
-                    
-                    # Add to processed files
-                    self.processed_files.add(file_path)
-                
-                # Sleep for the poll interval
-                time.sleep(self.poll_interval)
+                # Hand settled files to the workers in micro-batches; while the queue is full
+                # they stay in the debouncer, where further events for them keep collapsing
+                while not self.work_queue.full():
+                    batch = self.debouncer.next_batch()
+                    if not batch:
+                        break
+                    self.work_queue.submit(batch)
                 
         except Exception as e:
             print(f"Error watching files: {e}")
+        finally:
+            source.close()
+            self.event_source = None
+            # Let queued batches finish; files still in the debouncer are not journaled
+            # and are picked up again by the startup scan of the next run
+            if not self.work_queue.stop(drain=True, timeout=self.drain_timeout):
+                print("Stopped before all queued batches were processed")
         
         print(f"Stopped watching directory: {self.watch_directory}")
     
+    @staticmethod
+    def _process_batch(self, file_paths):
+        """
+        Process a micro-batch of settled files, skipping those unchanged since they were processed.
+        
+        Files whose contents were processed before under another path are not
+        processed again: renames reuse the journal record, copies reuse the
+        cached result of the original.
+        
+        Args:
+            file_paths: Paths released together by the debouncer
+            
+        Returns:
+            list: File information for each file processed or reused successfully
+        """
+        results = []
+        processed = []
+        for file_path in file_paths:
+            try:
+                stat = file_path.stat()
+                if self.journal.is_unchanged(file_path, stat):
+                    continue
+                digest = content_hash(file_path)
+            except FileNotFoundError:
+                continue
+            
+            outcome, file_info = FileWatchingAgent._reuse_result(self, file_path, stat, digest)
+            if outcome is None:
+                print(f"New file detected: {file_path}")
+                file_info = self.process_new_file(file_path)
+                outcome = "processed"
+                if file_info is not None:
+                    self.result_cache.set(digest, file_info)
+            with self.stats_lock:
+                self.dedupe_stats[outcome] += 1
+            processed.append((file_path, DONE if file_info is not None else FAILED, stat, digest))
+            if file_info is not None:
+                results.append(file_info)
+        
+        # Record the state that was processed, so only later changes trigger reprocessing
+        self.journal.mark_many(processed)
+        return results
+    
+    @staticmethod
+    def _reuse_result(self, file_path, stat, digest):
+        """
+        Match a file to a processed file with identical contents.
+        
+        Args:
+            file_path: Path to the file
+            stat: The file's stat result
+            digest: The file's content hash
+            
+        Returns:
+            tuple: ("renamed" or "duplicate", file information), or (None, None) if the file must be processed
+        """
+        renamed_from = self.journal.find_renamed(digest)
+        if renamed_from is not None and renamed_from != str(file_path):
+            self.journal.remove(renamed_from, remember=False)
+            print(f"Renamed file detected: {renamed_from} -> {file_path}")
+            cached = self.result_cache.get(digest) or {}
+            return "renamed", dict(cached, **FileWatchingAgent._file_metadata(file_path, stat),
+                                   renamed_from=renamed_from)
+        
+        duplicate_of = self.journal.find_duplicate(digest, exclude=file_path)
+        if duplicate_of is not None:
+            cached = self.result_cache.get(digest)
+            if cached is not None:
+                print(f"Duplicate file detected: {file_path} (copy of {duplicate_of})")
+                return "duplicate", dict(cached, **FileWatchingAgent._file_metadata(file_path, stat),
+                                         duplicate_of=duplicate_of)
+        return None, None
+    
+    @staticmethod
+    def _get_metrics(self):
+        """
+        Get per-stage metrics of the watcher.
+        
+        Returns:
+            dict: Event counts by kind, debouncer counters with the number of pending
+                  files, work queue metrics (depth, throughput, backpressure) and
+                  processed/renamed/duplicate counts with the dedupe hit rate
+        """
+        with self.stats_lock:
+            dedupe = {key: self.dedupe_stats[key] for key in ("processed", "renamed", "duplicate")}
+        hits = dedupe["renamed"] + dedupe["duplicate"]
+        total = hits + dedupe["processed"]
+        return {
+            "events": dict(self.event_counts),
+            "debounce": dict(self.debouncer.stats, pending=len(self.debouncer)),
+            "process": self.work_queue.get_stats() if self.work_queue else {},
+            "dedupe": dict(dedupe, hit_rate=hits / total if total else 0.0)
+        }
+    
     @staticmethod
     def _stop_watching(self):
         """Stop watching for new files."""
@@ -134,14 +338,7 @@ class FileWatchingAgent:
         """
         try:
             # Extract basic file information
-            file_info = {
-                "path": str(file_path),
-                "filename": file_path.name,
-                "extension": file_path.suffix.lower(),
-                "size": file_path.stat().st_size,
-                "modified_time": file_path.stat().st_mtime,
-                "created_time": file_path.stat().st_ctime
-            }
+            file_info = FileWatchingAgent._file_metadata(file_path)
             
             print(f"Processing new file: {file_info['filename']}")
             
@@ -151,4 +348,26 @@ class FileWatchingAgent:
             
         except Exception as e:
             print(f"Error processing file {file_path}: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    @staticmethod
+    def _file_metadata(file_path, stat=None):
+        """
+        Get the basic information of a file.
+        
+        Args:
+            file_path: Path to the file
+            stat: The file's stat result, if already known
+            
+        Returns:
+            dict: Path, name, extension, size and timestamps
+        """
+        stat = stat or file_path.stat()
+        return {
+            "path": str(file_path),
+            "filename": file_path.name,
+            "extension": file_path.suffix.lower(),
+            "size": stat.st_size,
+            "modified_time": stat.st_mtime,
+            "created_time": stat.st_ctime
+        }
\ No newline at end of file
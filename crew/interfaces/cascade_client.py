@@ -0,0 +1,210 @@
+import re
+import threading
+from collections import Counter
+from typing import Optional, Dict, Any, List, Callable
+
+import yaml
+
+from crew.tools.schemas import validate_response
+from crew.utils.helpers import estimate_tokens
+
+# Cheapest capable model first, strongest last
+DEFAULT_CASCADE = ["llama3.2:latest", "qwen2.5:14b"]
+
+PARAMETER_SIZE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*([bm])\b', re.IGNORECASE)
+
+
+def parse_parameter_size(value: str) -> Optional[float]:
+    """
+    Parse an Ollama parameter size ("3.2B", "137M") or a model tag ("qwen2.5:14b").
+
+    Args:
+        value: Parameter size string or model name
+
+    Returns:
+        float: Size in billions of parameters, or None if not recognized
+    """
+    match = PARAMETER_SIZE_PATTERN.search(value or "")
+    if not match:
+        return None
+    size = float(match.group(1))
+    return size / 1000 if match.group(2).lower() == "m" else size
+
+
+class CascadeClient:
+    """
+    LLM client that runs tool prompts on the cheapest model first.
+
+    A tool response is parsed and validated against the tool's output schema and
+    quality checks; only when that fails is the prompt escalated to the next
+    (larger) model. The last model's response is returned even if it is invalid,
+    so callers keep their usual error handling.
+
+    Compute is estimated as billions of parameters times prompt plus response
+    tokens and compared against sending every call straight to the last model.
+    """
+
+    def __init__(
+        self,
+        client,
+        models: Optional[List[str]] = None,
+        model_sizes: Optional[Dict[str, float]] = None,
+        validator: Callable[[str, str], List[str]] = validate_response
+    ):
+        """
+        Initialize the cascade.
+
+        Args:
+            client: Underlying LLM client (e.g. OllamaClient)
+            models: Models ordered from cheapest to strongest
+            model_sizes: Model sizes in billions of parameters (detected when missing)
+            validator: Function (tool_type, response) -> list of problems
+        """
+        self.client = client
+        self.models = list(models or DEFAULT_CASCADE)
+        self.validator = validator
+        self.model_sizes = {model: self._detect_size(model) for model in self.models}
+        self.model_sizes.update(model_sizes or {})
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_models_config(cls, client, config_path: str, models: Optional[List[str]] = None) -> "CascadeClient":
+        """
+        Create a cascade from a models config (see OllamaClient.export_models_config).
+
+        Without explicit ``models`` the DEFAULT_CASCADE entries present in the
+        config are used, ordered by parameter size.
+
+        Args:
+            client: Underlying LLM client
+            config_path: Path to the models config YAML
+            models: Optional explicit model order
+
+        Returns:
+            CascadeClient: The configured cascade
+        """
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+
+        sizes = {}
+        for family_models in (config.get("models_by_family") or {}).values():
+            for model in family_models:
+                size = parse_parameter_size(model.get("details", {}).get("parameter_size", ""))
+                if size is not None:
+                    sizes[model["name"]] = size
+
+        if models is None:
+            available = set(config.get("all_models") or sizes)
+            models = [model for model in DEFAULT_CASCADE if model in available] or list(DEFAULT_CASCADE)
+            models.sort(key=lambda model: sizes.get(model, 0.0))
+
+        return cls(client, models, model_sizes={m: sizes[m] for m in models if m in sizes})
+
+    def _detect_size(self, model: str) -> float:
+        """Look the model size up in the client's model list, then in its tag."""
+        for info in getattr(self.client, "available_models", None) or []:
+            if info.get("name") == model:
+                size = parse_parameter_size(info.get("details", {}).get("parameter_size", ""))
+                if size is not None:
+                    return size
+        size = parse_parameter_size(model.split(":", 1)[-1])
+        return size if size is not None else 1.0
+
+    def generate(self, prompt: str, model: Optional[str] = None, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Generate text without validation (used for free-text prompts).
+
+        Args:
+            prompt: The prompt to generate from
+            model: Optional model override
+            options: Additional options for generation
+
+        Returns:
+            str: The generated text
+        """
+        return self.client.generate(prompt, model=model, options=options)
+
+    def generate_for_tool(self, prompt: str, tool_type: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Generate a tool response, escalating through the cascade on validation failure.
+
+        Args:
+            prompt: The formatted tool prompt
+            tool_type: Tool type, optionally with a "/variant" suffix
+            options: Additional options for generation
+
+        Returns:
+            str: The first valid response, or the last model's response
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        compute = 0.0
+        response = ""
+        problems: List[str] = []
+        tier = 0
+        for tier, model in enumerate(self.models):
+            response = self.client.generate(prompt, model=model, options=options)
+            compute += self.model_sizes[model] * (prompt_tokens + estimate_tokens(response))
+            problems = self.validator(tool_type, response)
+            if not problems:
+                break
+
+        baseline = self.model_sizes[self.models[-1]] * (prompt_tokens + estimate_tokens(response))
+        self._record(tool_type.split("/", 1)[0], self.models[tier], tier > 0, bool(problems), compute, baseline)
+        return response
+
+    def _record(self, tool: str, model: str, escalated: bool, failed: bool,
+                compute: float, baseline: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(tool, {
+                "calls": 0, "escalations": 0, "failures": 0,
+                "served_by": Counter(), "compute_used": 0.0, "compute_baseline": 0.0
+            })
+            stats["calls"] += 1
+            stats["escalations"] += int(escalated)
+            stats["failures"] += int(failed)
+            stats["served_by"][model] += 1
+            stats["compute_used"] += compute
+            stats["compute_baseline"] += baseline
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cascade statistics.
+
+        Returns:
+            Dict: Per-tool calls, escalations, escalation_rate, failures (invalid
+                  even on the last model) and served_by model counts, plus totals
+                  and compute used/baseline/saved in billion-parameter tokens
+        """
+        with self._lock:
+            tools = {}
+            for tool, stats in self._stats.items():
+                tools[tool] = {
+                    "calls": stats["calls"],
+                    "escalations": stats["escalations"],
+                    "escalation_rate": stats["escalations"] / stats["calls"],
+                    "failures": stats["failures"],
+                    "served_by": dict(stats["served_by"]),
+                    "compute_saved": stats["compute_baseline"] - stats["compute_used"]
+                }
+            calls = sum(s["calls"] for s in self._stats.values())
+            escalations = sum(s["escalations"] for s in self._stats.values())
+            used = sum(s["compute_used"] for s in self._stats.values())
+            baseline = sum(s["compute_baseline"] for s in self._stats.values())
+            return {
+                "models": list(self.models),
+                "tools": tools,
+                "calls": calls,
+                "escalations": escalations,
+                "escalation_rate": escalations / calls if calls else 0.0,
+                "compute_used": used,
+                "compute_baseline": baseline,
+                "compute_saved": baseline - used,
+                "compute_saved_fraction": (baseline - used) / baseline if baseline else 0.0
+            }
+
+    def __getattr__(self, name):
+        # Embeddings, model listing etc. go straight to the underlying client
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
@@ -5,6 +5,9 @@ import os
 from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
 
+# Top-level /api/generate fields; every other generate option is a model parameter
+REQUEST_FIELDS = {"format", "system", "template", "context", "raw", "keep_alive", "images", "suffix"}
+
 class OllamaClient:
     """Client for interacting with Ollama API to run local LLMs."""
     
@@ -43,6 +46,7 @@ class OllamaClient:
         self.temperature = temperature
         self.generate_endpoint = f"{base_url}/api/generate"
         self.embedding_endpoint = f"{base_url}/api/embeddings"
+        self.batch_embedding_endpoint = f"{base_url}/api/embed"
         self.models_endpoint = f"{base_url}/api/tags"
         
         # Store available models
@@ -213,15 +217,18 @@ class OllamaClient:
         payload = {
             "model": model_to_use,
             "prompt": prompt,
-            "temperature": options.get("temperature", self.temperature) if options else self.temperature,
-            "stream": False
+            "stream": False,
+            "options": {"temperature": self.temperature}
         }
         
-        # Add any additional options
+        # Request fields go at the top level; model parameters such as
+        # num_predict and stop must be nested under "options"
         if options:
             for key, value in options.items():
-                if key not in payload:
+                if key in REQUEST_FIELDS:
                     payload[key] = value
+                else:
+                    payload["options"][key] = value
         
         try:
             response = requests.post(self.generate_endpoint, json=payload)
@@ -264,6 +271,46 @@ class OllamaClient:
             print(f"Error getting embeddings: {e}")
             return []
     
+    def get_embeddings_batch(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        """
+        Get embeddings for several texts in one request.
+        
+        Uses the batch ``/api/embed`` endpoint and falls back to one
+        ``/api/embeddings`` request per text on servers that lack it.
+        
+        Args:
+            texts: The texts to embed
+            model: Optional model override for embeddings
+            
+        Returns:
+            List[List[float]]: One embedding vector per text (empty on failure)
+        """
+        if not texts:
+            return []
+        
+        # If model is specified but not available, try to find an alternative
+        if model and not self.is_model_available(model):
+            print(f"Warning: Embedding model '{model}' not available. Falling back to default.")
+            model = self.find_embedding_model()
+            
+        model_to_use = model or self.embedding_model
+        
+        payload = {
+            "model": model_to_use,
+            "input": texts
+        }
+        
+        try:
+            response = requests.post(self.batch_embedding_endpoint, json=payload)
+            response.raise_for_status()
+            embeddings = response.json().get("embeddings", [])
+            if len(embeddings) == len(texts):
+                return embeddings
+        except Exception as e:
+            print(f"Batch embeddings unavailable, embedding individually: {e}")
+        
+        return [self.get_embeddings(text, model_to_use) for text in texts]
+    
     def generate_with_json_output(self, prompt: str, model: Optional[str] = None, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Generate text and attempt to parse it as JSON.
@@ -0,0 +1,324 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+from crew.interfaces.prompt_loader import get_prompt
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    max_iter: int = 50,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity with k-means++ seeding.
+
+    Args:
+        vectors: Row-normalized embedding matrix (n x d)
+        n_clusters: Number of clusters (capped at n)
+        max_iter: Maximum Lloyd iterations
+        seed: Random seed for reproducible seeding
+
+    Returns:
+        np.ndarray: Row-normalized centroid matrix (k x d)
+    """
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    k = min(n_clusters, n)
+
+    # k-means++ on cosine distance
+    centroids = [vectors[rng.integers(n)]]
+    for _ in range(1, k):
+        distance = 1.0 - np.max(vectors @ np.array(centroids).T, axis=1)
+        distance = np.clip(distance, 0.0, None) ** 2
+        total = distance.sum()
+        index = rng.choice(n, p=distance / total) if total > 0 else rng.integers(n)
+        centroids.append(vectors[index])
+    centroids = np.array(centroids)
+
+    labels = None
+    for _ in range(max_iter):
+        similarity = vectors @ centroids.T
+        new_labels = np.argmax(similarity, axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        counts = np.bincount(labels, minlength=k)
+        empty = np.where(counts == 0)[0]
+        if len(empty):
+            # Re-seed empty clusters with the points furthest from their centroid
+            furthest = np.argsort(similarity[np.arange(n), labels])[:len(empty)]
+            sums[empty] = vectors[furthest]
+        centroids = _normalize(sums)
+
+    return centroids
+
+
+class CorpusThemeEngine:
+    """Discovers corpus-level themes by clustering document embeddings."""
+
+    def __init__(
+        self,
+        llm_client,
+        n_clusters: int = 8,
+        embedding_model: Optional[str] = None,
+        batch_size: int = 32,
+        representatives: int = 3,
+        excerpt_chars: int = 600,
+        rename_threshold: float = 0.9,
+        max_workers: int = 4
+    ):
+        """
+        Initialize the theme engine.
+
+        Args:
+            llm_client: Client providing get_embeddings(_batch) and generate
+            n_clusters: Number of themes to discover
+            embedding_model: Optional embedding model override
+            batch_size: Number of documents embedded per request
+            representatives: Documents per cluster shown to the LLM when naming it
+            excerpt_chars: Characters of each representative document in the prompt
+            rename_threshold: A named cluster is renamed once its centroid's cosine
+                              similarity to the centroid it was named at drops below this
+            max_workers: Maximum number of concurrent naming requests
+        """
+        self.llm_client = llm_client
+        self.n_clusters = n_clusters
+        self.embedding_model = embedding_model
+        self.batch_size = batch_size
+        self.representatives = representatives
+        self.excerpt_chars = excerpt_chars
+        self.rename_threshold = rename_threshold
+        self.max_workers = max_workers
+
+        self.document_ids: List[str] = []
+        self.excerpts: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.vectors = np.zeros((0, 0))
+        self.centroids: Optional[np.ndarray] = None
+        self.counts: Optional[np.ndarray] = None
+        self.names: Dict[int, Dict[str, Any]] = {}
+        self.named_centroids: Dict[int, np.ndarray] = {}
+        self.stats = {"documents_embedded": 0, "naming_calls": 0}
+        self._lock = threading.RLock()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batches."""
+        embeddings = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            if hasattr(self.llm_client, "get_embeddings_batch"):
+                embeddings.extend(self.llm_client.get_embeddings_batch(batch, self.embedding_model))
+            else:
+                embeddings.extend(self.llm_client.get_embeddings(text, self.embedding_model) for text in batch)
+        self.stats["documents_embedded"] += len(texts)
+
+        dimension = max((len(e) for e in embeddings), default=0)
+        matrix = np.zeros((len(texts), dimension))
+        for row, embedding in enumerate(embeddings):
+            if len(embedding) == dimension:
+                matrix[row] = embedding
+        return _normalize(matrix)
+
+    def add_documents(self, documents: Dict[str, str]) -> None:
+        """
+        Embed documents and fold them into the clustering.
+
+        The first call with at least ``n_clusters`` documents runs a full k-means;
+        afterwards new documents update their nearest centroid incrementally
+        (mini-batch k-means). Re-adding a document id replaces its embedding
+        without counting it again; its cluster follows at the next refit.
+
+        Args:
+            documents: Mapping of document id to text
+
+        Raises:
+            ValueError: If the client returned no embeddings
+        """
+        if not documents:
+            return
+        ids = list(documents)
+        vectors = self._embed([documents[doc_id] for doc_id in ids])
+        if vectors.shape[1] == 0:
+            raise ValueError("The embedding client returned no embeddings")
+
+        with self._lock:
+            if self.vectors.size == 0:
+                self.vectors = np.zeros((0, vectors.shape[1]))
+            new_rows = []
+            for doc_id, vector in zip(ids, vectors):
+                excerpt = documents[doc_id][:self.excerpt_chars]
+                if doc_id in self.index:
+                    row = self.index[doc_id]
+                    self.vectors[row] = vector
+                    self.excerpts[row] = excerpt
+                else:
+                    self.index[doc_id] = len(self.document_ids)
+                    self.document_ids.append(doc_id)
+                    self.excerpts.append(excerpt)
+                    new_rows.append(vector)
+            if new_rows:
+                self.vectors = np.vstack([self.vectors, np.array(new_rows)])
+
+            if self.centroids is None:
+                if len(self.document_ids) >= self.n_clusters:
+                    self.refit()
+                return
+
+            if not new_rows:
+                return
+            # Mini-batch update: move each nearest centroid toward its new members
+            new_vectors = np.array(new_rows)
+            labels = np.argmax(new_vectors @ self.centroids.T, axis=1)
+            for label, vector in zip(labels, new_vectors):
+                self.counts[label] += 1
+                self.centroids[label] += (vector - self.centroids[label]) / self.counts[label]
+            self.centroids = _normalize(self.centroids)
+
+    def refit(self) -> None:
+        """Recluster every document from scratch and forget cluster names."""
+        with self._lock:
+            if not self.document_ids:
+                return
+            self.centroids = spherical_kmeans(self.vectors, self.n_clusters)
+            labels = self.labels()
+            self.counts = np.bincount(labels, minlength=len(self.centroids)).astype(float)
+            self.names = {}
+            self.named_centroids = {}
+
+    def labels(self) -> np.ndarray:
+        """
+        Assign every document to its nearest centroid.
+
+        Returns:
+            np.ndarray: Cluster index per document, in insertion order
+        """
+        return np.argmax(self.vectors @ self.centroids.T, axis=1)
+
+    def _clusters_needing_names(self) -> List[int]:
+        stale = []
+        for cluster in range(len(self.centroids)):
+            named_at = self.named_centroids.get(cluster)
+            if named_at is None or float(named_at @ self.centroids[cluster]) < self.rename_threshold:
+                stale.append(cluster)
+        return stale
+
+    def name_clusters(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Name unnamed or drifted clusters with one LLM call each.
+
+        Returns:
+            Dict: Cluster index to {theme_name, description, keywords}
+        """
+        with self._lock:
+            if self.centroids is None:
+                return {}
+            labels = self.labels()
+            similarity = self.vectors @ self.centroids.T
+            jobs = {}
+            for cluster in self._clusters_needing_names():
+                members = np.where(labels == cluster)[0]
+                if not len(members):
+                    continue
+                closest = members[np.argsort(-similarity[members, cluster])[:self.representatives]]
+                jobs[cluster] = ([self.excerpts[row] for row in closest], self.centroids[cluster].copy())
+
+        prompt_template = get_prompt("theme_extraction", "cluster")
+
+        def name(excerpts):
+            content = "\n\n".join(f"--- Document {i} ---\n{text}" for i, text in enumerate(excerpts, 1))
+            response = self.llm_client.generate(prompt_template.format(content=content))
+            try:
+                return json.loads(response[response.find('{'):response.rfind('}') + 1])
+            except Exception as e:
+                print(f"Error parsing cluster name: {e}")
+                return None
+
+        if jobs and prompt_template:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = dict(zip(jobs, executor.map(name, [excerpts for excerpts, _ in jobs.values()])))
+            with self._lock:
+                self.stats["naming_calls"] += len(jobs)
+                for cluster, result in results.items():
+                    if result and result.get("theme_name"):
+                        self.names[cluster] = result
+                        self.named_centroids[cluster] = jobs[cluster][1]
+        return dict(self.names)
+
+    def themes(self) -> List[Dict[str, Any]]:
+        """
+        List the discovered themes, naming clusters as needed.
+
+        Returns:
+            list: Themes with cluster id, name, description, keywords, size and document ids
+        """
+        self.name_clusters()
+        with self._lock:
+            if self.centroids is None:
+                return []
+            labels = self.labels()
+            themes = []
+            for cluster in range(len(self.centroids)):
+                info = self.names.get(cluster, {})
+                members = [self.document_ids[row] for row in np.where(labels == cluster)[0]]
+                themes.append({
+                    "cluster": cluster,
+                    "theme_name": info.get("theme_name", f"Cluster {cluster}"),
+                    "description": info.get("description", ""),
+                    "keywords": info.get("keywords", []),
+                    "size": len(members),
+                    "documents": members
+                })
+            return sorted(themes, key=lambda theme: -theme["size"])
+
+    def primary_theme(self, document_id: Optional[str] = None, text: Optional[str] = None,
+                      secondary: int = 2) -> Dict[str, Any]:
+        """
+        Look up a document's theme as its nearest centroid.
+
+        Args:
+            document_id: Id of a document already in the corpus
+            text: Text of a new document (embedded on the fly)
+            secondary: Number of next-nearest themes to return as secondary themes
+
+        Returns:
+            Dict: primary_theme, secondary_themes, similarity and cluster
+        """
+        if self.centroids is None:
+            return {"primary_theme": "", "secondary_themes": [], "error": "No themes fitted yet"}
+
+        if document_id is not None and document_id in self.index:
+            vector = self.vectors[self.index[document_id]]
+        elif text is not None:
+            vector = self._embed([text])[0]
+        else:
+            return {"primary_theme": "", "secondary_themes": [], "error": "Unknown document"}
+
+        if any(cluster not in self.names for cluster in range(len(self.centroids))):
+            self.name_clusters()
+
+        similarity = self.centroids @ vector
+        ranked = np.argsort(-similarity)
+
+        def theme_name(cluster):
+            return self.names.get(int(cluster), {}).get("theme_name", f"Cluster {int(cluster)}")
+
+        return {
+            "primary_theme": theme_name(ranked[0]),
+            "secondary_themes": [theme_name(cluster) for cluster in ranked[1:1 + secondary]],
+            "similarity": round(float(similarity[ranked[0]]), 4),
+            "cluster": int(ranked[0])
+        }
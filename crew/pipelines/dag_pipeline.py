@@ -0,0 +1,193 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional, Dict, Any, List, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineStage:
+    """A single node in a pipeline DAG."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        depends_on: Optional[List[str]] = None,
+        map_over: Optional[str] = None
+    ):
+        """
+        Define a pipeline stage.
+
+        A regular stage is called once as ``func(context)``. A map stage is called
+        once per item of the list produced by the ``map_over`` stage as
+        ``func(item, context)``; its output is the list of per-item results.
+
+        Args:
+            name: Unique name of the stage (also the key of its output)
+            func: The callable that performs the work
+            depends_on: Names of stages whose output this stage needs
+            map_over: Name of a stage whose list output is fanned out over
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on or [])
+        self.map_over = map_over
+        if map_over and map_over not in self.depends_on:
+            self.depends_on.append(map_over)
+
+
+class DAGPipeline:
+    """Executes a DAG of stages with bounded parallelism and streamed results."""
+
+    def __init__(self, stages: List[PipelineStage], max_workers: int = 4):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: The stages of the pipeline
+            max_workers: Maximum number of stage calls running concurrently
+
+        Raises:
+            ValueError: If stage names clash, a dependency is unknown or the graph has a cycle
+        """
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate pipeline stage: {stage.name}")
+            self.stages[stage.name] = stage
+
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+
+        self.order = self._topological_order()
+        self.max_workers = max(1, max_workers)
+
+    def _topological_order(self) -> List[str]:
+        """Return stage names in dependency order, rejecting cycles."""
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline has a dependency cycle between: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def stream(self, inputs: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run the pipeline, yielding events as work completes.
+
+        Events are dicts with an ``event`` key:
+        - ``item_completed``: one item of a map stage finished (stage, index, result)
+        - ``stage_completed``: a stage finished (stage, result, elapsed)
+        - ``pipeline_completed``: all stages finished (results, elapsed)
+
+        A stage that raises produces ``{"error": ...}`` as its result, mirroring how
+        the tools report failures, and downstream stages still run.
+
+        Args:
+            inputs: Initial values made available to every stage via its context
+
+        Yields:
+            Dict: Progress events
+        """
+        context = dict(inputs or {})
+        results: Dict[str, Any] = {}
+        started: Dict[str, float] = {}
+        map_results: Dict[str, List[Any]] = {}
+        map_pending: Dict[str, int] = {}
+        waiting = list(self.order)
+        futures = {}
+        pipeline_start = time.time()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while waiting or futures:
+                # Submit every stage whose dependencies are satisfied
+                for name in list(waiting):
+                    stage = self.stages[name]
+                    if not all(dep in results for dep in stage.depends_on):
+                        continue
+                    waiting.remove(name)
+                    started[name] = time.time()
+                    stage_context = dict(context, **{dep: results[dep] for dep in stage.depends_on})
+
+                    if stage.map_over:
+                        items = results[stage.map_over]
+                        if not isinstance(items, list):
+                            items = []
+                        map_results[name] = [None] * len(items)
+                        map_pending[name] = len(items)
+                        for index, item in enumerate(items):
+                            future = executor.submit(stage.func, item, stage_context)
+                            futures[future] = (name, index)
+                        if not items:
+                            results[name] = []
+                            yield self._stage_event(name, [], started)
+                    else:
+                        future = executor.submit(stage.func, stage_context)
+                        futures[future] = (name, None)
+
+                if not futures:
+                    continue
+
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, index = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Pipeline stage '{name}' failed: {e}")
+                        result = {"error": f"Stage {name} failed: {str(e)}"}
+
+                    if index is None:
+                        results[name] = result
+                        yield self._stage_event(name, result, started)
+                        continue
+
+                    map_results[name][index] = result
+                    map_pending[name] -= 1
+                    yield {"event": "item_completed", "stage": name, "index": index, "result": result}
+                    if map_pending[name] == 0:
+                        results[name] = map_results.pop(name)
+                        yield self._stage_event(name, results[name], started)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        yield {
+            "event": "pipeline_completed",
+            "results": results,
+            "elapsed": time.time() - pipeline_start
+        }
+
+    @staticmethod
+    def _stage_event(name: str, result: Any, started: Dict[str, float]) -> Dict[str, Any]:
+        return {
+            "event": "stage_completed",
+            "stage": name,
+            "result": result,
+            "elapsed": time.time() - started[name]
+        }
+
+    def run(self, inputs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run the pipeline to completion.
+
+        Args:
+            inputs: Initial values made available to every stage via its context
+
+        Returns:
+            Dict: Output of every stage keyed by stage name
+        """
+        results = {}
+        for event in self.stream(inputs):
+            if event["event"] == "pipeline_completed":
+                results = event["results"]
+        return results
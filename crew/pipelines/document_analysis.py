@@ -0,0 +1,110 @@
+from crew.pipelines.dag_pipeline import DAGPipeline, PipelineStage
+from crew.tools.LLM_keyword_extractor_tool import create_keyword_extraction_tool
+from crew.tools.LLM_entity_extraction_tool import create_entity_extraction_tool
+from crew.tools.LLM_process_extractor_tool import create_process_extraction_tool
+from crew.tools.LLM_section_analyzer_tool import create_section_analyzer_tool
+from crew.utils.markdown_splitter import split_sections
+from crew.utils.helpers import merge_results
+from typing import Callable, Optional, Dict, Any, Iterator
+
+# Tools fanned out over every section, keyed by pipeline stage name
+SECTION_TOOL_FACTORIES = {
+    "keywords": create_keyword_extraction_tool,
+    "entities": create_entity_extraction_tool,
+    "processes": create_process_extraction_tool
+}
+
+
+def create_document_analysis_pipeline(
+    llm_client,
+    max_workers: int = 4,
+    max_section_words: int = 800,
+    section_tools: Optional[Dict[str, Callable]] = None,
+    include_structure: bool = False
+) -> DAGPipeline:
+    """
+    Build the section fan-out pipeline for document analysis.
+
+    The document is split into sections locally, each section is sent in parallel
+    to the per-section tools and a reduce stage merges their results. The LLM section
+    analyzer does not return section bodies, so it cannot drive the fan-out; with
+    ``include_structure`` it runs alongside the splitter on the whole document.
+
+    Args:
+        llm_client: The LLM client shared by all tools
+        max_workers: Maximum number of concurrent tool calls
+        max_section_words: Sections larger than this are split on paragraphs
+        section_tools: Mapping of stage name to ``create_*_tool`` factory
+        include_structure: Whether to also run the section analyzer tool
+
+    Returns:
+        DAGPipeline: The configured pipeline; run it with ``{"content": ...}``
+    """
+    factories = section_tools or SECTION_TOOL_FACTORIES
+
+    def split(context):
+        sections = split_sections(context["content"], max_words=max_section_words)
+        return [section for section in sections if section["word_count"] > 0]
+
+    stages = [PipelineStage("sections", split)]
+
+    for stage_name, factory in factories.items():
+        tool = factory(llm_client)
+        stages.append(PipelineStage(
+            stage_name,
+            lambda section, context, tool=tool: tool.func(section["content"]),
+            map_over="sections"
+        ))
+
+    def reduce(context):
+        return {name: merge_results(context[name]) for name in factories}
+
+    stages.append(PipelineStage("merged", reduce, depends_on=list(factories)))
+
+    if include_structure:
+        section_tool = create_section_analyzer_tool(llm_client)
+        stages.append(PipelineStage(
+            "structure",
+            lambda context: section_tool.func(context["content"])
+        ))
+
+    return DAGPipeline(stages, max_workers=max_workers)
+
+
+def stream_document_analysis(llm_client, content: str, **kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze a document, yielding partial results as sections complete.
+
+    Args:
+        llm_client: The LLM client shared by all tools
+        content: The document content
+        **kwargs: Options passed to create_document_analysis_pipeline
+
+    Yields:
+        Dict: Pipeline progress events (see DAGPipeline.stream)
+    """
+    pipeline = create_document_analysis_pipeline(llm_client, **kwargs)
+    yield from pipeline.stream({"content": content})
+
+
+def analyze_document(llm_client, content: str, **kwargs) -> Dict[str, Any]:
+    """
+    Analyze a document with section fan-out and return the merged result.
+
+    Args:
+        llm_client: The LLM client shared by all tools
+        content: The document content
+        **kwargs: Options passed to create_document_analysis_pipeline
+
+    Returns:
+        Dict: Merged per-tool results plus the sections and optional structure
+    """
+    results = create_document_analysis_pipeline(llm_client, **kwargs).run({"content": content})
+    analysis = dict(results.get("merged", {}))
+    analysis["sections"] = [
+        {key: section[key] for key in ("section_title", "section_level", "word_count")}
+        for section in results.get("sections", [])
+    ]
+    if "structure" in results:
+        analysis["structure"] = results["structure"]
+    return analysis
@@ -0,0 +1,156 @@
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Dict, Any, Union
+
+from crew.pipelines.document_analysis import SECTION_TOOL_FACTORIES
+from crew.utils.markdown_splitter import split_sections
+from crew.utils.helpers import merge_results
+from crew.utils.result_cache import ResultCache
+
+TRAILING_WHITESPACE = re.compile(r'[ \t]+$', re.MULTILINE)
+
+
+def section_hash(section: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash for a section.
+
+    Trailing whitespace is ignored so that cosmetic re-saves do not
+    invalidate cached results.
+
+    Args:
+        section: A section dict from split_sections
+
+    Returns:
+        str: Hex digest identifying the section's title, level and content
+    """
+    normalized = TRAILING_WHITESPACE.sub("", section["content"]).strip()
+    key = f"{section['section_level']}\x00{section['section_title'].strip()}\x00{normalized}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class IncrementalAnalyzer:
+    """Re-analyzes documents section by section, sending only changed sections to the LLM tools."""
+
+    def __init__(
+        self,
+        llm_client,
+        cache: Optional[ResultCache] = None,
+        cache_path: Optional[Union[str, Path]] = None,
+        tool_factories: Optional[Dict[str, Callable]] = None,
+        max_section_words: int = 800,
+        max_workers: int = 4
+    ):
+        """
+        Initialize the incremental analyzer.
+
+        Args:
+            llm_client: The LLM client shared by all tools
+            cache: An existing ResultCache to store section results in
+            cache_path: Path of a SQLite cache to open when no cache is given
+            tool_factories: Mapping of result name to ``create_*_tool`` factory
+            max_section_words: Sections larger than this are split on paragraphs
+            max_workers: Maximum number of concurrent tool calls
+        """
+        self.cache = cache or ResultCache(cache_path)
+        factories = tool_factories or SECTION_TOOL_FACTORIES
+        self.tools = {name: factory(llm_client) for name, factory in factories.items()}
+        self.max_section_words = max_section_words
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _cache_key(tool_name: str, digest: str) -> str:
+        return f"section:{tool_name}:{digest}"
+
+    def analyze(self, content: str, document_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analyze a document, reusing cached results for unchanged sections.
+
+        Args:
+            content: The document content
+            document_id: Optional identifier (e.g. file path) used to report
+                         which sections changed since the previous analysis
+
+        Returns:
+            Dict: Merged per-tool results plus an ``incremental`` stats block
+        """
+        sections = [
+            section for section in split_sections(content, max_words=self.max_section_words)
+            if section["word_count"] > 0
+        ]
+        digests = [section_hash(section) for section in sections]
+
+        keys = [
+            self._cache_key(tool_name, digest)
+            for tool_name in self.tools for digest in digests
+        ]
+        cached = self.cache.get_many(keys)
+
+        # Each (tool, section content) pair is computed once, even if a section repeats
+        pending = {}
+        for tool_name, tool in self.tools.items():
+            for section, digest in zip(sections, digests):
+                key = self._cache_key(tool_name, digest)
+                if key not in cached and key not in pending:
+                    pending[key] = (tool, section["content"])
+
+        fresh = {}
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    key: executor.submit(tool.func, text)
+                    for key, (tool, text) in pending.items()
+                }
+                for key, future in futures.items():
+                    try:
+                        fresh[key] = future.result()
+                    except Exception as e:
+                        fresh[key] = {"error": f"Error processing section: {str(e)}"}
+
+            # Failed calls are not cached so the next run retries them
+            self.cache.set_many({
+                key: result for key, result in fresh.items()
+                if isinstance(result, dict) and "error" not in result
+            })
+
+        all_results = dict(cached, **fresh)
+        analysis = {
+            tool_name: merge_results([
+                all_results[self._cache_key(tool_name, digest)] for digest in digests
+            ])
+            for tool_name in self.tools
+        }
+
+        total_calls = len(self.tools) * len(sections)
+        skipped = total_calls - len(pending)
+        stats = {
+            "sections": len(sections),
+            "llm_calls": len(pending),
+            "llm_calls_skipped": skipped,
+            "skipped_fraction": skipped / total_calls if total_calls else 1.0
+        }
+
+        if document_id is not None:
+            document_key = f"document:{document_id}"
+            previous = set(self.cache.get(document_key) or [])
+            stats["changed_sections"] = sum(1 for digest in digests if digest not in previous)
+            self.cache.set(document_key, digests)
+
+        analysis["incremental"] = stats
+        return analysis
+
+    def analyze_file(self, file_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Analyze a file, reusing cached results for unchanged sections.
+
+        Args:
+            file_path: Path to the document
+
+        Returns:
+            Dict: Merged per-tool results plus an ``incremental`` stats block
+        """
+        file_path = Path(file_path)
+        with open(file_path, 'r', encoding='utf-8') as file:
+            content = file.read()
+        return self.analyze(content, document_id=str(file_path.resolve()))
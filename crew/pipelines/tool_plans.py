@@ -0,0 +1,297 @@
+import copy
+import inspect
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+
+import yaml
+
+from crew.tools.LLM_keyword_extractor_tool import create_keyword_extraction_tool
+from crew.tools.LLM_primary_theme_extractor_tool import create_theme_extraction_tool
+from crew.tools.LLM_process_extractor_tool import create_process_extraction_tool
+from crew.tools.LLM_entity_extraction_tool import create_entity_extraction_tool
+from crew.tools.LLM_code_analysis_tool import create_code_analysis_tool
+from crew.tools.LLM_content_repurposing_tool import create_content_repurposing_tool
+from crew.tools.LLM_section_analyzer_tool import create_section_analyzer_tool
+from crew.tools.LLM_summary_generation_tool import create_summary_generation_tool
+from crew.utils.markdown_splitter import count_words
+
+# Tool types (named after their prompt directories) and their factories
+TOOL_FACTORIES = {
+    "keyword_extraction": create_keyword_extraction_tool,
+    "theme_extraction": create_theme_extraction_tool,
+    "process_extraction": create_process_extraction_tool,
+    "entity_extraction": create_entity_extraction_tool,
+    "code_analysis": create_code_analysis_tool,
+    "content_repurposing": create_content_repurposing_tool,
+    "section_analyzer": create_section_analyzer_tool,
+    "summary_generation": create_summary_generation_tool
+}
+
+CODE_EXTENSIONS = {".py", ".js", ".ts", ".java", ".go", ".rs", ".c", ".cpp", ".h", ".rb", ".sh", ".sql"}
+CODE_FENCE_PATTERN = re.compile(r'^\s*(```|~~~)', re.MULTILINE)
+
+# Each entry maps a tool type to the keyword arguments it is called with
+DEFAULT_TOOL_PLANS = {
+    # Notes shorter than this get no LLM tools at all
+    "tiny_note_words": 50,
+    "tiny_note_tools": {
+        "keyword_extraction": {"mode": "local"}
+    },
+    "content_types": {
+        "video": {
+            "summary_generation": {"variant": "executive"},
+            "keyword_extraction": {},
+            "theme_extraction": {},
+            "content_repurposing": {}
+        },
+        "article": {
+            "summary_generation": {"variant": "executive"},
+            "keyword_extraction": {},
+            "entity_extraction": {},
+            "theme_extraction": {},
+            "content_repurposing": {}
+        },
+        "book": {
+            "summary_generation": {"variant": "executive"},
+            "section_analyzer": {},
+            "keyword_extraction": {},
+            "entity_extraction": {},
+            "theme_extraction": {}
+        },
+        "process": {
+            "process_extraction": {},
+            "section_analyzer": {},
+            "summary_generation": {"variant": "technical"}
+        },
+        "note": {
+            "keyword_extraction": {"mode": "tiered"},
+            "entity_extraction": {}
+        },
+        "document": {
+            "summary_generation": {"variant": "executive"},
+            "section_analyzer": {},
+            "keyword_extraction": {},
+            "entity_extraction": {}
+        },
+        "unknown": {
+            "keyword_extraction": {"mode": "tiered"}
+        }
+    },
+    # Tools added (or re-configured) when a hashtag is present
+    "hashtags": {
+        "process": {"process_extraction": {}},
+        "workflow": {"process_extraction": {}},
+        "code": {"code_analysis": {}},
+        "technical": {"summary_generation": {"variant": "technical"}}
+    },
+    # Tools added when fenced code or a source-code extension is detected
+    "code_detected_tools": {
+        "code_analysis": {}
+    },
+    # Tools added for documents longer than this
+    "large_document_words": 3000,
+    "large_document_tools": {
+        "section_analyzer": {},
+        "summary_generation": {}
+    }
+}
+
+
+# Tables keyed by content type or hashtag; a plan table overrides them entry by entry
+KEYED_TABLES = ("content_types", "hashtags")
+
+
+def _merge_tools(target: Dict[str, Dict[str, Any]], tools: Dict[str, Dict[str, Any]]) -> None:
+    for tool_type, options in (tools or {}).items():
+        target.setdefault(tool_type, {}).update(options or {})
+
+
+class ToolPlanner:
+    """Chooses which tools (and variants) run for a document from its classification."""
+
+    def __init__(self, plans: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            plans: Tool-plan table; keys missing from it fall back to DEFAULT_TOOL_PLANS.
+                   The content_types and hashtags tables are merged by key, so an
+                   entry given for one content type or hashtag replaces only that
+                   entry's tools
+        """
+        self.plans = copy.deepcopy(DEFAULT_TOOL_PLANS)
+        for key, value in (plans or {}).items():
+            if key in KEYED_TABLES and isinstance(value, dict):
+                self.plans[key].update(copy.deepcopy(value))
+            else:
+                self.plans[key] = value
+        self._stats = {
+            "documents": 0,
+            "tiny_documents": 0,
+            "tools_run": Counter(),
+            "tools_skipped": Counter()
+        }
+        # Tools built on demand, per client: client id -> (client, tool type -> tool)
+        self._tools: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> "ToolPlanner":
+        """
+        Create a planner from a YAML tool-plan table.
+
+        Args:
+            path: Path to the YAML file
+
+        Returns:
+            ToolPlanner: The configured planner
+        """
+        with open(path, 'r') as f:
+            return cls(yaml.safe_load(f) or {})
+
+    @staticmethod
+    def detect_code(content: str, file_path: Optional[str] = None) -> bool:
+        """
+        Detect whether content is or contains source code.
+
+        Args:
+            content: The document content
+            file_path: Optional file path used for the extension check
+
+        Returns:
+            bool: True if code was detected
+        """
+        if file_path and Path(file_path).suffix.lower() in CODE_EXTENSIONS:
+            return True
+        return bool(CODE_FENCE_PATTERN.search(content))
+
+    def plan(self, classification: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """
+        Decide which tools to run for a classified document.
+
+        Args:
+            classification: Result of ClassificationAgent.classify_content
+            content: The document content
+
+        Returns:
+            Dict: ``tools`` (tool type -> call options), ``skipped`` tool types,
+                  ``word_count`` and ``reasons`` for the chosen tools
+        """
+        plans = self.plans
+        content_type = classification.get("content_type", "unknown")
+        hashtags = classification.get("hashtags", [])
+        word_count = count_words(content)
+        tools: Dict[str, Dict[str, Any]] = {}
+        reasons = []
+
+        if word_count < plans["tiny_note_words"]:
+            _merge_tools(tools, plans["tiny_note_tools"])
+            reasons.append(f"tiny note ({word_count} words)")
+        else:
+            content_types = plans["content_types"]
+            _merge_tools(tools, content_types.get(content_type, content_types.get("unknown")))
+            reasons.append(f"content_type={content_type}")
+
+            for tag in hashtags:
+                if tag in plans["hashtags"]:
+                    _merge_tools(tools, plans["hashtags"][tag])
+                    reasons.append(f"#{tag}")
+
+            if self.detect_code(content, classification.get("file_path")):
+                _merge_tools(tools, plans["code_detected_tools"])
+                reasons.append("code detected")
+
+            if word_count > plans["large_document_words"]:
+                _merge_tools(tools, plans["large_document_tools"])
+                reasons.append(f"large document ({word_count} words)")
+
+        skipped = [tool_type for tool_type in TOOL_FACTORIES if tool_type not in tools]
+
+        with self._lock:
+            self._stats["documents"] += 1
+            if word_count < plans["tiny_note_words"]:
+                self._stats["tiny_documents"] += 1
+            self._stats["tools_run"].update(tools.keys())
+            self._stats["tools_skipped"].update(skipped)
+
+        return {"tools": tools, "skipped": skipped, "word_count": word_count, "reasons": reasons}
+
+    def get_tool(self, tool_type: str, llm_client) -> Any:
+        """
+        Get the planner's tool of a type for a client, building it on first use.
+
+        Tools are reused across documents, so their state carries over: the
+        keyword tool's document-frequency table grows with the corpus and the
+        code-unit and chunk caches are shared.
+
+        Args:
+            tool_type: Tool type from TOOL_FACTORIES
+            llm_client: Client the tool calls
+
+        Returns:
+            Tool: The tool
+        """
+        with self._lock:
+            # The client is kept with its tools so its id cannot be reused
+            _, client_tools = self._tools.setdefault(id(llm_client), (llm_client, {}))
+            if tool_type not in client_tools:
+                client_tools[tool_type] = TOOL_FACTORIES[tool_type](llm_client)
+            return client_tools[tool_type]
+
+    def execute(self, plan: Dict[str, Any], content: str, llm_client=None,
+                tools: Optional[Dict[str, Any]] = None, max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Run the tools of a plan in parallel.
+
+        Options a tool's function does not accept (e.g. ``variant`` for tools
+        with a fixed prompt) are dropped.
+
+        Args:
+            plan: Output of plan()
+            content: The document content
+            llm_client: Client of the planner's tools used for tools that are not supplied
+            tools: Optional pre-built tools keyed by tool type
+            max_workers: Maximum number of concurrent tool calls
+
+        Returns:
+            Dict: Tool results keyed by tool type
+        """
+        tools = dict(tools or {})
+        for tool_type in plan["tools"]:
+            if tool_type not in tools:
+                tools[tool_type] = self.get_tool(tool_type, llm_client)
+
+        def run(tool_type):
+            func = tools[tool_type].func
+            accepted = inspect.signature(func).parameters
+            options = {k: v for k, v in plan["tools"][tool_type].items() if k in accepted}
+            try:
+                return func(content, **options)
+            except Exception as e:
+                return {"error": f"Error running {tool_type}: {str(e)}"}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(plan["tools"], executor.map(run, plan["tools"])))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get plan statistics.
+
+        Returns:
+            Dict: Documents planned, tiny documents, per-tool run/skip counts
+                  and the overall fraction of tool calls skipped
+        """
+        with self._lock:
+            run = sum(self._stats["tools_run"].values())
+            skipped = sum(self._stats["tools_skipped"].values())
+            return {
+                "documents": self._stats["documents"],
+                "tiny_documents": self._stats["tiny_documents"],
+                "tools_run": dict(self._stats["tools_run"]),
+                "tools_skipped": dict(self._stats["tools_skipped"]),
+                "skip_rate": skipped / (run + skipped) if run + skipped else 0.0
+            }
@@ -1,43 +1,51 @@
 from crew.tools.base_tool import BaseTool
 from crew.interfaces.prompt_loader import get_prompt
+from crew.utils.code_units import extract_code_units
+from crew.utils.result_cache import ResultCache
+from concurrent.futures import ThreadPoolExecutor
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from typing import Optional
+import hashlib
 import json
 
-def create_code_analysis_tool(llm_client):
+
+def _complexity_rating(max_complexity: int) -> str:
+    # McCabe's thresholds: 1-10 simple, 11-20 moderate, over 20 complex
+    return "Low" if max_complexity <= 10 else "Medium" if max_complexity <= 20 else "High"
+
+
+def create_code_analysis_tool(
+    llm_client,
+    cache: Optional[ResultCache] = None,
+    max_workers: int = 4,
+    max_chunk_lines: int = 200,
+    diet: Optional[TokenDiet] = None
+):
     """
     Creates a tool for analyzing code structure, quality, and functionality.
-    
+
+    Python sources are parsed with ``ast`` into function and class units and
+    their static metrics are computed locally. Sources up to ``max_chunk_lines``
+    are analyzed in a single prompt, cached by content. Longer ones fan out:
+    only units whose source changed since they were last analyzed are sent to
+    the LLM (in parallel), and the unit results are aggregated into the usual
+    output shape.
+
     Args:
         llm_client: The LLM client to use for analysis
-        
+        cache: Cache for per-unit results (defaults to an in-memory cache)
+        max_workers: Maximum number of concurrent unit analyses
+        max_chunk_lines: Files (and classes) longer than this are analyzed unit by unit
+        diet: TokenDiet applied to content before prompting (defaults to the shared DEFAULT_DIET)
+
     Returns:
         Tool: A CrewAI tool for code analysis
     """
-    def analyze_code(content: str, variant: str = "standard"):
-        """
-        Analyze code from the given content.
-        
-        Args:
-            content: The code content to analyze
-            variant: The prompt variant to use (default: standard)
-            
-        Returns:
-            Dict: Dictionary containing code analysis results
-        """
-        # Get the appropriate prompt template
-        prompt_template = get_prompt("code_analysis", variant)
-        
-        if not prompt_template:
-            return {
-                "error": f"Prompt template not found for code_analysis/{variant}"
-            }
-        
-        # Format the prompt with the content
-        formatted_prompt = prompt_template.format(content=content)
-        
-        # Make the LLM call
-        response = llm_client.generate(formatted_prompt)
-        
-        # Parse the response to extract JSON
+    unit_cache = cache or ResultCache()
+    token_diet = diet if diet is not None else DEFAULT_DIET
+
+    def parse_response(response: str):
+        """Extract the JSON object from an LLM response."""
         try:
             # Find JSON in the response
             json_start = response.find('{')
@@ -50,7 +58,7 @@ def create_code_analysis_tool(llm_client):
                 return {
                     "language": "",
                     "purpose": "",
-                    
+
                     "error": "Could not extract structured data from LLM response"
                 }
         except Exception as e:
@@ -58,10 +66,148 @@ def create_code_analysis_tool(llm_client):
             return {
                 "language": "",
                     "purpose": "",
-                    
+
                 "error": f"Error processing response: {str(e)}"
             }
-    
+
+    def analyze_unit(unit, prompt_template):
+        """Send a single code unit to the LLM with a short context header."""
+        header = f"# {unit['type']} {unit['name']} (lines {unit['start_line']}-{unit['end_line']})"
+        if unit["uses_imports"]:
+            header += f"; uses: {', '.join(unit['uses_imports'])}"
+        source, _ = token_diet.apply(unit["source"], "code_analysis")
+        formatted_prompt = prompt_template.format(content=f"{header}\n{source}")
+        return parse_response(BaseTool.generate(llm_client, formatted_prompt, "code_analysis", diet=token_diet))
+
+    def aggregate(code, unit_results):
+        """Combine per-unit LLM results and local metrics into one analysis."""
+        metrics = dict(code["metrics"], import_graph=code["imports"])
+        max_complexity = metrics["max_complexity"]
+
+        components = []
+        quality_issues = []
+        strengths = []
+        purposes = []
+        errors = []
+        for unit in code["units"]:
+            result = unit_results.get(unit["hash"], {})
+            if "error" in result:
+                errors.append({
+                    "component": unit["name"],
+                    "lines": [unit["start_line"], unit["end_line"]],
+                    "error": result["error"]
+                })
+            purpose = result.get("purpose", "") if isinstance(result.get("purpose"), str) else ""
+            if purpose and unit["type"] != "module":
+                purposes.append(purpose)
+            components.append({
+                "name": unit["name"],
+                "type": unit["type"],
+                "lines": [unit["start_line"], unit["end_line"]],
+                "loc": unit["loc"],
+                "cyclomatic_complexity": unit["cyclomatic_complexity"],
+                "purpose": purpose
+            })
+            for issue in result.get("quality_issues") or []:
+                if isinstance(issue, dict):
+                    issue = dict(issue, component=unit["name"])
+                quality_issues.append(issue)
+            for strength in result.get("strengths") or []:
+                if strength not in strengths:
+                    strengths.append(strength)
+
+        docstring = code["docstring"].strip().split("\n")[0]
+        analysis = {
+            "language": "Python",
+            "purpose": docstring or "; ".join(purposes[:3]),
+            "components": components,
+            "complexity": _complexity_rating(max_complexity),
+            "quality_issues": quality_issues,
+            "strengths": strengths,
+            "metrics": metrics
+        }
+        # Units whose analysis failed, so callers can tell them from units without findings
+        if errors:
+            analysis["errors"] = errors
+        return analysis
+
+    def analyze_code(content: str, variant: str = "standard"):
+        """
+        Analyze code from the given content.
+
+        Args:
+            content: The code content to analyze
+            variant: The prompt variant to use (default: standard)
+
+        Returns:
+            Dict: Dictionary containing code analysis results
+        """
+        # Get the appropriate prompt template
+        prompt_template = get_prompt("code_analysis", variant)
+
+        if not prompt_template:
+            return {
+                "error": f"Prompt template not found for code_analysis/{variant}"
+            }
+
+        # Python sources get local metrics; only large ones are analyzed unit by unit
+        code = extract_code_units(content, max_unit_lines=max_chunk_lines)
+
+        if not code or not code["units"] or content.count("\n") + 1 <= max_chunk_lines:
+            file_key = None
+            if code:
+                file_key = f"code_file:{variant}:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+                cached = unit_cache.get(file_key)
+                if cached is not None:
+                    return dict(cached)
+
+            # Format the prompt with the content
+            content, _ = token_diet.apply(content, "code_analysis")
+            formatted_prompt = prompt_template.format(content=content)
+
+            # Make the LLM call
+            response = BaseTool.generate(llm_client, formatted_prompt, "code_analysis", diet=token_diet)
+
+            # Parse the response to extract JSON
+            result = parse_response(response)
+            if code and "error" not in result:
+                result["complexity"] = _complexity_rating(code["metrics"]["max_complexity"])
+                result["metrics"] = dict(code["metrics"], import_graph=code["imports"])
+                unit_cache.set(file_key, result)
+            return result
+
+        keys = {unit["hash"]: f"code_unit:{variant}:{unit['hash']}" for unit in code["units"]}
+        cached = unit_cache.get_many(list(keys.values()))
+        unit_results = {
+            digest: cached[key] for digest, key in keys.items() if key in cached
+        }
+        changed = {
+            unit["hash"]: unit for unit in code["units"] if unit["hash"] not in unit_results
+        }
+
+        if changed:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    digest: executor.submit(analyze_unit, unit, prompt_template)
+                    for digest, unit in changed.items()
+                }
+                fresh = {}
+                for digest, future in futures.items():
+                    try:
+                        fresh[digest] = future.result()
+                    except Exception as e:
+                        fresh[digest] = {"error": f"Error analyzing {changed[digest]['name']}: {str(e)}"}
+            unit_results.update(fresh)
+            # Failed units are not cached so the next run retries them
+            unit_cache.set_many({
+                keys[digest]: result for digest, result in fresh.items() if "error" not in result
+            })
+
+        analysis = aggregate(code, unit_results)
+        analysis["units_analyzed"] = len(changed)
+        analysis["units_cached"] = len(code["units"]) - len(changed)
+        return analysis
+
     # Create and return the tool using BaseTool factory
     return BaseTool.create_tool(
         name="analyze_code",
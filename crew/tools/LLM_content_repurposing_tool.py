@@ -1,67 +1,180 @@
 from crew.tools.base_tool import BaseTool
 from crew.interfaces.prompt_loader import get_prompt
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Iterator, Dict, Any
 import json
 
-def create_content_repurposing_tool(llm_client):
+DEFAULT_FORMATS = ["blog post", "social media thread", "newsletter", "video script"]
+
+# Used to pick the recommended approach from independently generated formats
+VALUE_RANK = {"high": 3, "medium": 2, "low": 1}
+EFFORT_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+def _parse_response(response: str) -> Dict[str, Any]:
+    """Extract the JSON object from an LLM response."""
+    try:
+        # Find JSON in the response
+        json_start = response.find('{')
+        json_end = response.rfind('}') + 1
+        if json_start >= 0 and json_end > 0:
+            json_str = response[json_start:json_end]
+            return json.loads(json_str)
+        else:
+            # Fallback if proper JSON not found
+            return {
+                "content_type": "",
+                "repurposing_opportunities": [],
+                "error": "Could not extract structured data from LLM response"
+            }
+    except Exception as e:
+        print(f"Error parsing LLM response: {e}")
+        return {
+            "content_type": "",
+            "repurposing_opportunities": [],
+            "error": f"Error processing response: {str(e)}"
+        }
+
+
+def stream_repurposing_formats(
+    llm_client,
+    content: str,
+    formats: Optional[List[str]] = None,
+    max_workers: int = 4,
+    diet: Optional[TokenDiet] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Assess each target format with its own concurrent LLM request.
+
+    Every request starts with the same content block, so a server with prompt
+    caching can reuse the shared prefix. Results are yielded as soon as each
+    format finishes; a failed format yields an ``error`` and does not affect
+    the others.
+
+    Args:
+        llm_client: The LLM client to use
+        content: The content to repurpose
+        formats: Target formats (defaults to DEFAULT_FORMATS)
+        max_workers: Maximum number of concurrent requests
+        diet: TokenDiet applied to the content once before prompting (defaults to the shared DEFAULT_DIET)
+
+    Yields:
+        Dict: ``{"format": ..., "result": {...}}`` or ``{"format": ..., "error": ...}``
+    """
+    prompt_template = get_prompt("content_repurposing", "format")
+    if not prompt_template:
+        for target_format in formats or DEFAULT_FORMATS:
+            yield {"format": target_format, "error": "Prompt template not found for content_repurposing/format"}
+        return
+
+    token_diet = diet if diet is not None else DEFAULT_DIET
+    content, _ = token_diet.apply(content, "content_repurposing/format")
+
+    def assess(target_format):
+        formatted_prompt = prompt_template.format(content=content, format=target_format)
+        return _parse_response(BaseTool.generate(llm_client, formatted_prompt, "content_repurposing/format",
+                                                 diet=token_diet))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(assess, f): f for f in formats or DEFAULT_FORMATS}
+        for future in as_completed(futures):
+            target_format = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                yield {"format": target_format, "error": f"Error processing format: {str(e)}"}
+                continue
+            if "error" in result:
+                yield {"format": target_format, "error": result["error"]}
+            else:
+                # The requested format, not the model's wording of it, identifies the result
+                result["format"] = target_format
+                yield {"format": target_format, "result": result}
+
+
+def create_content_repurposing_tool(
+    llm_client,
+    formats: Optional[List[str]] = None,
+    max_workers: int = 4,
+    diet: Optional[TokenDiet] = None
+):
     """
     Creates a tool for identifying content repurposing opportunities.
-    
+
+    When target formats are given (here or per call), each format is generated as an
+    independent concurrent request and formats that succeed are kept even if others fail.
+
     Args:
         llm_client: The LLM client to use for analysis
-        
+        formats: Default target formats for the parallel per-format mode
+        max_workers: Maximum number of concurrent format requests
+        diet: TokenDiet applied to content before prompting (defaults to the shared DEFAULT_DIET)
+
     Returns:
         Tool: A CrewAI tool for content repurposing
     """
-    def identify_repurposing_opportunities(content: str, variant: str = "standard"):
+    token_diet = diet if diet is not None else DEFAULT_DIET
+
+    def identify_repurposing_opportunities(content: str, variant: str = "standard",
+                                           target_formats: Optional[List[str]] = None):
         """
         Identify opportunities for repurposing content into different formats.
-        
+
         Args:
             content: The text content to analyze
             variant: The prompt variant to use (default: standard)
-            
+            target_formats: Formats to assess in parallel (overrides the tool default)
+
         Returns:
             Dict: Dictionary containing repurposing opportunities
         """
+        target_formats = target_formats or formats
+        if target_formats:
+            opportunities = []
+            failed = []
+            for event in stream_repurposing_formats(llm_client, content, target_formats, max_workers, token_diet):
+                if "error" in event:
+                    failed.append({"format": event["format"], "error": event["error"]})
+                else:
+                    opportunities.append(event["result"])
+
+            # Keep the requested order rather than completion order
+            order = {f: i for i, f in enumerate(target_formats)}
+            opportunities.sort(key=lambda o: order.get(o.get("format"), len(order)))
+            result = {
+                "content_type": next((o["content_type"] for o in opportunities if o.get("content_type")), ""),
+                "repurposing_opportunities": opportunities,
+                "recommended_approach": max(
+                    opportunities,
+                    key=lambda o: (VALUE_RANK.get(str(o.get("value_potential", "")).lower(), 0),
+                                   -EFFORT_RANK.get(str(o.get("modification_needed", "")).lower(), 1)),
+                    default=None
+                ),
+                "failed_formats": failed
+            }
+            if not opportunities:
+                result["error"] = "All repurposing formats failed"
+            return result
+
         # Get the appropriate prompt template
         prompt_template = get_prompt("content_repurposing", variant)
-        
+
         if not prompt_template:
             return {
                 "error": f"Prompt template not found for content_repurposing/{variant}"
             }
-        
+
         # Format the prompt with the content
+        content, _ = token_diet.apply(content, "content_repurposing")
         formatted_prompt = prompt_template.format(content=content)
-        
+
         # Make the LLM call
-        response = llm_client.generate(formatted_prompt)
-        
+        response = BaseTool.generate(llm_client, formatted_prompt, "content_repurposing", diet=token_diet)
+
         # Parse the response to extract JSON
-        try:
-            # Find JSON in the response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > 0:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
-            else:
-                # Fallback if proper JSON not found
-                return {
-                    "content_type": "",
-                    "repurposing_opportunities": [],
-                    
-                    "error": "Could not extract structured data from LLM response"
-                }
-        except Exception as e:
-            print(f"Error parsing LLM response: {e}")
-            return {
-                "content_type": "",
-                    "repurposing_opportunities": [],
-                    
-                "error": f"Error processing response: {str(e)}"
-            }
-    
+        return _parse_response(response)
+
     # Create and return the tool using BaseTool factory
     return BaseTool.create_tool(
         name="identify_repurposing_opportunities",
@@ -78,6 +191,11 @@ def create_content_repurposing_tool(llm_client):
                     "type": "string",
                     "description": "The prompt variant to use (default: standard)",
                     "default": "standard"
+                },
+                "target_formats": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Formats to assess as independent parallel requests"
                 }
             },
             "required": ["content"]
@@ -1,43 +1,42 @@
 from crew.tools.base_tool import BaseTool
 from crew.interfaces.prompt_loader import get_prompt
+from crew.utils.entity_gazetteer import EntityGazetteer, SENTENCE_PATTERN
+from crew.utils.helpers import merge_results
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from typing import Optional
 import json
 
-def create_entity_extraction_tool(llm_client):
+def create_entity_extraction_tool(
+    llm_client,
+    gazetteer: Optional[EntityGazetteer] = None,
+    learn_entities: bool = True,
+    max_excerpt_ratio: float = 0.6,
+    diet: Optional[TokenDiet] = None
+):
     """
     Creates a tool for extracting named entities and their relationships from content.
     
+    With a gazetteer, a local pre-pass resolves entities already seen in the corpus
+    with an Aho-Corasick automaton and finds unresolved candidates with capitalization
+    and acronym heuristics. The LLM is skipped when nothing is unresolved, and otherwise
+    only sees the sentences containing unresolved candidates. Entities returned by the
+    LLM are added to the gazetteer so later documents resolve them locally.
+    
     Args:
         llm_client: The LLM client to use for extraction
+        gazetteer: Optional corpus gazetteer enabling the local pre-pass
+        learn_entities: Whether LLM-confirmed entities are added to the gazetteer
+        max_excerpt_ratio: Send the whole document when the candidate sentences
+                           exceed this fraction of it
+        diet: TokenDiet applied to content before prompting (defaults to the shared DEFAULT_DIET)
         
     Returns:
         Tool: A CrewAI tool for entity extraction
     """
-    def extract_entities(content: str, variant: str = "standard"):
-        """
-        Extract named entities from the given content.
-        
-        Args:
-            content: The text content to analyze
-            variant: The prompt variant to use (default: standard)
-            
-        Returns:
-            Dict: Dictionary containing extracted entities and relationships
-        """
-        # Get the appropriate prompt template
-        prompt_template = get_prompt("entity_extraction", variant)
-        
-        if not prompt_template:
-            return {
-                "error": f"Prompt template not found for entity_extraction/{variant}"
-            }
-        
-        # Format the prompt with the content
-        formatted_prompt = prompt_template.format(content=content)
-        
-        # Make the LLM call
-        response = llm_client.generate(formatted_prompt)
-        
-        # Parse the response to extract JSON
+    token_diet = diet if diet is not None else DEFAULT_DIET
+    
+    def parse_response(response: str):
+        """Extract the JSON object from an LLM response."""
         try:
             # Find JSON in the response
             json_start = response.find('{')
@@ -64,6 +63,63 @@ def create_entity_extraction_tool(llm_client):
                 "error": f"Error processing response: {str(e)}"
             }
     
+    def candidate_excerpt(content: str, unresolved: list):
+        """Collect the sentences that contain unresolved candidates."""
+        sentences = []
+        for sentence in SENTENCE_PATTERN.finditer(content):
+            if any(sentence.start() <= c["start"] < sentence.end() for c in unresolved):
+                sentences.append(sentence.group(0).strip())
+        excerpt = "\n".join(sentences)
+        return excerpt if len(excerpt) <= max_excerpt_ratio * len(content) else content
+    
+    def extract_entities(content: str, variant: str = "standard"):
+        """
+        Extract named entities from the given content.
+        
+        Args:
+            content: The text content to analyze
+            variant: The prompt variant to use (default: standard)
+            
+        Returns:
+            Dict: Dictionary containing extracted entities and relationships
+        """
+        # Get the appropriate prompt template
+        prompt_template = get_prompt("entity_extraction", variant)
+        
+        if not prompt_template:
+            return {
+                "error": f"Prompt template not found for entity_extraction/{variant}"
+            }
+        
+        local = None
+        if gazetteer is not None:
+            local = gazetteer.resolve(content)
+            known = dict(local["known"], dates=local["dates"])
+            if not local["unresolved"]:
+                return dict(known, concepts=[], relationships=[], llm_skipped=True)
+            content = candidate_excerpt(content, local["unresolved"])
+        
+        # Format the prompt with the content
+        content, _ = token_diet.apply(content, "entity_extraction")
+        formatted_prompt = prompt_template.format(content=content)
+        
+        # Make the LLM call
+        response = BaseTool.generate(llm_client, formatted_prompt, "entity_extraction", diet=token_diet)
+        
+        # Parse the response to extract JSON
+        result = parse_response(response)
+        if local is None:
+            return result
+        
+        if "error" not in result and learn_entities:
+            gazetteer.confirm(result)
+        merged = merge_results([known, result])
+        merged["llm_skipped"] = False
+        merged["unresolved_candidates"] = len(local["unresolved"])
+        if "errors" in merged:
+            merged["error"] = merged.pop("errors")[0]
+        return merged
+    
     # Create and return the tool using BaseTool factory
     return BaseTool.create_tool(
         name="extract_entities",
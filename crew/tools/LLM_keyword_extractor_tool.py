@@ -1,26 +1,133 @@
 from crew.tools.base_tool import BaseTool
+from crew.utils.keyword_stats import DocumentFrequencyTable, extract_keywords_local
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from typing import Optional
 import json
 
-def create_keyword_extraction_tool(llm_client):
+KEYWORD_MODES = ["llm", "local", "tiered"]
+
+def create_keyword_extraction_tool(
+    llm_client,
+    mode: str = "llm",
+    frequency_table: Optional[DocumentFrequencyTable] = None,
+    confidence_threshold: float = 0.6,
+    update_corpus: bool = True,
+    excerpt_chars: int = 2000,
+    diet: Optional[TokenDiet] = None
+):
     """
     Creates a tool for extracting keywords from text content.
     
+    Modes:
+    - ``llm``: a full LLM generation over the content
+    - ``local``: TF-IDF weighted RAKE scoring against the corpus frequency table, no LLM
+    - ``tiered``: local extraction first; the LLM is only asked to refine the top
+      candidates when the local confidence is below ``confidence_threshold``
+    
     Args:
         llm_client: The LLM client to use for extraction
+        mode: Default extraction mode (llm, local or tiered)
+        frequency_table: Corpus document-frequency table for the local extractor
+        confidence_threshold: Local confidence below which tiered mode calls the LLM
+        update_corpus: Whether analyzed documents are added to the frequency table
+        excerpt_chars: Characters of content sent along with candidates for refinement
+        diet: TokenDiet applied to content before prompting (defaults to the shared DEFAULT_DIET)
         
     Returns:
         Tool: A CrewAI tool for keyword extraction
     """
-    def extract_keywords(content: str):
+    token_diet = diet if diet is not None else DEFAULT_DIET
+    
+    if mode not in KEYWORD_MODES:
+        raise ValueError(f"Unsupported keyword extraction mode: {mode}")
+    default_mode = mode
+    table = frequency_table if frequency_table is not None else DocumentFrequencyTable()
+    
+    def parse_response(response: str):
+        """Extract the JSON object from an LLM response."""
+        try:
+            # Find JSON in the response
+            json_start = response.find('{')
+            json_end = response.rfind('}') + 1
+            if json_start >= 0 and json_end > 0:
+                json_str = response[json_start:json_end]
+                return json.loads(json_str)
+            else:
+                # Fallback if proper JSON not found
+                return {
+                    "primary_keywords": [],
+                    "error": "Could not extract structured data from LLM response"
+                }
+        except Exception as e:
+            print(f"Error parsing LLM response: {e}")
+            return {
+                "primary_keywords": [],
+                "error": f"Error processing response: {str(e)}"
+            }
+    
+    def refine_keywords(content: str, local: dict):
+        """Ask the LLM to pick and label keywords from the local candidates."""
+        prompt = """
+        The following candidate keywords were extracted statistically from a document.
+        Using the candidates and the document excerpt, select and label the best keywords.
+        Prefer candidates, merge near-duplicates and add at most 3 missing keywords.
+        
+        Return ONLY a JSON object with the following structure:
+        {{
+            "primary_keywords": ["5-7 most important keywords"],
+            "secondary_keywords": ["8-12 additional relevant keywords"],
+            "technical_terms": ["specialized technical terms or jargon"]
+        }}
+        
+        Candidates:
+        {candidates}
+        
+        Document excerpt:
+        {content}
+        """
+        formatted_prompt = prompt.format(
+            candidates=", ".join(local["candidates"]),
+            content=token_diet.apply(content, "keyword_extraction")[0][:excerpt_chars]
+        )
+        return parse_response(BaseTool.generate(llm_client, formatted_prompt, "keyword_extraction", diet=token_diet))
+    
+    def extract_keywords(content: str, mode: Optional[str] = None, document_id: Optional[str] = None):
         """
         Extract keywords from the given content.
         
         Args:
             content: The text content to analyze
+            mode: Extraction mode override (llm, local or tiered)
+            document_id: Stable identifier used when adding the content to the corpus table
             
         Returns:
             Dict: Dictionary containing extracted keywords and metadata
         """
+        mode = mode or default_mode
+        if mode in ("local", "tiered"):
+            if update_corpus:
+                table.add_document(content, document_id=document_id)
+            local = extract_keywords_local(content, table)
+            result = {
+                "primary_keywords": local["primary_keywords"],
+                "secondary_keywords": local["secondary_keywords"],
+                "technical_terms": local["technical_terms"],
+                "confidence": local["confidence"],
+                "source": "local"
+            }
+            if mode == "local" or local["confidence"] >= confidence_threshold or not local["candidates"]:
+                return result
+            
+            refined = refine_keywords(content, local)
+            if "error" in refined:
+                # The local result is still usable when refinement fails
+                result["refine_error"] = refined["error"]
+                return result
+            refined.setdefault("technical_terms", local["technical_terms"])
+            refined["confidence"] = local["confidence"]
+            refined["source"] = "llm_refined"
+            return refined
+        
         # Extensive prompt for keyword extraction
         prompt = """
         Analyze the following content and extract the most relevant keywords.
@@ -32,41 +139,24 @@ def create_keyword_extraction_tool(llm_client):
         - Trending topics mentioned
         
         Return ONLY a JSON object with the following structure:
-        {
+        {{
             "primary_keywords": ["keyword1", "keyword2", "keyword3"],
             "secondary_keywords": ["keyword4", "keyword5", "keyword6"],
             "technical_terms": ["term1", "term2", "term3"],
             "marketable_concepts": ["concept1", "concept2", "concept3"]
-        }
+        }}
         
         Content to analyze:
         {content}
         """
         
         # Make the LLM call
+        content, _ = token_diet.apply(content, "keyword_extraction")
         formatted_prompt = prompt.format(content=content)
-        response = llm_client.generate(formatted_prompt)
+        response = BaseTool.generate(llm_client, formatted_prompt, "keyword_extraction", diet=token_diet)
         
         # Parse the response to extract JSON
-        try:
-            # Find JSON in the response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > 0:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
-            else:
-                # Fallback if proper JSON not found
-                return {
-                    "primary_keywords": [],
-                    "error": "Could not extract structured data from LLM response"
-                }
-        except Exception as e:
-            print(f"Error parsing LLM response: {e}")
-            return {
-                "primary_keywords": [],
-                "error": f"Error processing response: {str(e)}"
-            }
+        return parse_response(response)
     
     # Create and return the tool using BaseTool factory
     return BaseTool.create_tool(
@@ -79,6 +169,11 @@ def create_keyword_extraction_tool(llm_client):
                 "content": {
                     "type": "string",
                     "description": "The text content to analyze for keyword extraction"
+                },
+                "mode": {
+                    "type": "string",
+                    "description": "Extraction mode: llm, local (no LLM call) or tiered (LLM only when local confidence is low)",
+                    "enum": KEYWORD_MODES
                 }
             },
             "required": ["content"]
@@ -1,16 +1,25 @@
 from crew.tools.base_tool import BaseTool
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from typing import Optional
 import json
 
-def create_theme_extraction_tool(llm_client):
+def create_theme_extraction_tool(llm_client, theme_engine=None, diet: Optional[TokenDiet] = None):
     """
     Creates a tool for extracting themes from text content.
     
+    With a fitted CorpusThemeEngine the primary theme is a nearest-centroid lookup
+    against the corpus themes instead of a per-document LLM generation.
+    
     Args:
         llm_client: The LLM client to use for extraction
+        theme_engine: Optional CorpusThemeEngine for corpus-level themes
+        diet: TokenDiet applied to content before prompting (defaults to the shared DEFAULT_DIET)
         
     Returns:
         Tool: A CrewAI tool for theme extraction
     """
+    token_diet = diet if diet is not None else DEFAULT_DIET
+    
     def extract_themes(content: str):
         """
         Extract themes from the given content.
@@ -21,6 +30,11 @@ def create_theme_extraction_tool(llm_client):
         Returns:
             Dict: Dictionary containing extracted themes and metadata
         """
+        if theme_engine is not None and theme_engine.centroids is not None:
+            result = theme_engine.primary_theme(text=content)
+            result["source"] = "corpus_clusters"
+            return result
+        
         # Extensive prompt for theme extraction
         prompt = """
         Analyze the following content and identify the main themes and topics.
@@ -32,21 +46,22 @@ def create_theme_extraction_tool(llm_client):
         - Philosophical or theoretical frameworks
         
         Return ONLY a JSON object with the following structure:
-        {
+        {{
             "primary_theme": "The main overarching theme",
             "secondary_themes": ["theme1", "theme2", "theme3"],
             "business_domains": ["domain1", "domain2"],
             "philosophical_frameworks": ["framework1", "framework2"],
             "summary": "A brief 1-2 sentence summary of the content's thematic elements"
-        }
+        }}
         
         Content to analyze:
         {content}
         """
         
         # Make the LLM call
+        content, _ = token_diet.apply(content, "theme_extraction")
         formatted_prompt = prompt.format(content=content)
-        response = llm_client.generate(formatted_prompt)
+        response = BaseTool.generate(llm_client, formatted_prompt, "theme_extraction", diet=token_diet)
         
         # Parse the response to extract JSON
         try:
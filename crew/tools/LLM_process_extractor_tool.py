@@ -1,16 +1,21 @@
 from crew.tools.base_tool import BaseTool
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from typing import Optional
 import json
 
-def create_process_extraction_tool(llm_client):
+def create_process_extraction_tool(llm_client, diet: Optional[TokenDiet] = None):
     """
     Creates a tool for extracting processes and steps from content.
     
     Args:
         llm_client: The LLM client to use for extraction
+        diet: TokenDiet applied to content before prompting (defaults to the shared DEFAULT_DIET)
         
     Returns:
         Tool: A CrewAI tool for process extraction
     """
+    token_diet = diet if diet is not None else DEFAULT_DIET
+    
     def extract_processes(content: str):
         """
         Extract processes, workflows, and steps from the given content.
@@ -32,31 +37,31 @@ def create_process_extraction_tool(llm_client):
         - Requirements or prerequisites
         
         Return ONLY a JSON object with the following structure:
-        {
+        {{
             "identified_processes": [
-                {
+                {{
                     "name": "Name of process 1",
                     "steps": ["step 1", "step 2", "step 3"],
                     "is_complete": true/false,
                     "prerequisites": ["prerequisite 1", "prerequisite 2"],
                     "estimated_complexity": "low/medium/high"
-                }
+                }}
             ],
             "workflows": [
-                {
+                {{
                     "name": "Name of workflow 1",
                     "description": "Brief description",
                     "steps": ["step 1", "step 2", "step 3"]
-                }
+                }}
             ],
             "decision_points": [
-                {
+                {{
                     "decision": "Decision to make",
                     "options": ["option 1", "option 2"],
                     "considerations": ["consideration 1", "consideration 2"]
-                }
+                }}
             ]
-        }
+        }}
         
         If no clear processes are identified, return an empty array for each category.
         
@@ -65,8 +70,9 @@ def create_process_extraction_tool(llm_client):
         """
         
         # Make the LLM call
+        content, _ = token_diet.apply(content, "process_extraction")
         formatted_prompt = prompt.format(content=content)
-        response = llm_client.generate(formatted_prompt)
+        response = BaseTool.generate(llm_client, formatted_prompt, "process_extraction", diet=token_diet)
         
         # Parse the response to extract JSON
         try:
@@ -1,43 +1,30 @@
 from crew.tools.base_tool import BaseTool
 from crew.interfaces.prompt_loader import get_prompt
+from crew.utils.markdown_splitter import split_sections
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from typing import Optional
 import json
 
-def create_section_analyzer_tool(llm_client):
+def create_section_analyzer_tool(llm_client, local_structure: bool = True, diet: Optional[TokenDiet] = None):
     """
     Creates a tool for analyzing document structure, sections, and organization.
-    
+
+    With ``local_structure`` the section titles, heading levels and word counts are
+    parsed deterministically from the markdown/plain text, and the LLM is only asked
+    for key points, structure quality and suggestions against that outline.
+
     Args:
         llm_client: The LLM client to use for analysis
-        
+        local_structure: Whether to compute the outline locally
+        diet: TokenDiet applied to content before prompting (defaults to the shared DEFAULT_DIET)
+
     Returns:
         Tool: A CrewAI tool for section analysis
     """
-    def analyze_sections(content: str, variant: str = "standard"):
-        """
-        Analyze document structure and sections from the given content.
-        
-        Args:
-            content: The document content to analyze
-            variant: The prompt variant to use (default: standard)
-            
-        Returns:
-            Dict: Dictionary containing section analysis results
-        """
-        # Get the appropriate prompt template
-        prompt_template = get_prompt("section_analyzer", variant)
-        
-        if not prompt_template:
-            return {
-                "error": f"Prompt template not found for section_analyzer/{variant}"
-            }
-        
-        # Format the prompt with the content
-        formatted_prompt = prompt_template.format(content=content)
-        
-        # Make the LLM call
-        response = llm_client.generate(formatted_prompt)
-        
-        # Parse the response to extract JSON
+    token_diet = diet if diet is not None else DEFAULT_DIET
+
+    def parse_response(response: str):
+        """Extract the JSON object from an LLM response."""
         try:
             # Find JSON in the response
             json_start = response.find('{')
@@ -50,7 +37,7 @@ def create_section_analyzer_tool(llm_client):
                 return {
                     "document_type": "",
                     "sections": [],
-                    
+
                     "error": "Could not extract structured data from LLM response"
                 }
         except Exception as e:
@@ -58,10 +45,79 @@ def create_section_analyzer_tool(llm_client):
             return {
                 "document_type": "",
                     "sections": [],
-                    
+
                 "error": f"Error processing response: {str(e)}"
             }
-    
+
+    def format_outline(sections: list):
+        """Render the local outline as numbered lines for the prompt."""
+        lines = []
+        for number, section in enumerate(sections, 1):
+            title = section["section_title"] or "(untitled preamble)"
+            indent = "  " * max(section["section_level"] - 1, 0)
+            lines.append(f"{indent}{number}. [H{section['section_level']}] {title} ({section['word_count']} words)")
+        return "\n".join(lines)
+
+    def merge_outline(sections: list, result: dict):
+        """Attach LLM key points to the locally computed sections."""
+        key_points = {}
+        for entry in result.pop("section_key_points", None) or []:
+            if isinstance(entry, dict):
+                try:
+                    key_points[int(entry.get("section"))] = entry.get("key_points") or []
+                except (TypeError, ValueError):
+                    continue
+
+        result["sections"] = [
+            {
+                "section_title": section["section_title"],
+                "section_level": section["section_level"],
+                "word_count": section["word_count"],
+                "key_points": key_points.get(number, [])
+            }
+            for number, section in enumerate(sections, 1)
+        ]
+        return result
+
+    def analyze_sections(content: str, variant: str = "standard"):
+        """
+        Analyze document structure and sections from the given content.
+
+        Args:
+            content: The document content to analyze
+            variant: The prompt variant to use (default: standard)
+
+        Returns:
+            Dict: Dictionary containing section analysis results
+        """
+        sections = None
+        if local_structure:
+            sections = split_sections(content)
+            if variant == "standard":
+                variant = "outline"
+
+        # Get the appropriate prompt template
+        prompt_template = get_prompt("section_analyzer", variant)
+
+        if not prompt_template:
+            return {
+                "error": f"Prompt template not found for section_analyzer/{variant}"
+            }
+
+        # Format the prompt with the content (templates without {outline} ignore it)
+        outline = format_outline(sections) if sections is not None else ""
+        content, _ = token_diet.apply(content, "section_analyzer")
+        formatted_prompt = prompt_template.format(content=content, outline=outline)
+
+        # Make the LLM call
+        response = BaseTool.generate(llm_client, formatted_prompt, f"section_analyzer/{variant}", diet=token_diet)
+
+        # Parse the response to extract JSON
+        result = parse_response(response)
+        if sections is None:
+            return result
+        return merge_outline(sections, result)
+
     # Create and return the tool using BaseTool factory
     return BaseTool.create_tool(
         name="analyze_sections",
@@ -1,67 +1,174 @@
 from crew.tools.base_tool import BaseTool
 from crew.interfaces.prompt_loader import get_prompt
+from crew.interfaces.cascade_client import DEFAULT_CASCADE
+from crew.utils.helpers import estimate_tokens, chunk_text
+from crew.utils.result_cache import ResultCache
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import hashlib
 import json
 
-def create_summary_generation_tool(llm_client):
+# The map/reduce passes only condense text, so they default to the cascade's smallest model
+DEFAULT_CHUNK_MODEL = DEFAULT_CASCADE[0]
+
+def create_summary_generation_tool(
+    llm_client,
+    chunk_model: Optional[str] = DEFAULT_CHUNK_MODEL,
+    cache: Optional[ResultCache] = None,
+    hierarchical_threshold_tokens: int = 6000,
+    chunk_tokens: int = 1500,
+    max_workers: int = 4,
+    diet: Optional[TokenDiet] = None
+):
     """
     Creates a tool for generating summaries of content.
-    
+
+    Content longer than ``hierarchical_threshold_tokens`` is summarized map-reduce
+    style: it is chunked by tokens, chunks are condensed in parallel with a smaller
+    ``chunk_model``, the condensed parts are reduced recursively until they fit, and
+    the final pass uses the requested executive/technical prompt. Chunk summaries are
+    cached independently of the variant, so switching variants only re-runs the
+    final pass. Chunks whose call fails are left out of the final prompt and counted
+    in the ``hierarchical`` stats.
+
     Args:
         llm_client: The LLM client to use for generation
-        
+        chunk_model: Model for the map/reduce passes (defaults to DEFAULT_CHUNK_MODEL;
+                     None uses the client's model)
+        cache: Cache for chunk summaries (defaults to an in-memory cache)
+        hierarchical_threshold_tokens: Content size above which summarization is hierarchical
+        chunk_tokens: Token budget per chunk
+        max_workers: Maximum number of concurrent chunk summaries
+        diet: TokenDiet applied to content before prompting (defaults to the shared DEFAULT_DIET)
+
     Returns:
         Tool: A CrewAI tool for summary generation
     """
+    chunk_cache = cache or ResultCache()
+    token_diet = diet if diet is not None else DEFAULT_DIET
+
+    def parse_response(response: str, variant: str):
+        """Extract the JSON object from an LLM response."""
+        try:
+            # Find JSON in the response
+            json_start = response.find('{')
+            json_end = response.rfind('}') + 1
+            if json_start >= 0 and json_end > 0:
+                json_str = response[json_start:json_end]
+                return json.loads(json_str)
+            else:
+                # Fallback if proper JSON not found
+                summary_key = f"{variant}_summary"
+                return {
+                    summary_key: "",
+                    "key_points": [],
+                    "error": "Could not extract structured data from LLM response"
+                }
+        except Exception as e:
+            print(f"Error parsing LLM response: {e}")
+            summary_key = f"{variant}_summary"
+            return {
+                summary_key: "",
+                "key_points": [],
+                "error": f"Error processing response: {str(e)}"
+            }
+
+    def summarize_chunk(chunk: str, chunk_template: str):
+        """Condense one chunk, reusing a cached summary when available."""
+        digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+        key = f"summary_chunk:{chunk_model or ''}:{digest}"
+        cached = chunk_cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        summary = BaseTool.generate(
+            llm_client,
+            chunk_template.format(content=chunk),
+            "summary_generation/chunk",
+            diet=token_diet,
+            model=chunk_model
+        ).strip()
+        if summary and not summary.startswith("Error:"):
+            chunk_cache.set(key, summary)
+        return summary, False
+
+    def map_reduce(content: str, chunk_template: str):
+        """Condense content until it fits in a single final prompt."""
+        stats = {"chunks": 0, "chunks_cached": 0, "chunks_failed": 0, "levels": 0}
+        parts = chunk_text(content, chunk_tokens)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                results = list(executor.map(lambda chunk: summarize_chunk(chunk, chunk_template), parts))
+                stats["levels"] += 1
+                stats["chunks"] += len(results)
+                stats["chunks_cached"] += sum(1 for _, was_cached in results if was_cached)
+                # Failed calls return an error message, which must not be summarized as content
+                failed = [summary for summary, _ in results if summary.startswith("Error:")]
+                stats["chunks_failed"] += len(failed)
+                summaries = [summary for summary, _ in results if summary and not summary.startswith("Error:")]
+                if not summaries:
+                    return summaries, stats
+
+                combined = "\n\n".join(summaries)
+                if estimate_tokens(combined) <= hierarchical_threshold_tokens or len(summaries) <= 1:
+                    return summaries, stats
+
+                # Group the summaries into chunks for the next reduce level
+                next_parts = chunk_text(combined, chunk_tokens)
+                if len(next_parts) >= len(parts):
+                    return summaries, stats
+                parts = next_parts
+
     def generate_summary(content: str, variant: str = "executive"):
         """
         Generate a summary of the given content.
-        
+
         Args:
             content: The text content to analyze
             variant: The prompt variant to use (default: executive)
-            
+
         Returns:
             Dict: Dictionary containing the generated summary
         """
         # Get the appropriate prompt template
         prompt_template = get_prompt("summary_generation", variant)
-        
+
         if not prompt_template:
             return {
                 "error": f"Prompt template not found for summary_generation/{variant}"
             }
-        
+
+        content, _ = token_diet.apply(content, f"summary_generation/{variant}")
+        stats = None
+        if estimate_tokens(content) > hierarchical_threshold_tokens:
+            chunk_template = get_prompt("summary_generation", "chunk")
+            if chunk_template:
+                summaries, stats = map_reduce(content, chunk_template)
+                if not summaries:
+                    return {
+                        f"{variant}_summary": "",
+                        "key_points": [],
+                        "error": f"All {stats['chunks_failed']} chunk summaries failed",
+                        "hierarchical": stats
+                    }
+                content = "\n\n".join(
+                    f"[Part {i}] {summary}" for i, summary in enumerate(summaries, 1)
+                )
+
         # Format the prompt with the content
         formatted_prompt = prompt_template.format(content=content)
-        
+
         # Make the LLM call
-        response = llm_client.generate(formatted_prompt)
-        
+        response = BaseTool.generate(llm_client, formatted_prompt, f"summary_generation/{variant}", diet=token_diet)
+
         # Parse the response to extract JSON
-    try:
-        # Find JSON in the response
-        json_start = response.find('{')
-        json_end = response.rfind('}') + 1
-        if json_start >= 0 and json_end > 0:
-            json_str = response[json_start:json_end]
-            return json.loads(json_str)
-        else:
-            # Fallback if proper JSON not found
-            summary_key = f"{variant}_summary"
-            return {
-                summary_key: "",
-                "key_points": [],
-                "error": "Could not extract structured data from LLM response"
-            }
-    except Exception as e:
-        print(f"Error parsing LLM response: {e}")
-        summary_key = f"{variant}_summary"
-        return {
-            summary_key: "",
-            "key_points": [],
-            "error": f"Error processing response: {str(e)}"
-        }
-    
+        result = parse_response(response, variant)
+        if stats:
+            result["hierarchical"] = stats
+        return result
+
     # Create and return the tool using BaseTool factory
     return BaseTool.create_tool(
         name="generate_summary",
@@ -1,5 +1,10 @@
+import time
 from typing import Callable, Optional, Dict, Any
 
+from crew.tools.schemas import output_budget, is_truncated, BUDGET_RETRY_FACTOR, TEXT_BUDGETS
+from crew.tools.field_repair import repair_response
+from crew.utils.helpers import estimate_tokens
+
 # Check which version of the CrewAI tools API is available
 try:
     # Try importing Tool directly
@@ -47,4 +52,52 @@ class BaseTool:
             func=func,
             description=description,
             parameters=parameters or {}
-        )
\ No newline at end of file
+        )
+    
+    @staticmethod
+    def generate(llm_client, prompt: str, tool_type: str, diet=None, options: Optional[Dict[str, Any]] = None,
+                 model: Optional[str] = None) -> str:
+        """
+        Run a tool prompt through the LLM client.
+        
+        Generation is capped by the output budget derived from the tool's schema
+        (``num_predict`` plus stop sequences). A response cut off by the budget is
+        retried once with a larger one, and a response that is still malformed or
+        missing fields is repaired field by field. Clients that route per tool
+        (such as CascadeClient) receive the tool type so they can validate the
+        response against the tool's output schema; other clients get a plain
+        generate call. Free-text prompts (tool types in TEXT_BUDGETS) have no
+        schema, so they always get a plain call and are returned unrepaired.
+        
+        Args:
+            llm_client: The LLM client to use
+            prompt: The formatted prompt
+            tool_type: Tool type, optionally with a "/variant" suffix
+            diet: Optional TokenDiet that records the call latency
+            options: Generation options replacing the schema's output budget
+            model: Model override for plain generate calls
+            
+        Returns:
+            str: The generated text
+        """
+        free_text = tool_type in TEXT_BUDGETS
+        
+        def call(options):
+            if not free_text and hasattr(llm_client, "generate_for_tool"):
+                return llm_client.generate_for_tool(prompt, tool_type, options=options)
+            if model:
+                return llm_client.generate(prompt, model=model, options=options)
+            return llm_client.generate(prompt, options=options)
+        
+        options = options or output_budget(tool_type)
+        started = time.perf_counter()
+        response = call(options)
+        if diet is not None:
+            diet.observe(tool_type, estimate_tokens(prompt), time.perf_counter() - started)
+        # Caller options without a token budget have nothing to enlarge
+        if options and options.get("num_predict") and is_truncated(response):
+            options = dict(options, num_predict=options["num_predict"] * BUDGET_RETRY_FACTOR)
+            response = call(options)
+        if free_text:
+            return response
+        return repair_response(llm_client, prompt, tool_type, response)
@@ -0,0 +1,235 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+
+from crew.tools.LLM_keyword_extractor_tool import create_keyword_extraction_tool
+from crew.tools.LLM_primary_theme_extractor_tool import create_theme_extraction_tool
+from crew.tools.LLM_process_extractor_tool import create_process_extraction_tool
+from crew.tools.LLM_entity_extraction_tool import create_entity_extraction_tool
+from crew.tools.base_tool import BaseTool
+from crew.tools.schemas import (
+    describe_fields, extract_json, validate_tool_output, output_budget, JSON_STOP_SEQUENCES
+)
+from crew.utils.content_diet import TokenDiet, DEFAULT_DIET
+from crew.utils.helpers import estimate_tokens
+
+# Extraction tools that support batch mode, with the task line of their batch prompt
+BATCH_TASKS = {
+    "keyword_extraction": (
+        create_keyword_extraction_tool,
+        "Extract the most relevant keywords: industry terminology, technical concepts, "
+        "marketable terms and domain-specific vocabulary."
+    ),
+    "entity_extraction": (
+        create_entity_extraction_tool,
+        "Extract named entities (people, organizations, locations, dates, products, concepts) "
+        "and the relationships between them."
+    ),
+    "theme_extraction": (
+        create_theme_extraction_tool,
+        "Identify the main themes and topics, business domains and frameworks."
+    ),
+    "process_extraction": (
+        create_process_extraction_tool,
+        "Identify any processes, workflows, step-by-step instructions and decision points."
+    )
+}
+
+# Share of the single-document output budget reserved per packed document
+SHORT_DOCUMENT_OUTPUT_DIVISOR = 3
+
+BATCH_PROMPT = """
+{task}
+
+Each document below starts with a line "### <id>". Analyze every document on its own.
+
+Return ONLY a JSON object with the following structure:
+{{
+    "results": [
+        {{"document_id": "<id>", ...}}
+    ]
+}}
+with exactly one entry per document, each containing "document_id" and these fields:
+{fields}
+
+{documents}
+"""
+
+
+class BatchExtractor:
+    """
+    Runs an extraction tool over many short documents with packed prompts.
+
+    Short documents are put on the tool's token diet and packed into one
+    prompt per batch, with an array of results keyed by document id. Each
+    batch is sized so that both the packed content and the expected output fit
+    their token budgets. Packed prompts run through BaseTool.generate like
+    single-document calls. Any document whose result is missing or invalid
+    falls back to a single-document tool call, and so do documents too long
+    to pack.
+    """
+
+    def __init__(
+        self,
+        llm_client,
+        tool_type: str,
+        tool=None,
+        max_prompt_tokens: int = 3000,
+        max_output_tokens: int = 3072,
+        max_documents: int = 8,
+        short_document_tokens: int = 400,
+        document_output_tokens: Optional[int] = None,
+        max_workers: int = 4,
+        diet: Optional[TokenDiet] = None
+    ):
+        """
+        Initialize the batch extractor.
+
+        Args:
+            llm_client: The LLM client to use
+            tool_type: One of BATCH_TASKS
+            tool: Optional pre-built tool used for single-document fallbacks
+            max_prompt_tokens: Budget for the packed documents of one prompt
+            max_output_tokens: Budget for the generated results of one prompt
+            max_documents: Maximum number of documents per prompt
+            short_document_tokens: Documents longer than this are never packed
+            document_output_tokens: Output tokens reserved per packed document (defaults
+                                    to a third of the tool's single-document budget,
+                                    as short notes yield few items per field)
+            max_workers: Maximum number of concurrent requests
+            diet: TokenDiet applied to documents before packing (defaults to the shared
+                  DEFAULT_DIET); pass the same diet as the tool's when supplying a tool
+        """
+        if tool_type not in BATCH_TASKS:
+            raise ValueError(f"Unsupported batch tool type: {tool_type}")
+        factory, self.task = BATCH_TASKS[tool_type]
+        self.llm_client = llm_client
+        self.tool_type = tool_type
+        self.diet = diet if diet is not None else DEFAULT_DIET
+        self.tool = tool or factory(llm_client, diet=self.diet)
+        self.max_prompt_tokens = max_prompt_tokens
+        self.max_output_tokens = max_output_tokens
+        self.max_documents = max_documents
+        self.short_document_tokens = short_document_tokens
+        self.max_workers = max_workers
+        self.document_output_tokens = (
+            document_output_tokens or output_budget(tool_type)["num_predict"] // SHORT_DOCUMENT_OUTPUT_DIVISOR
+        )
+        self.stats = {"documents": 0, "batches": 0, "batched_documents": 0, "fallbacks": 0, "single_calls": 0}
+        self._lock = threading.Lock()
+
+    def pack(self, documents: Dict[str, str]) -> List[List[str]]:
+        """
+        Group short documents into batches that fit the token budgets.
+
+        Args:
+            documents: Mapping of document id to content
+
+        Returns:
+            list: Batches of document ids; single-element batches are not packed
+        """
+        per_batch = max(1, min(self.max_documents, self.max_output_tokens // self.document_output_tokens))
+        batches = []
+        current: List[str] = []
+        current_tokens = 0
+        for doc_id, content in documents.items():
+            # Sized as packed, after the diet
+            tokens = estimate_tokens(self.diet.clean(content, self.tool_type)[0]) + 8
+            if tokens > self.short_document_tokens:
+                batches.append([doc_id])
+                continue
+            if current and (len(current) >= per_batch or current_tokens + tokens > self.max_prompt_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(doc_id)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run_single(self, content: str) -> Dict[str, Any]:
+        with self._lock:
+            self.stats["single_calls"] += 1
+        return self.tool.func(content)
+
+    def _run_batch(self, batch: List[str], documents: Dict[str, str]) -> Dict[str, Any]:
+        """Run one packed prompt and demultiplex its results."""
+        # Short positional ids keep the prompt small and survive any id format
+        aliases = {f"doc{i}": doc_id for i, doc_id in enumerate(batch, 1)}
+        packed = "\n\n".join(
+            f"### {alias}\n{self.diet.apply(documents[doc_id], self.tool_type)[0]}"
+            for alias, doc_id in aliases.items()
+        )
+        prompt = BATCH_PROMPT.format(
+            task=self.task,
+            fields=describe_fields(self.tool_type),
+            documents=packed
+        )
+        # Same budget cap, truncation retry and repair as single-document calls
+        response = BaseTool.generate(self.llm_client, prompt, f"{self.tool_type}/batch", diet=self.diet, options={
+            "num_predict": self.document_output_tokens * len(batch),
+            "stop": list(JSON_STOP_SEQUENCES)
+        })
+
+        data = None if response.startswith("Error:") else extract_json(response)
+        entries = data.get("results") if isinstance(data, dict) else None
+
+        results = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            doc_id = aliases.get(str(entry.get("document_id", "")).strip())
+            if doc_id is None or doc_id in results:
+                continue
+            result = {key: value for key, value in entry.items() if key != "document_id"}
+            if not validate_tool_output(self.tool_type, result):
+                result["source"] = "batch"
+                results[doc_id] = result
+
+        missing = [doc_id for doc_id in batch if doc_id not in results]
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["batched_documents"] += len(batch) - len(missing)
+            self.stats["fallbacks"] += len(missing)
+        for doc_id in missing:
+            results[doc_id] = self._run_single(documents[doc_id])
+        return results
+
+    def extract(self, documents: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the extraction tool over documents, packing short ones.
+
+        Args:
+            documents: Mapping of document id to content
+
+        Returns:
+            Dict: Per-document tool results keyed by document id, in input order
+        """
+        batches = self.pack(documents)
+
+        def run(batch):
+            if len(batch) == 1:
+                return {batch[0]: self._run_single(documents[batch[0]])}
+            return self._run_batch(batch, documents)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch_results in executor.map(run, batches):
+                results.update(batch_results)
+
+        with self._lock:
+            self.stats["documents"] += len(documents)
+        return {doc_id: results[doc_id] for doc_id in documents}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics.
+
+        Returns:
+            Dict: Documents, packed batches, documents served from a batch,
+                  fallbacks, single-document calls and prompts saved
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats["prompts_saved"] = stats["documents"] - stats["batches"] - stats["single_calls"]
+        return stats
@@ -0,0 +1,88 @@
+import json
+from typing import Dict, Any, List
+
+from crew.tools.schemas import get_schema, extract_json, schema_errors, output_budget, describe_fields
+from crew.utils.helpers import repair_json
+
+# The original prompt comes first so a server with prompt caching reuses its prefix
+FOLLOW_UP_PROMPT = """{prompt}
+
+A previous answer to the request above was missing or had invalid values for some fields.
+Return ONLY a JSON object containing exactly these fields:
+{fields}
+
+Previous answer (for reference, do not repeat it):
+{partial}
+"""
+
+
+def invalid_fields(tool_type: str, data: Dict[str, Any]) -> List[str]:
+    """
+    List the top-level fields of parsed tool output that are missing or invalid.
+
+    Only the schema is checked; quality checks are left to the cascade, which
+    can escalate to a stronger model.
+
+    Args:
+        tool_type: Tool type, optionally with a "/variant" suffix
+        data: Parsed LLM response
+
+    Returns:
+        list: Field names, in schema order
+    """
+    schema = get_schema(tool_type)
+    if not schema:
+        return []
+    flagged = {problem.split(":", 1)[0].split(".", 1)[0] for problem in schema_errors(tool_type, data)}
+    return [name for name in schema.model_fields if name in flagged]
+
+
+def repair_response(llm_client, prompt: str, tool_type: str, response: str) -> str:
+    """
+    Repair a tool response instead of regenerating it.
+
+    Syntax slips are fixed locally. Fields that are still missing or invalid
+    against the tool's schema are requested with a single follow-up prompt
+    budgeted for just those fields, and merged into the partial result.
+
+    Args:
+        llm_client: The LLM client used for the follow-up prompt
+        prompt: The original formatted prompt
+        tool_type: Tool type, optionally with a "/variant" suffix
+        response: Raw LLM response to the original prompt
+
+    Returns:
+        str: The original response if it was valid or beyond repair,
+             otherwise the repaired JSON object; fields the follow-up could
+             not supply are listed under an "error" key
+    """
+    if response.startswith("Error:"):
+        return response
+
+    data = extract_json(response)
+    syntax_repaired = data is None
+    if syntax_repaired:
+        data = repair_json(response)
+        if data is None:
+            return response
+
+    fields = invalid_fields(tool_type, data)
+    if fields:
+        field_lines = describe_fields(tool_type, fields)
+        partial = {key: value for key, value in data.items() if key not in fields}
+        follow_up = FOLLOW_UP_PROMPT.format(
+            prompt=prompt,
+            fields=field_lines,
+            partial=json.dumps(partial, ensure_ascii=False)
+        )
+        patch_response = llm_client.generate(follow_up, options=output_budget(tool_type, fields))
+        patch = None if patch_response.startswith("Error:") else repair_json(patch_response)
+        if patch:
+            data.update({name: patch[name] for name in fields if name in patch})
+        remaining = invalid_fields(tool_type, data)
+        if remaining:
+            data["error"] = f"Missing or invalid fields after repair: {', '.join(remaining)}"
+    elif not syntax_repaired:
+        return response
+
+    return json.dumps(data, ensure_ascii=False)
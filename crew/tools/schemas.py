@@ -0,0 +1,424 @@
+import json
+import typing
+from typing import Optional, Dict, Any, List, Type
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from crew.utils.helpers import repair_json
+
+
+def budget(tokens: int = 0, items: int = 1, item_tokens: int = 0) -> Dict[str, Any]:
+    """
+    Declare the expected output size of a schema field.
+
+    Args:
+        tokens: Token budget for a scalar field
+        items: Maximum number of items for a list field
+        item_tokens: Tokens per list item
+
+    Returns:
+        Dict: ``json_schema_extra`` for pydantic.Field
+    """
+    return {"output_tokens": tokens or items * item_tokens}
+
+
+class ToolOutput(BaseModel):
+    """Base for tool output schemas; extra keys from the LLM are kept."""
+    model_config = ConfigDict(extra="allow")
+
+
+class KeywordExtractionOutput(ToolOutput):
+    primary_keywords: List[str] = Field(json_schema_extra=budget(items=7, item_tokens=5))
+    secondary_keywords: List[str] = Field([], json_schema_extra=budget(items=12, item_tokens=5))
+    technical_terms: List[str] = Field([], json_schema_extra=budget(items=10, item_tokens=6))
+    marketable_concepts: List[str] = Field([], json_schema_extra=budget(items=8, item_tokens=6))
+
+
+class ThemeExtractionOutput(ToolOutput):
+    primary_theme: str = Field(json_schema_extra=budget(20))
+    secondary_themes: List[str] = Field([], json_schema_extra=budget(items=5, item_tokens=8))
+    business_domains: List[str] = Field([], json_schema_extra=budget(items=5, item_tokens=6))
+    philosophical_frameworks: List[str] = Field([], json_schema_extra=budget(items=5, item_tokens=8))
+    summary: str = Field("", json_schema_extra=budget(60))
+
+
+class ProcessExtractionOutput(ToolOutput):
+    identified_processes: List[Dict[str, Any]] = Field([], json_schema_extra=budget(items=5, item_tokens=120))
+    workflows: List[Dict[str, Any]] = Field([], json_schema_extra=budget(items=3, item_tokens=80))
+    decision_points: List[Dict[str, Any]] = Field([], json_schema_extra=budget(items=3, item_tokens=60))
+
+
+class EntityExtractionOutput(ToolOutput):
+    people: List[Any] = Field([], json_schema_extra=budget(items=15, item_tokens=6))
+    organizations: List[Any] = Field([], json_schema_extra=budget(items=15, item_tokens=6))
+    locations: List[Any] = Field([], json_schema_extra=budget(items=10, item_tokens=5))
+    dates: List[Any] = Field([], json_schema_extra=budget(items=10, item_tokens=5))
+    products: List[Any] = Field([], json_schema_extra=budget(items=10, item_tokens=6))
+    concepts: List[Any] = Field([], json_schema_extra=budget(items=15, item_tokens=6))
+    relationships: List[Any] = Field([], json_schema_extra=budget(items=15, item_tokens=25))
+
+
+class CodeAnalysisOutput(ToolOutput):
+    language: str = Field(json_schema_extra=budget(5))
+    purpose: str = Field(json_schema_extra=budget(60))
+    components: List[Any] = Field([], json_schema_extra=budget(items=15, item_tokens=20))
+    complexity: str = Field("", json_schema_extra=budget(3))
+    quality_issues: List[Any] = Field([], json_schema_extra=budget(items=8, item_tokens=50))
+    strengths: List[Any] = Field([], json_schema_extra=budget(items=6, item_tokens=20))
+
+
+class ContentRepurposingOutput(ToolOutput):
+    content_type: str = Field("", json_schema_extra=budget(10))
+    repurposing_opportunities: List[Dict[str, Any]] = Field(json_schema_extra=budget(items=5, item_tokens=80))
+    recommended_approach: Any = Field(None, json_schema_extra=budget(80))
+
+
+class RepurposingFormatOutput(ToolOutput):
+    content_type: str = Field("", json_schema_extra=budget(10))
+    format: str = Field("", json_schema_extra=budget(8))
+    audience: str = Field(json_schema_extra=budget(20))
+    key_elements: List[Any] = Field([], json_schema_extra=budget(items=6, item_tokens=15))
+    modification_needed: str = Field(json_schema_extra=budget(3))
+    value_potential: str = Field(json_schema_extra=budget(3))
+
+
+class SectionAnalysisOutput(ToolOutput):
+    document_type: str = Field("", json_schema_extra=budget(10))
+    sections: List[Dict[str, Any]] = Field(json_schema_extra=budget(items=20, item_tokens=50))
+    structure_quality: str = Field(json_schema_extra=budget(3))
+    suggestions: List[Any] = Field([], json_schema_extra=budget(items=3, item_tokens=30))
+
+
+class SectionOutlineOutput(ToolOutput):
+    document_type: str = Field("", json_schema_extra=budget(10))
+    section_key_points: List[Dict[str, Any]] = Field([], json_schema_extra=budget(items=20, item_tokens=45))
+    structure_quality: str = Field(json_schema_extra=budget(3))
+    suggestions: List[Any] = Field([], json_schema_extra=budget(items=3, item_tokens=30))
+
+
+class ExecutiveSummaryOutput(ToolOutput):
+    # 2-3 paragraphs
+    executive_summary: str = Field(json_schema_extra=budget(items=3, item_tokens=100))
+    key_points: List[Any] = Field([], json_schema_extra=budget(items=5, item_tokens=30))
+    insights: List[Any] = Field([], json_schema_extra=budget(items=3, item_tokens=35))
+    recommendations: List[Any] = Field([], json_schema_extra=budget(items=3, item_tokens=35))
+    business_implications: Any = Field("", json_schema_extra=budget(80))
+
+
+class TechnicalSummaryOutput(ToolOutput):
+    # 2-3 paragraphs
+    technical_summary: str = Field(json_schema_extra=budget(items=3, item_tokens=100))
+    system_components: List[Any] = Field([], json_schema_extra=budget(items=8, item_tokens=15))
+    technical_requirements: List[Any] = Field([], json_schema_extra=budget(items=8, item_tokens=15))
+    implementation_notes: Any = Field("", json_schema_extra=budget(120))
+    technical_limitations: Any = Field("", json_schema_extra=budget(100))
+    next_steps: List[Any] = Field([], json_schema_extra=budget(items=5, item_tokens=25))
+
+
+class BatchOutput(ToolOutput):
+    # One entry per packed document; BatchExtractor passes the budget for the batch size
+    results: List[Dict[str, Any]] = Field(json_schema_extra=budget(items=8, item_tokens=150))
+
+
+# Output schemas keyed by tool type, or "tool_type/variant" where a variant
+# changes the shape of the response
+TOOL_SCHEMAS: Dict[str, Type[ToolOutput]] = {
+    "keyword_extraction": KeywordExtractionOutput,
+    "theme_extraction": ThemeExtractionOutput,
+    "process_extraction": ProcessExtractionOutput,
+    "entity_extraction": EntityExtractionOutput,
+    "code_analysis": CodeAnalysisOutput,
+    "content_repurposing": ContentRepurposingOutput,
+    "content_repurposing/format": RepurposingFormatOutput,
+    "section_analyzer": SectionAnalysisOutput,
+    "section_analyzer/outline": SectionOutlineOutput,
+    "summary_generation": ExecutiveSummaryOutput,
+    "summary_generation/executive": ExecutiveSummaryOutput,
+    "summary_generation/technical": TechnicalSummaryOutput,
+    "keyword_extraction/batch": BatchOutput,
+    "entity_extraction/batch": BatchOutput,
+    "theme_extraction/batch": BatchOutput,
+    "process_extraction/batch": BatchOutput
+}
+
+# Minimum number of words for the main text field of a response
+MIN_SUMMARY_WORDS = 20
+
+
+def _check_keywords(data: Dict[str, Any]) -> List[str]:
+    if not [k for k in data.get("primary_keywords") or [] if str(k).strip()]:
+        return ["primary_keywords: empty"]
+    return []
+
+
+def _check_theme(data: Dict[str, Any]) -> List[str]:
+    if not str(data.get("primary_theme") or "").strip():
+        return ["primary_theme: empty"]
+    return []
+
+
+def _check_summary(data: Dict[str, Any]) -> List[str]:
+    for key in ("executive_summary", "technical_summary"):
+        if key in data and len(str(data[key]).split()) < MIN_SUMMARY_WORDS:
+            return [f"{key}: shorter than {MIN_SUMMARY_WORDS} words"]
+    return []
+
+
+def _check_any_field(*fields: str):
+    """Build a check that passes when at least one of ``fields`` is present."""
+    def check(data: Dict[str, Any]) -> List[str]:
+        if not any(field in data for field in fields):
+            return [f"{fields[0]}: none of {', '.join(fields)} present"]
+        return []
+    return check
+
+
+def _check_repurposing(data: Dict[str, Any]) -> List[str]:
+    if not data.get("repurposing_opportunities"):
+        return ["repurposing_opportunities: empty"]
+    return []
+
+
+def _check_batch(data: Dict[str, Any]) -> List[str]:
+    if not data.get("results"):
+        return ["results: empty"]
+    return []
+
+
+# Simple semantic checks run after schema validation
+QUALITY_CHECKS = {
+    "keyword_extraction": _check_keywords,
+    "theme_extraction": _check_theme,
+    "summary_generation": _check_summary,
+    "content_repurposing": _check_repurposing,
+    "process_extraction": _check_any_field("identified_processes", "workflows", "decision_points"),
+    "entity_extraction": _check_any_field("people", "organizations", "locations", "dates", "products", "concepts"),
+    # Entries of packed prompts are validated one by one by BatchExtractor
+    "keyword_extraction/batch": _check_batch,
+    "entity_extraction/batch": _check_batch,
+    "theme_extraction/batch": _check_batch,
+    "process_extraction/batch": _check_batch
+}
+
+
+def _lookup(table: Dict[str, Any], tool_type: str):
+    """Find the entry for ``tool_type``, falling back from "tool/variant" to "tool"."""
+    if tool_type in table:
+        return table[tool_type]
+    return table.get(tool_type.split("/", 1)[0])
+
+
+def get_schema(tool_type: str) -> Optional[Type[ToolOutput]]:
+    """
+    Get the output schema for a tool type.
+
+    Args:
+        tool_type: Tool type, optionally with a "/variant" suffix
+
+    Returns:
+        The Pydantic model, or None if the tool type has no schema
+    """
+    return _lookup(TOOL_SCHEMAS, tool_type)
+
+
+def _describe(annotation) -> str:
+    """Describe a schema annotation as a JSON type for prompts."""
+    origin = typing.get_origin(annotation)
+    if annotation is str:
+        return "string"
+    if origin is list:
+        args = typing.get_args(annotation)
+        if args and args[0] is not typing.Any:
+            return f"array of {_describe(args[0])}"
+        return "array"
+    if origin is dict or annotation is dict:
+        return "object"
+    return "any JSON value"
+
+
+def describe_fields(tool_type: str, fields: Optional[List[str]] = None) -> str:
+    """
+    Describe a tool's output fields as "- name: type" lines for prompts.
+
+    Args:
+        tool_type: Tool type, optionally with a "/variant" suffix
+        fields: Only describe these fields (defaults to all schema fields)
+
+    Returns:
+        str: One line per field, in schema order
+    """
+    schema = get_schema(tool_type)
+    if not schema:
+        return ""
+    return "\n".join(
+        f"- {name}: {_describe(field.annotation)}"
+        for name, field in schema.model_fields.items()
+        if fields is None or name in fields
+    )
+
+
+def extract_json(response: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract the outermost JSON object from an LLM response.
+
+    Args:
+        response: Raw LLM response text
+
+    Returns:
+        Dict: The parsed object, or None if no valid object was found
+    """
+    json_start = response.find('{')
+    json_end = response.rfind('}') + 1
+    if json_start < 0 or json_end <= json_start:
+        return None
+    try:
+        data = json.loads(response[json_start:json_end])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def schema_errors(tool_type: str, data: Dict[str, Any]) -> List[str]:
+    """
+    Validate parsed tool output against its schema only.
+
+    Args:
+        tool_type: Tool type, optionally with a "/variant" suffix
+        data: Parsed LLM response
+
+    Returns:
+        list: Missing or invalid fields, as "field: message" strings
+    """
+    schema = get_schema(tool_type)
+    if not schema:
+        return []
+    try:
+        schema.model_validate(data)
+    except ValidationError as e:
+        return [
+            f"{'.'.join(str(part) for part in error['loc']) or 'response'}: {error['msg']}"
+            for error in e.errors()
+        ]
+    return []
+
+
+def validate_tool_output(tool_type: str, data: Any) -> List[str]:
+    """
+    Validate parsed tool output against its schema and quality checks.
+
+    Args:
+        tool_type: Tool type, optionally with a "/variant" suffix
+        data: Parsed LLM response
+
+    Returns:
+        list: Problems found, as "field: message" strings (empty when valid)
+    """
+    if not isinstance(data, dict):
+        return ["response: no JSON object found"]
+    if "error" in data:
+        return [f"error: {data['error']}"]
+
+    problems = schema_errors(tool_type, data)
+    check = _lookup(QUALITY_CHECKS, tool_type)
+    if check and not problems:
+        problems.extend(check(data))
+    return problems
+
+
+def validate_response(tool_type: str, response: str) -> List[str]:
+    """
+    Parse a raw LLM response (repairing its syntax if needed) and validate it.
+
+    Args:
+        tool_type: Tool type, optionally with a "/variant" suffix
+        response: Raw LLM response text
+
+    Returns:
+        list: Problems found (empty when valid)
+    """
+    if response.startswith("Error:"):
+        return [f"response: {response}"]
+    data = extract_json(response)
+    if data is None:
+        data = repair_json(response)
+    return validate_tool_output(tool_type, data)
+
+
+# Output budgets: JSON keys and punctuation per field, the headroom over the summed
+# field budgets, and the factor applied when a truncated response is retried
+FIELD_OVERHEAD_TOKENS = 8
+BUDGET_HEADROOM = 1.5
+BUDGET_RETRY_FACTOR = 2
+
+# The tools ask for JSON only; these cut off commentary after the object
+JSON_STOP_SEQUENCES = ["\n\n\n", "\nNote:", "\nExplanation:"]
+
+# Budgets for free-text prompts that have no output schema
+TEXT_BUDGETS = {
+    "summary_generation/chunk": 400
+}
+
+
+def output_budget(tool_type: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Derive generation options (num_predict and stop sequences) for a tool type.
+
+    The token budget is the sum of the per-field budgets declared on the tool's
+    schema plus key overhead, with headroom for fields the model adds.
+
+    Args:
+        tool_type: Tool type, optionally with a "/variant" suffix
+        fields: Only budget for these fields (e.g. for a follow-up prompt)
+
+    Returns:
+        Dict: Generation options, or None if the tool type has no budget
+    """
+    if tool_type in TEXT_BUDGETS:
+        return {"num_predict": TEXT_BUDGETS[tool_type]}
+
+    schema = get_schema(tool_type)
+    if not schema:
+        return None
+    tokens = 0
+    for name, field in schema.model_fields.items():
+        if fields is not None and name not in fields:
+            continue
+        extra = field.json_schema_extra if isinstance(field.json_schema_extra, dict) else {}
+        tokens += extra.get("output_tokens", 0) + FIELD_OVERHEAD_TOKENS
+    return {"num_predict": int(tokens * BUDGET_HEADROOM), "stop": list(JSON_STOP_SEQUENCES)}
+
+
+def is_truncated(response: str) -> bool:
+    """
+    Detect a JSON response that was cut off before its outermost object closed.
+
+    Args:
+        response: Raw LLM response text
+
+    Returns:
+        bool: True if a JSON object was opened but never closed
+    """
+    start = response.find('{')
+    if start < 0:
+        return False
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for char in response[start:]:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return False
+    return True
@@ -0,0 +1,179 @@
+import copy
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import yaml
+
+# Rules are tried by descending priority, then in list order; the first rule
+# with a hashtag present in the note decides its content type
+DEFAULT_CLASSIFICATION_RULES = {
+    "rules": [
+        {"content_type": "video", "hashtags": ["youtube", "video"]},
+        {"content_type": "article", "hashtags": ["article", "blog"]},
+        {"content_type": "book", "hashtags": ["book"]},
+        {"content_type": "process", "hashtags": ["process", "workflow"]}
+    ],
+    # Content type by file extension when no hashtag rule matches
+    "extensions": {".md": "note", ".txt": "note", ".pdf": "document"},
+    "default_content_type": "unknown",
+    # Each store is enabled if any of its conditions holds: "always", a
+    # content type in "content_types", any hashtag ("has_hashtags") or one of
+    # the listed "hashtags"
+    "storage": {
+        "obsidian": {"always": True},
+        "vector_db": {"has_hashtags": True},
+        "sql_db": {"content_types": ["process", "workflow"]}
+    }
+}
+
+
+class ClassificationRules:
+    """
+    Classifies notes from their hashtags and extension with compiled rules.
+
+    The rule table is compiled into a hashtag index (hashtag -> winning rule)
+    and an extension lookup, so classifying a note costs a dict lookup per
+    hashtag however many rules there are. Storage decisions are precomputed
+    per content type.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None):
+        """
+        Initialize and compile the rules.
+
+        Args:
+            rules: Rule table; keys missing from it fall back to DEFAULT_CLASSIFICATION_RULES
+
+        Raises:
+            ValueError: If a rule has no content_type
+        """
+        self.rules = copy.deepcopy(DEFAULT_CLASSIFICATION_RULES)
+        self.rules.update(rules or {})
+        self._compile()
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> "ClassificationRules":
+        """
+        Create rules from a YAML rule table.
+
+        Args:
+            path: Path to the YAML file
+
+        Returns:
+            ClassificationRules: The compiled rules
+        """
+        with open(path, 'r') as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def _compile(self) -> None:
+        ranked = sorted(enumerate(self.rules["rules"]), key=lambda item: (-item[1].get("priority", 0), item[0]))
+        # hashtag -> (rank, content_type); the best-ranked rule keeps the tag
+        self._tag_index: Dict[str, tuple] = {}
+        for rank, (_, rule) in enumerate(ranked):
+            if "content_type" not in rule:
+                raise ValueError(f"Classification rule without content_type: {rule}")
+            for tag in rule.get("hashtags", []):
+                self._tag_index.setdefault(str(tag).lower(), (rank, rule["content_type"]))
+
+        self._extensions = {
+            (ext if ext.startswith(".") else f".{ext}").lower(): content_type
+            for ext, content_type in self.rules["extensions"].items()
+        }
+        self._default = self.rules["default_content_type"]
+
+        self._stores = list(self.rules["storage"])
+        self._always = {store for store, cond in self.rules["storage"].items() if cond.get("always")}
+        self._by_type: Dict[str, frozenset] = {}
+        for store, cond in self.rules["storage"].items():
+            for content_type in cond.get("content_types", []):
+                self._by_type[content_type] = self._by_type.get(content_type, frozenset()) | {store}
+        self._any_tag = {store for store, cond in self.rules["storage"].items() if cond.get("has_hashtags")}
+        self._by_tag: Dict[str, frozenset] = {}
+        for store, cond in self.rules["storage"].items():
+            for tag in cond.get("hashtags", []):
+                tag = str(tag).lower()
+                self._by_tag[tag] = self._by_tag.get(tag, frozenset()) | {store}
+
+    def content_type(self, hashtags: Iterable[str], file_path: Union[str, Path]) -> str:
+        """
+        Determine a note's content type.
+
+        Args:
+            hashtags: Lowercased hashtags of the note
+            file_path: Path of the note, for the extension fallback
+
+        Returns:
+            str: The content type
+        """
+        best = None
+        for tag in hashtags:
+            hit = self._tag_index.get(tag)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        if best is not None:
+            return best[1]
+        return self._extensions.get(Path(file_path).suffix.lower(), self._default)
+
+    def storage(self, content_type: str, hashtags: List[str]) -> Dict[str, bool]:
+        """
+        Decide which stores a note goes to.
+
+        Args:
+            content_type: The note's content type
+            hashtags: Lowercased hashtags of the note
+
+        Returns:
+            Dict: Store name -> whether the note is stored there
+        """
+        enabled = self._always | self._by_type.get(content_type, frozenset())
+        if hashtags:
+            enabled = enabled | self._any_tag
+            for tag in hashtags:
+                stores = self._by_tag.get(tag)
+                if stores:
+                    enabled = enabled | stores
+        return {store: store in enabled for store in self._stores}
+
+    def classify(self, hashtags: List[str], file_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Classify a note from its hashtags and path.
+
+        Args:
+            hashtags: Lowercased hashtags of the note
+            file_path: Path of the note
+
+        Returns:
+            Dict: content_type and storage decisions
+        """
+        content_type = self.content_type(hashtags, file_path)
+        return {"content_type": content_type, "storage": self.storage(content_type, hashtags)}
+
+    def reclassify(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Re-apply the rules to already-scanned records without reading the files.
+
+        Args:
+            records: Records from note_classifier.classify_many or read_records
+
+        Returns:
+            Iterator: Copies of the records with content_type and storage recomputed;
+                      records of files that failed to scan are passed through
+        """
+        for record in records:
+            if record.get("error"):
+                yield record
+                continue
+            updated = dict(record)
+            updated.update(self.classify(record["hashtags"], record["path"]))
+            yield updated
+
+
+_default_rules: Optional[ClassificationRules] = None
+
+
+def default_rules() -> ClassificationRules:
+    """Get the shared rules compiled from DEFAULT_CLASSIFICATION_RULES."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = ClassificationRules()
+    return _default_rules
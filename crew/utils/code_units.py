@@ -0,0 +1,193 @@
+import ast
+import hashlib
+from typing import List, Dict, Any, Optional
+
+# Nodes that add a decision point to cyclomatic complexity
+BRANCH_NODES = (
+    ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp,
+    ast.ExceptHandler, ast.With, ast.AsyncWith, ast.Assert
+)
+if hasattr(ast, "match_case"):
+    BRANCH_NODES = BRANCH_NODES + (ast.match_case,)
+
+UNIT_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def count_loc(source: str) -> int:
+    """
+    Count logical lines of code (non-blank, non-comment lines).
+
+    Args:
+        source: Source code
+
+    Returns:
+        int: Number of lines of code
+    """
+    return sum(
+        1 for line in source.splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    )
+
+
+def cyclomatic_complexity(node: ast.AST) -> int:
+    """
+    Compute McCabe cyclomatic complexity of a code unit.
+
+    Nested function and class definitions are counted as part of the unit.
+    ``with`` blocks are counted because a context manager may suppress exceptions.
+
+    Args:
+        node: The AST node of the unit
+
+    Returns:
+        int: Cyclomatic complexity (1 for straight-line code)
+    """
+    complexity = 1
+    for child in ast.walk(node):
+        if isinstance(child, BRANCH_NODES):
+            complexity += 1
+        elif isinstance(child, ast.BoolOp):
+            complexity += len(child.values) - 1
+        elif isinstance(child, ast.comprehension):
+            complexity += 1 + len(child.ifs)
+    return complexity
+
+
+def import_graph(tree: ast.Module) -> Dict[str, List[str]]:
+    """
+    Map each imported module to the names bound from it.
+
+    Args:
+        tree: The parsed module
+
+    Returns:
+        Dict: Module name to list of local names it provides
+    """
+    graph: Dict[str, List[str]] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                graph.setdefault(alias.name, []).append(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            for alias in node.names:
+                graph.setdefault(module, []).append(alias.asname or alias.name)
+    return graph
+
+
+def _used_names(node: ast.AST) -> set:
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            names.add(child.id)
+        elif isinstance(child, ast.Attribute):
+            root = child
+            while isinstance(root, ast.Attribute):
+                root = root.value
+            if isinstance(root, ast.Name):
+                names.add(root.id)
+    return names
+
+
+def _unit(name: str, kind: str, source: str, start: int, end: int, node: ast.AST,
+          imports: Dict[str, List[str]]) -> Dict[str, Any]:
+    used = _used_names(node)
+    return {
+        "name": name,
+        "type": kind,
+        "start_line": start,
+        "end_line": end,
+        "source": source,
+        "hash": hashlib.sha256(f"{kind}\x00{name}\x00{source}".encode("utf-8")).hexdigest(),
+        "loc": count_loc(source),
+        "cyclomatic_complexity": cyclomatic_complexity(node),
+        "uses_imports": sorted(
+            module for module, bound in imports.items() if used.intersection(bound)
+        )
+    }
+
+
+def extract_code_units(source: str, max_unit_lines: int = 200) -> Optional[Dict[str, Any]]:
+    """
+    Parse Python source into function and class units with static metrics.
+
+    Top-level functions and classes become units; a class longer than
+    ``max_unit_lines`` is split into its methods plus a class body unit.
+    Remaining top-level statements (imports, constants, ``__main__`` blocks)
+    form a single ``module`` unit.
+
+    Args:
+        source: Python source code
+        max_unit_lines: Classes longer than this are split into methods
+
+    Returns:
+        Dict with ``units``, ``imports``, ``docstring`` and module-level
+        ``metrics``, or None if the source is not valid Python
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+
+    lines = source.splitlines()
+    imports = import_graph(tree)
+
+    def segment(node):
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        return start, node.end_lineno, "\n".join(lines[start - 1:node.end_lineno])
+
+    units = []
+    module_nodes = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            start, end, text = segment(node)
+            methods = [child for child in node.body if isinstance(child, UNIT_NODES)]
+            if end - start + 1 > max_unit_lines and methods:
+                body_lines = set(range(start, end + 1))
+                for method in methods:
+                    m_start, m_end, m_text = segment(method)
+                    body_lines.difference_update(range(m_start, m_end + 1))
+                    units.append(_unit(f"{node.name}.{method.name}", "method", m_text,
+                                       m_start, m_end, method, imports))
+                class_text = "\n".join(lines[i - 1] for i in sorted(body_lines))
+                units.append(_unit(node.name, "class", class_text, start, end,
+                                   ast.Module(body=[c for c in node.body if c not in methods],
+                                              type_ignores=[]),
+                                   imports))
+            else:
+                units.append(_unit(node.name, "class", text, start, end, node, imports))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            start, end, text = segment(node)
+            units.append(_unit(node.name, "function", text, start, end, node, imports))
+        else:
+            module_nodes.append(node)
+
+    # Skip a module unit that is nothing but imports and the docstring
+    significant = [
+        node for node in module_nodes
+        if not isinstance(node, (ast.Import, ast.ImportFrom))
+        and not (isinstance(node, ast.Expr) and isinstance(getattr(node, "value", None), ast.Constant))
+    ]
+    if significant:
+        module_lines = []
+        for node in module_nodes:
+            module_lines.extend(lines[node.lineno - 1:node.end_lineno])
+        module = ast.Module(body=module_nodes, type_ignores=[])
+        units.insert(0, _unit("<module>", "module", "\n".join(module_lines),
+                              module_nodes[0].lineno, module_nodes[-1].end_lineno, module, imports))
+
+    complexities = [unit["cyclomatic_complexity"] for unit in units] or [1]
+    return {
+        "units": units,
+        "imports": imports,
+        "docstring": ast.get_docstring(tree) or "",
+        "metrics": {
+            "loc": count_loc(source),
+            "total_lines": len(lines),
+            "units": len(units),
+            "functions": sum(1 for unit in units if unit["type"] in ("function", "method")),
+            "classes": sum(1 for unit in units if unit["type"] == "class"),
+            "max_complexity": max(complexities),
+            "average_complexity": round(sum(complexities) / len(complexities), 2)
+        }
+    }
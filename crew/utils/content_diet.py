@@ -0,0 +1,289 @@
+import copy
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+import yaml
+
+from crew.utils.helpers import estimate_tokens
+from crew.utils.markdown_splitter import strip_frontmatter, FENCE_PATTERN
+
+MARKDOWN_DATA_IMAGE = re.compile(r'!\[([^\]]*)\]\(\s*data:[\w/+.-]+;base64,[A-Za-z0-9+/=\s]+\)')
+DATA_URI = re.compile(r'data:[\w/+.-]+;base64,[A-Za-z0-9+/=]{64,}')
+URL_PATTERN = re.compile(r'(https?)://([^/\s)>\]"\']+)[^\s)>\]"\']*')
+HTML_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+OBSIDIAN_COMMENT = re.compile(r'%%.*?%%', re.DOTALL)
+TRAILING_WHITESPACE = re.compile(r'[ \t]+$', re.MULTILINE)
+BLANK_LINE_RUN = re.compile(r'\n{3,}')
+INNER_SPACE_RUN = re.compile(r'(?<=\S)[ \t]{2,}(?=\S)')
+
+# Rule settings; tool entries override "default"
+DEFAULT_DIETS: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "frontmatter": True,
+        "base64": True,
+        # URLs longer than this are shortened to scheme://host/...
+        "max_url_length": 60,
+        "boilerplate": True,
+        # Extra regexes whose matches are removed as boilerplate
+        "boilerplate_patterns": [],
+        # Trailing whitespace and runs of blank lines
+        "whitespace": True,
+        # Runs of spaces between words outside code blocks
+        "collapse_spaces": True,
+        # keep, summarize (one-line placeholder) or drop
+        "code_blocks": "summarize"
+    },
+    # Source code is often sent unfenced, so only safe rules apply
+    "code_analysis": {"code_blocks": "keep", "max_url_length": 0, "boilerplate": False, "collapse_spaces": False},
+    "keyword_extraction": {"code_blocks": "keep"},
+    "process_extraction": {"code_blocks": "keep"}
+}
+
+# Prefill rate used for latency estimates until enough calls were observed
+DEFAULT_PREFILL_TOKENS_PER_SECOND = 400.0
+
+
+def _split_code_blocks(text: str) -> List[Tuple[bool, str]]:
+    """Split text into (is_code, text) segments on fenced code blocks."""
+    segments: List[Tuple[bool, str]] = []
+    current: List[str] = []
+    fence = None
+    for line in text.split("\n"):
+        match = FENCE_PATTERN.match(line)
+        if fence is None and match:
+            if current:
+                segments.append((False, "\n".join(current)))
+            current, fence = [line], match.group(1)
+        elif fence is not None and match and match.group(1) == fence:
+            current.append(line)
+            segments.append((True, "\n".join(current)))
+            current, fence = [], None
+        else:
+            current.append(line)
+    if current:
+        segments.append((fence is not None, "\n".join(current)))
+    return segments
+
+
+def _shorten_url(match: re.Match, max_length: int) -> str:
+    url = match.group(0)
+    if len(url) <= max_length:
+        return url
+    return f"{match.group(1)}://{match.group(2)}/..."
+
+
+class TokenDiet:
+    """
+    Normalizes document content before it is formatted into a tool prompt.
+
+    Frontmatter, base64 payloads, long URLs, comments/boilerplate, redundant
+    whitespace and (per tool) fenced code are stripped or summarized. Every
+    call is measured; tools that pass their LLM call timings to observe() get
+    latency savings estimated from the observed seconds per prompt token.
+    """
+
+    def __init__(self, diets: Optional[Dict[str, Dict[str, Any]]] = None,
+                 prefill_tokens_per_second: float = DEFAULT_PREFILL_TOKENS_PER_SECOND,
+                 history_size: int = 1000):
+        """
+        Initialize the diet.
+
+        Args:
+            diets: Rule settings keyed by tool type (and "default"), merged over DEFAULT_DIETS
+            prefill_tokens_per_second: Fallback prefill rate for latency estimates
+            history_size: Number of per-document records kept in ``history``
+        """
+        self.diets = copy.deepcopy(DEFAULT_DIETS)
+        for tool_type, settings in (diets or {}).items():
+            self.diets.setdefault(tool_type, {}).update(settings)
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        # Per-document stats of the most recent apply() calls
+        self.history = deque(maxlen=history_size)
+        self._observations: Dict[str, List[Tuple[int, float]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> "TokenDiet":
+        """
+        Create a diet from a YAML file of rule settings keyed by tool type.
+
+        Args:
+            path: Path to the YAML file
+
+        Returns:
+            TokenDiet: The configured diet
+        """
+        with open(path, 'r') as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def settings(self, tool_type: str) -> Dict[str, Any]:
+        """
+        Get the effective rule settings for a tool type.
+
+        Args:
+            tool_type: Tool type, optionally with a "/variant" suffix
+
+        Returns:
+            Dict: The "default" settings overridden by the tool's own
+        """
+        base = tool_type.split("/", 1)[0]
+        settings = dict(self.diets["default"])
+        settings.update(self.diets.get(base, {}))
+        if tool_type != base:
+            settings.update(self.diets.get(tool_type, {}))
+        return settings
+
+    def clean(self, content: str, tool_type: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Apply the tool's rules to content without recording statistics.
+
+        Args:
+            content: The document content
+            tool_type: Tool type, optionally with a "/variant" suffix
+
+        Returns:
+            tuple: (cleaned content, tokens removed per rule)
+        """
+        settings = self.settings(tool_type)
+        removed: Dict[str, int] = {}
+        text = content
+
+        def step(rule, new_text):
+            nonlocal text
+            saved = estimate_tokens(text) - estimate_tokens(new_text)
+            if saved:
+                removed[rule] = removed.get(rule, 0) + saved
+            text = new_text
+
+        if settings["frontmatter"]:
+            step("frontmatter", strip_frontmatter(text)[1])
+        if settings["base64"]:
+            step("base64", DATA_URI.sub("[base64 data]", MARKDOWN_DATA_IMAGE.sub(
+                lambda m: f"[image: {m.group(1)}]" if m.group(1) else "[image]", text)))
+        if settings["boilerplate"]:
+            cleaned = OBSIDIAN_COMMENT.sub("", HTML_COMMENT.sub("", text))
+            for pattern in settings["boilerplate_patterns"]:
+                cleaned = re.sub(pattern, "", cleaned, flags=re.MULTILINE)
+            step("boilerplate", cleaned)
+
+        segments = _split_code_blocks(text)
+        mode = settings["code_blocks"]
+        if mode != "keep":
+            kept = []
+            for is_code, segment in segments:
+                if not is_code:
+                    kept.append((is_code, segment))
+                elif mode == "summarize":
+                    lines = segment.split("\n")
+                    language = FENCE_PATTERN.sub("", lines[0]).strip()
+                    label = f"{language}, " if language else ""
+                    kept.append((False, f"[code block: {label}{max(len(lines) - 2, 0)} lines]"))
+            step("code_blocks", "\n".join(segment for _, segment in kept))
+            segments = kept
+
+        def map_prose(rule, func):
+            nonlocal segments
+            segments = [(is_code, segment if is_code else func(segment)) for is_code, segment in segments]
+            step(rule, "\n".join(segment for _, segment in segments))
+
+        max_url_length = settings["max_url_length"]
+        if max_url_length:
+            map_prose("long_urls", lambda segment: URL_PATTERN.sub(lambda m: _shorten_url(m, max_url_length), segment))
+        if settings["collapse_spaces"]:
+            # Leading indentation is kept; only runs between words collapse
+            map_prose("whitespace", lambda segment: INNER_SPACE_RUN.sub(" ", segment))
+        if settings["whitespace"]:
+            step("whitespace", BLANK_LINE_RUN.sub("\n\n", TRAILING_WHITESPACE.sub("", text)).strip())
+
+        return text, removed
+
+    def apply(self, content: str, tool_type: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Clean content for a tool prompt and record how much it saved.
+
+        Args:
+            content: The document content
+            tool_type: Tool type, optionally with a "/variant" suffix
+
+        Returns:
+            tuple: (cleaned content, per-document stats with tokens_before,
+                   tokens_after, tokens_removed and removed_by_rule)
+        """
+        cleaned, removed = self.clean(content, tool_type)
+        before = estimate_tokens(content)
+        after = estimate_tokens(cleaned)
+        stats = {
+            "tokens_before": before,
+            "tokens_after": after,
+            "tokens_removed": before - after,
+            "removed_by_rule": removed
+        }
+        with self._lock:
+            totals = self._stats.setdefault(tool_type.split("/", 1)[0], {
+                "documents": 0, "tokens_before": 0, "tokens_removed": 0
+            })
+            totals["documents"] += 1
+            totals["tokens_before"] += before
+            totals["tokens_removed"] += before - after
+            self.history.append(dict(stats, tool_type=tool_type))
+        return cleaned, stats
+
+    def observe(self, tool_type: str, prompt_tokens: int, seconds: float) -> None:
+        """
+        Record the latency of an LLM call for latency estimates.
+
+        Args:
+            tool_type: Tool type, optionally with a "/variant" suffix
+            prompt_tokens: Prompt size of the call
+            seconds: Wall-clock duration of the call
+        """
+        with self._lock:
+            observations = self._observations.setdefault(tool_type.split("/", 1)[0], [])
+            observations.append((prompt_tokens, seconds))
+            del observations[:-1000]
+
+    def _seconds_per_token(self, tool: str) -> float:
+        """Slope of latency over prompt size for a tool, or the fallback prefill rate."""
+        observations = self._observations.get(tool, [])
+        if len(observations) >= 2:
+            mean_tokens = sum(t for t, _ in observations) / len(observations)
+            mean_seconds = sum(s for _, s in observations) / len(observations)
+            variance = sum((t - mean_tokens) ** 2 for t, _ in observations)
+            if variance > 0:
+                slope = sum((t - mean_tokens) * (s - mean_seconds) for t, s in observations) / variance
+                if slope > 0:
+                    return slope
+        return 1.0 / self.prefill_tokens_per_second
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Report token savings and the estimated latency change per tool.
+
+        Returns:
+            Dict: Per tool: documents, tokens_before, tokens_removed,
+                  removed_fraction, seconds_per_prompt_token (measured slope or
+                  the fallback rate) and estimated_seconds_saved
+        """
+        with self._lock:
+            report = {}
+            for tool, totals in self._stats.items():
+                seconds_per_token = self._seconds_per_token(tool)
+                report[tool] = {
+                    "documents": totals["documents"],
+                    "tokens_before": totals["tokens_before"],
+                    "tokens_removed": totals["tokens_removed"],
+                    "removed_fraction": (
+                        totals["tokens_removed"] / totals["tokens_before"] if totals["tokens_before"] else 0.0
+                    ),
+                    "seconds_per_prompt_token": seconds_per_token,
+                    "estimated_seconds_saved": totals["tokens_removed"] * seconds_per_token
+                }
+            return report
+
+
+# Shared by tools created without their own diet
+DEFAULT_DIET = TokenDiet()
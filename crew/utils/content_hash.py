@@ -0,0 +1,41 @@
+import hashlib
+import mmap
+from pathlib import Path
+from typing import Union
+
+try:
+    import xxhash
+
+    HASH_ALGORITHM = "xxh3"
+
+    def _digest(data) -> str:
+        return xxhash.xxh3_128_hexdigest(data)
+except ImportError:
+    # blake2b is the fastest 128-bit hash in the standard library
+    HASH_ALGORITHM = "blake2b"
+
+    def _digest(data) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def content_hash(path: Union[str, Path]) -> str:
+    """
+    Hash a file's contents for identity checks.
+
+    The file is memory-mapped and hashed in one call, without copying it into
+    Python memory. The digest is prefixed with the algorithm so journals
+    written with another algorithm never match by accident.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        str: "<algorithm>:<hex digest>"
+    """
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return f"{HASH_ALGORITHM}:{_digest(mapped)}"
+        except ValueError:
+            # Empty files cannot be mapped
+            return f"{HASH_ALGORITHM}:{_digest(b'')}"
@@ -0,0 +1,164 @@
+import itertools
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Dict, List, Tuple
+
+
+@dataclass
+class _Pending:
+    first_seen: float
+    # Last event, or last time the file was seen with a new size/mtime
+    changed_at: float
+    state: Optional[Tuple[int, int]]
+
+
+class Debouncer:
+    """
+    Holds file events back until the file has stopped changing.
+
+    Repeated events for a path collapse into one pending entry. A path is
+    released once no event arrived for quiet_period seconds and its size and
+    mtime have not changed for as long. Released paths are handed out in
+    micro-batches of up to batch_size, waiting at most max_batch_delay for a
+    batch to fill.
+    """
+
+    def __init__(
+        self,
+        quiet_period: float = 2.0,
+        batch_size: int = 16,
+        max_batch_delay: float = 0.5,
+        max_wait: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the debouncer.
+
+        Args:
+            quiet_period: Seconds a file must stay unchanged before it is released
+            batch_size: Maximum number of paths per batch
+            max_batch_delay: Seconds a released path may wait for its batch to fill
+            max_wait: Seconds after which a file that never settles is released anyway
+                      (None waits indefinitely)
+            clock: Time source, in seconds
+        """
+        self.quiet_period = quiet_period
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_wait = max_wait
+        self.clock = clock
+        # Ordered by changed_at, so the entries due first are at the front
+        self._pending: Dict[Path, _Pending] = {}
+        self._ready: Dict[Path, float] = {}
+        self.stats = {"events": 0, "collapsed": 0, "released": 0, "forced": 0, "vanished": 0, "batches": 0}
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._ready)
+
+    @staticmethod
+    def _state(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def add(self, path: Path) -> None:
+        """
+        Record a change event for a path.
+
+        Args:
+            path: The file that changed
+        """
+        now = self.clock()
+        self.stats["events"] += 1
+        if path in self._ready:
+            # Changed again before its batch went out; wait for it to settle again
+            self._ready.pop(path)
+        entry = self._pending.pop(path, None)
+        if entry is None:
+            entry = _Pending(now, now, self._state(path))
+        else:
+            self.stats["collapsed"] += 1
+            entry.changed_at = now
+        self._pending[path] = entry
+
+    def discard(self, path: Path) -> None:
+        """
+        Forget a path, e.g. because it was deleted.
+
+        Args:
+            path: The file to forget
+        """
+        self._pending.pop(path, None)
+        self._ready.pop(path, None)
+
+    def _settle(self, now: float) -> None:
+        """Move pending paths that have been stable for the quiet period to the ready list."""
+        due = []
+        for path, entry in self._pending.items():
+            if now - entry.changed_at < self.quiet_period:
+                break
+            due.append(path)
+
+        for path in due:
+            entry = self._pending.pop(path)
+            state = self._state(path)
+            if state is None:
+                self.stats["vanished"] += 1
+                continue
+            forced = self.max_wait is not None and now - entry.first_seen >= self.max_wait
+            if state != entry.state and not forced:
+                # Still being written; check again after another quiet period
+                entry.state, entry.changed_at = state, now
+                self._pending[path] = entry
+                continue
+            self._ready[path] = now
+            self.stats["released"] += 1
+            if state != entry.state:
+                self.stats["forced"] += 1
+
+    def next_batch(self) -> Optional[List[Path]]:
+        """
+        Take the next micro-batch of settled paths, if one is due.
+
+        A batch is due when it is full or its oldest path has waited
+        max_batch_delay since it settled.
+
+        Returns:
+            list: Up to batch_size paths in the order they settled, or None
+        """
+        now = self.clock()
+        self._settle(now)
+        if not self._ready:
+            return None
+        oldest = next(iter(self._ready.values()))
+        if len(self._ready) < self.batch_size and now - oldest < self.max_batch_delay:
+            return None
+        batch = list(itertools.islice(self._ready, self.batch_size))
+        for path in batch:
+            del self._ready[path]
+        self.stats["batches"] += 1
+        return batch
+
+    def next_timeout(self, default: float = 1.0) -> float:
+        """
+        Seconds until the next batch could be due, for the event wait.
+
+        Args:
+            default: Upper bound when nothing is waiting
+
+        Returns:
+            float: Seconds to wait before calling next_batch again
+        """
+        now = self.clock()
+        deadlines = []
+        if self._pending:
+            deadlines.append(next(iter(self._pending.values())).changed_at + self.quiet_period)
+        if self._ready:
+            deadlines.append(next(iter(self._ready.values())) + self.max_batch_delay)
+        if not deadlines:
+            return default
+        return min(default, max(0.0, min(deadlines) - now))
@@ -0,0 +1,277 @@
+import json
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+# Entity categories that are stable enough to be learned into the gazetteer
+GAZETTEER_CATEGORIES = ["people", "organizations", "locations", "products"]
+
+CAPITALIZED_RUN_PATTERN = re.compile(
+    r"\b[A-Z][a-zA-Z'\-]+(?:\s+(?:of|de|van|von|the|and|&)?\s*[A-Z][a-zA-Z'\-]+)*\b"
+)
+ACRONYM_PATTERN = re.compile(r"\b[A-Z]{2,6}s?\b")
+DATE_PATTERN = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}\b"
+    r"|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b"
+    r"|\b\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\b"
+)
+SENTENCE_PATTERN = re.compile(r"[^.!?\n]+(?:[.!?]+|\n|$)")
+
+# Capitalized words that are almost never entities on their own
+COMMON_CAPITALIZED = frozenset("""
+The A An This That These Those It Its We Our You Your They Their He She His Her I If When While
+However But And Or So Then There Here What Which Who Why How In On At For From To With By As Of
+Yes No Not Also Note Notes Todo Summary Introduction Conclusion Step Steps Figure Table See Example
+Monday Tuesday Wednesday Thursday Friday Saturday Sunday Today Tomorrow Yesterday
+""".split())
+
+
+class AhoCorasickAutomaton:
+    """Multi-pattern string matcher (Aho-Corasick) with incremental pattern insertion."""
+
+    def __init__(self):
+        """Initialize an empty automaton."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, Any]]] = [[]]
+        self._size = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: str, value: Any = None) -> bool:
+        """
+        Insert a pattern into the trie.
+
+        Insertion is incremental; failure links are recomputed lazily on the next search.
+
+        Args:
+            pattern: The string to match
+            value: Payload returned with matches of this pattern
+
+        Returns:
+            bool: True if the pattern was new
+        """
+        if not pattern:
+            return False
+        with self._lock:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            for existing, _ in self._output[state]:
+                if existing == pattern:
+                    return False
+            self._output[state].append((pattern, value))
+            self._size += 1
+            self._dirty = True
+            return True
+
+    def _build(self) -> None:
+        """Compute failure links breadth-first; output sets are resolved at match time."""
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+        self._dirty = False
+
+    def search(self, text: str) -> List[Tuple[int, int, str, Any]]:
+        """
+        Find all pattern occurrences in text.
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            list: (start, end, pattern, value) tuples, end exclusive
+        """
+        matches = []
+        with self._lock:
+            if self._dirty:
+                self._build()
+            goto, fail, output = self._goto, self._fail, self._output
+
+            state = 0
+            for index, char in enumerate(text):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                emit = state
+                while emit:
+                    for pattern, value in output[emit]:
+                        matches.append((index - len(pattern) + 1, index + 1, pattern, value))
+                    emit = fail[emit]
+        return matches
+
+
+def _is_word_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_")
+
+
+class EntityGazetteer:
+    """Corpus-wide dictionary of confirmed entities with an automaton for local resolution."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the gazetteer, loading it from disk if the file exists.
+
+        Args:
+            path: Optional JSON file used by load/save
+        """
+        self.path = Path(path) if path else None
+        self.entities: Dict[str, set] = {category: set() for category in GAZETTEER_CATEGORIES}
+        self.automaton = AhoCorasickAutomaton()
+        if self.path and self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return sum(len(names) for names in self.entities.values())
+
+    def add_entity(self, name: str, category: str) -> bool:
+        """
+        Confirm an entity so later documents resolve it locally.
+
+        Args:
+            name: The entity's surface form
+            category: One of GAZETTEER_CATEGORIES
+
+        Returns:
+            bool: True if the entity was new
+        """
+        name = " ".join(str(name).split())
+        if category not in self.entities or len(name) < 2:
+            return False
+        if name in self.entities[category]:
+            return False
+        self.entities[category].add(name)
+        self.automaton.add(name, category)
+        return True
+
+    def confirm(self, result: Dict[str, Any]) -> int:
+        """
+        Learn the entities of an extraction result.
+
+        Args:
+            result: Entity extraction result with category lists
+
+        Returns:
+            int: Number of new entities added
+        """
+        added = 0
+        for category in GAZETTEER_CATEGORIES:
+            for name in result.get(category) or []:
+                if isinstance(name, dict):
+                    name = name.get("name", "")
+                if isinstance(name, str) and self.add_entity(name, category):
+                    added += 1
+        return added
+
+    def resolve(self, text: str) -> Dict[str, Any]:
+        """
+        Resolve known entities and find unresolved candidates in text.
+
+        Known entities are matched with the automaton; candidates come from
+        capitalization runs and acronyms that do not overlap a known match.
+        Dates are recognised with regular expressions.
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            Dict: ``known`` (category -> names), ``dates``, ``unresolved``
+                  (list of {text, start, end}) candidates
+        """
+        known = {category: [] for category in GAZETTEER_CATEGORIES}
+        covered = []
+
+        # Longest match first so "New York Times" wins over "New York"
+        matches = sorted(self.automaton.search(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        last_end = -1
+        for start, end, pattern, category in matches:
+            if start < last_end or not _is_word_boundary(text, start, end):
+                continue
+            if pattern not in known[category]:
+                known[category].append(pattern)
+            covered.append((start, end))
+            last_end = end
+
+        dates = []
+        for match in DATE_PATTERN.finditer(text):
+            if match.group(0) not in dates:
+                dates.append(match.group(0))
+            covered.append(match.span())
+
+        def overlaps(start, end):
+            return any(start < c_end and end > c_start for c_start, c_end in covered)
+
+        unresolved = []
+        seen = set()
+        for sentence in SENTENCE_PATTERN.finditer(text):
+            offset = sentence.start()
+            body = sentence.group(0)
+            leading = len(body) - len(body.lstrip())
+            for pattern in (CAPITALIZED_RUN_PATTERN, ACRONYM_PATTERN):
+                for match in pattern.finditer(body):
+                    candidate = match.group(0).strip()
+                    words = candidate.split()
+                    start, end = offset + match.start(), offset + match.end()
+                    if candidate in seen or overlaps(start, end):
+                        continue
+                    if len(words) == 1 and candidate in COMMON_CAPITALIZED:
+                        continue
+                    # A single capitalized word opening a sentence is usually not an entity
+                    if pattern is CAPITALIZED_RUN_PATTERN and len(words) == 1 and match.start() == leading:
+                        continue
+                    if words[0] in COMMON_CAPITALIZED and len(words) > 1:
+                        candidate = " ".join(words[1:])
+                    seen.add(candidate)
+                    unresolved.append({"text": candidate, "start": start, "end": end})
+
+        return {"known": known, "dates": dates, "unresolved": unresolved}
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Persist the gazetteer as JSON.
+
+        Args:
+            path: Target file (defaults to the path given at construction)
+        """
+        path = Path(path) if path else self.path
+        if not path:
+            raise ValueError("No path given for saving the entity gazetteer")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({category: sorted(names) for category, names in self.entities.items()}, f)
+
+    def load(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Load entities from JSON and add them to the automaton.
+
+        Args:
+            path: Source file (defaults to the path given at construction)
+        """
+        path = Path(path) if path else self.path
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for category, names in data.items():
+            for name in names:
+                self.add_entity(name, category)
@@ -0,0 +1,373 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Union
+
+from crew.utils.snapshot_scanner import SnapshotScanner, PathFilter
+
+# inotify(7) masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+WATCH_MODES = ("auto", "inotify", "polling")
+
+
+@dataclass
+class FileEvent:
+    """A change to a file below the watched directory."""
+
+    # created, modified, moved, deleted, or overflow (events were lost; rescan)
+    kind: str
+    path: Optional[Path]
+    dest_path: Optional[Path] = None
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+class PollingEventSource:
+    """Detects changes by re-scanning the directory tree every poll interval."""
+
+    def __init__(self, root: Union[str, Path], poll_interval: float = 5.0,
+                 include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        """
+        Initialize the polling source.
+
+        Args:
+            root: Directory to watch, recursively
+            poll_interval: Seconds between scans
+            include: File patterns to keep; None keeps every file
+            exclude: Directory and file patterns to skip (defaults to DEFAULT_EXCLUDES)
+        """
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        self.scanner = SnapshotScanner(root, include=include, exclude=exclude)
+        self._next_scan = 0.0
+
+    def start(self) -> None:
+        """Take the baseline snapshot; files already present produce no events."""
+        self.scanner.scan()
+        self._next_scan = time.monotonic() + self.poll_interval
+
+    def poll(self, timeout: float) -> List[FileEvent]:
+        """
+        Wait for the next scan (at most timeout seconds) and diff it.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            list: Events since the previous scan; empty if none was due
+        """
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        self._next_scan = time.monotonic() + self.poll_interval
+
+        diff = self.scanner.scan()
+        events = [FileEvent("created", path) for path in diff.added]
+        events.extend(FileEvent("modified", path) for path in diff.modified)
+        events.extend(FileEvent("deleted", path) for path in diff.removed)
+        return events
+
+    def close(self) -> None:
+        """Release the source."""
+        self._next_scan = 0.0
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_LIBC = _load_libc()
+
+
+def inotify_available() -> bool:
+    """Check whether the inotify event source can be used on this system."""
+    return _LIBC is not None
+
+
+class InotifyEventSource:
+    """
+    Receives change events from the kernel through inotify(7).
+
+    Every allowed directory below the root gets its own watch; directories
+    created or moved in later are added as they appear. Created files are
+    reported once their writer closes them (IN_CLOSE_WRITE after IN_CREATE),
+    later writes as modified, and renames within the tree as moved. Renames
+    into or out of it appear as created or deleted. Subdirectories that
+    cannot be watched (out of watches, no permission) are covered by an
+    overflow event every rescan_interval until a watch can be added.
+    """
+
+    def __init__(self, root: Union[str, Path], include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None, rescan_interval: float = 5.0):
+        """
+        Initialize the inotify source.
+
+        Args:
+            root: Directory to watch, recursively
+            include: File patterns to keep; None keeps every file
+            exclude: Directory and file patterns to skip (defaults to DEFAULT_EXCLUDES)
+            rescan_interval: Seconds between rescans while some directories are unwatched
+        """
+        if _LIBC is None:
+            raise OSError("inotify is not available on this platform")
+        self.root = Path(root)
+        self.filter = PathFilter(include, exclude)
+        self._fd: Optional[int] = None
+        self._watches: Dict[int, Path] = {}
+        self._created: set = set()
+        self.rescan_interval = rescan_interval
+        self._unwatched: set = set()
+        self._next_rescan = 0.0
+
+    def start(self) -> None:
+        """Open the inotify instance and watch the directory tree."""
+        fd = _LIBC.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._watch_tree(self.root)
+
+    def _relative(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = _LIBC.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {directory}: {os.strerror(errno)}")
+        self._watches[wd] = directory
+
+    def _watch_tree(self, top: Path) -> List[Path]:
+        """Watch a directory and its allowed subdirectories; return the files found in them."""
+        files = []
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            try:
+                self._add_watch(directory)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                # ENOSPC (watch limit reached) or EACCES; rescans cover the directory instead
+                if directory == self.root:
+                    raise
+                if directory not in self._unwatched:
+                    print(f"Cannot watch {directory} ({e}); rescanning every {self.rescan_interval}s instead")
+                self._unwatched.add(directory)
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        path = directory / entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.filter.dir_allowed(entry.name, self._relative(path)):
+                                stack.append(path)
+                        elif entry.is_file() and self.filter.file_allowed(entry.name, self._relative(path)):
+                            files.append(path)
+            except (FileNotFoundError, PermissionError):
+                continue
+        return files
+
+    def _unwatch_tree(self, top: Path) -> None:
+        for wd, directory in list(self._watches.items()):
+            if directory == top or top in directory.parents:
+                _LIBC.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+        self._unwatched = {d for d in self._unwatched if not (d == top or top in d.parents)}
+
+    def _rename_tree(self, source: Path, dest: Path) -> None:
+        for wd, directory in self._watches.items():
+            if directory == source or source in directory.parents:
+                self._watches[wd] = dest / directory.relative_to(source)
+        self._unwatched = {
+            dest / d.relative_to(source) if d == source or source in d.parents else d
+            for d in self._unwatched
+        }
+
+    def _rescan_unwatched(self, events: List[FileEvent]) -> None:
+        """Retry the failed watches and ask for a rescan, at most every rescan_interval."""
+        if not self._unwatched or time.monotonic() < self._next_rescan:
+            return
+        self._next_rescan = time.monotonic() + self.rescan_interval
+        for directory in list(self._unwatched):
+            try:
+                self._add_watch(directory)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            self._unwatched.discard(directory)
+        # Changes in directories that were unwatched until now are only found by a rescan
+        events.append(FileEvent("overflow", None))
+
+    def _read_raw(self) -> List[Tuple[int, int, int, str]]:
+        """Read all pending (wd, mask, cookie, name) records."""
+        records = []
+        while True:
+            try:
+                data = os.read(self._fd, READ_SIZE)
+            except BlockingIOError:
+                return records
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                records.append((wd, mask, cookie, name))
+
+    def poll(self, timeout: float) -> List[FileEvent]:
+        """
+        Wait up to timeout seconds for events.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            list: Events received, in kernel order
+        """
+        if self._fd is None:
+            raise RuntimeError("Event source has not been started")
+        if self._unwatched:
+            timeout = max(0.0, min(timeout, self._next_rescan - time.monotonic()))
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        events: List[FileEvent] = []
+        self._rescan_unwatched(events)
+        if not ready:
+            return events
+
+        moved_from: Dict[int, Tuple[Path, bool]] = {}
+        for wd, mask, cookie, name in self._read_raw():
+            if mask & IN_Q_OVERFLOW:
+                events.append(FileEvent("overflow", None))
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                continue
+
+            path = directory / name
+            relative = self._relative(path)
+            if mask & IN_ISDIR:
+                if not self.filter.dir_allowed(name, relative):
+                    continue
+                if mask & IN_MOVED_FROM:
+                    moved_from[cookie] = (path, True)
+                elif mask & IN_MOVED_TO and cookie in moved_from:
+                    source, _ = moved_from.pop(cookie)
+                    self._rename_tree(source, path)
+                    events.extend(
+                        FileEvent("moved", source / file.relative_to(path), dest_path=file)
+                        for file in self._list_tree(path)
+                    )
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may have landed before the new watches were in place
+                    events.extend(FileEvent("created", file) for file in self._watch_tree(path))
+                continue
+            if not self.filter.file_allowed(name, relative):
+                continue
+
+            if mask & IN_CREATE:
+                # Reported once the writer closes the file
+                self._created.add(path)
+            elif mask & IN_CLOSE_WRITE:
+                if path in self._created:
+                    self._created.discard(path)
+                    events.append(FileEvent("created", path))
+                else:
+                    events.append(FileEvent("modified", path))
+            elif mask & IN_MOVED_FROM:
+                moved_from[cookie] = (path, False)
+            elif mask & IN_MOVED_TO:
+                source, _ = moved_from.pop(cookie, (None, False))
+                if source is not None:
+                    events.append(FileEvent("moved", source, dest_path=path))
+                else:
+                    events.append(FileEvent("created", path))
+            elif mask & IN_DELETE:
+                self._created.discard(path)
+                events.append(FileEvent("deleted", path))
+
+        # The other half of these renames is outside the watched tree
+        for path, is_dir in moved_from.values():
+            if is_dir:
+                # The files that left are unknown here; ask for a rescan
+                self._unwatch_tree(path)
+                events.append(FileEvent("overflow", None))
+            else:
+                events.append(FileEvent("deleted", path))
+        return events
+
+    def _list_tree(self, top: Path) -> List[Path]:
+        """List the allowed files below an already watched directory."""
+        files = []
+        for directory, dirnames, filenames in os.walk(top):
+            directory = Path(directory)
+            dirnames[:] = [d for d in dirnames if self.filter.dir_allowed(d, self._relative(directory / d))]
+            files.extend(
+                directory / f for f in filenames if self.filter.file_allowed(f, self._relative(directory / f))
+            )
+        return files
+
+    def close(self) -> None:
+        """Close the inotify instance."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._watches.clear()
+        self._created.clear()
+
+
+def create_event_source(root: Union[str, Path], mode: str = "auto", poll_interval: float = 5.0,
+                        include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+    """
+    Create an event source for a directory tree.
+
+    Args:
+        root: Directory to watch, recursively
+        mode: "inotify", "polling", or "auto" (inotify where available)
+        poll_interval: Seconds between scans for the polling source, and between
+                       rescans of directories the inotify source cannot watch
+        include: File patterns to keep; None keeps every file
+        exclude: Directory and file patterns to skip (defaults to DEFAULT_EXCLUDES)
+
+    Returns:
+        The event source (not yet started)
+    """
+    if mode not in WATCH_MODES:
+        raise ValueError(f"Unknown watch mode: {mode}")
+    if mode == "inotify" or (mode == "auto" and inotify_available()):
+        return InotifyEventSource(root, include=include, exclude=exclude, rescan_interval=poll_interval)
+    return PollingEventSource(root, poll_interval=poll_interval, include=include, exclude=exclude)
@@ -0,0 +1,321 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple, Optional, Dict, List, Tuple, Union
+
+from crew.utils.content_hash import content_hash as file_hash
+
+# Removed files remembered for rename detection
+REMOVED_HISTORY_SIZE = 10000
+
+# Processing states recorded per file
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class FileRecord(NamedTuple):
+    """Journal entry of a file as it was last seen."""
+
+    inode: int
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str]
+    status: str
+
+
+class FileJournal:
+    """
+    Durable record of which files were processed, backed by SQLite (WAL).
+
+    All records are held in a dict, so "processed and unchanged" is a single
+    lookup plus a stat comparison. Contents are hashed only when a file's
+    inode, size or mtime differ from its record; a file that was touched or
+    rewritten with identical contents is not reported as changed.
+
+    Records are also indexed by content hash, and the hashes of recently
+    removed files are remembered, so a file under a new path can be matched
+    to a rename (find_renamed) or an existing copy (find_duplicate).
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open (or create) a journal.
+
+        Args:
+            path: Path to the SQLite database file; None keeps the journal in memory
+        """
+        self.path = str(path) if path else ":memory:"
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, inode INTEGER NOT NULL, size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, content_hash TEXT, status TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS files_content_hash ON files (content_hash)")
+        self._conn.commit()
+        self._records: Dict[str, FileRecord] = {
+            row[0]: FileRecord(*row[1:])
+            for row in self._conn.execute("SELECT path, inode, size, mtime_ns, content_hash, status FROM files")
+        }
+        self._by_hash: Dict[str, set] = {}
+        for key, record in self._records.items():
+            self._index(key, record)
+        self._removed: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"lookups": 0, "hashes": 0, "content_unchanged": 0}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _index(self, key: str, record: FileRecord) -> None:
+        if record.content_hash:
+            self._by_hash.setdefault(record.content_hash, set()).add(key)
+
+    def _unindex(self, key: str, record: Optional[FileRecord], remember: bool = False) -> None:
+        if record is None or not record.content_hash:
+            return
+        paths = self._by_hash.get(record.content_hash)
+        if paths is not None:
+            paths.discard(key)
+            if not paths:
+                del self._by_hash[record.content_hash]
+        if remember and record.status == DONE:
+            self._removed[record.content_hash] = key
+            self._removed.move_to_end(record.content_hash)
+            while len(self._removed) > REMOVED_HISTORY_SIZE:
+                self._removed.popitem(last=False)
+
+    def get(self, path: Union[str, Path]) -> Optional[FileRecord]:
+        """
+        Get the record of a file.
+
+        Args:
+            path: Path to the file
+
+        Returns:
+            FileRecord: The record, or None if the file is not journaled
+        """
+        return self._records.get(str(path))
+
+    def is_unchanged(self, path: Union[str, Path], stat: Optional[os.stat_result] = None) -> bool:
+        """
+        Check whether a file was processed and has not changed since.
+
+        The stat comparison is tried first; contents are hashed only when it
+        differs, and a matching hash refreshes the record's stat fields.
+
+        Args:
+            path: Path to the file
+            stat: The file's current stat result, if already known
+
+        Returns:
+            bool: True if the file needs no processing
+        """
+        key = str(path)
+        record = self._records.get(key)
+        self._count("lookups")
+        if record is None or record.status != DONE:
+            return False
+        stat = stat or os.stat(key)
+        if (record.inode, record.size, record.mtime_ns) == (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+            return True
+        if record.size != stat.st_size or record.content_hash is None:
+            return False
+
+        self._count("hashes")
+        if file_hash(key) != record.content_hash:
+            return False
+        self._count("content_unchanged")
+        self.mark(key, DONE, stat=stat, content_hash=record.content_hash)
+        return True
+
+    def mark(self, path: Union[str, Path], status: str, stat: Optional[os.stat_result] = None,
+             content_hash: Optional[str] = None) -> FileRecord:
+        """
+        Record a file's processing status and current state.
+
+        Args:
+            path: Path to the file
+            status: One of PENDING, DONE or FAILED
+            stat: The file's stat result at processing time (stat'ed if omitted)
+            content_hash: The file's content hash (computed if omitted)
+
+        Returns:
+            FileRecord: The stored record
+
+        Raises:
+            FileNotFoundError: If the file no longer exists
+        """
+        records = self.mark_many([(path, status, stat, content_hash)])
+        if not records:
+            raise FileNotFoundError(f"No such file: {path}")
+        return records[0]
+
+    def mark_many(self, entries: List[Tuple]) -> List[FileRecord]:
+        """
+        Record several files in one transaction.
+
+        Args:
+            entries: (path, status, stat, content_hash) tuples; stat and content_hash may be None
+
+        Returns:
+            list: The stored records; files that disappeared in the meantime are skipped
+        """
+        rows, records = [], []
+        for path, status, stat, content_hash in entries:
+            key = str(path)
+            try:
+                stat = stat or os.stat(key)
+                if content_hash is None:
+                    self._count("hashes")
+                    content_hash = file_hash(key)
+            except FileNotFoundError:
+                continue
+            record = FileRecord(stat.st_ino, stat.st_size, stat.st_mtime_ns, content_hash, status)
+            records.append(record)
+            rows.append((key, *record, time.time()))
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+            for row, record in zip(rows, records):
+                self._unindex(row[0], self._records.get(row[0]))
+                self._records[row[0]] = record
+                self._index(row[0], record)
+        return records
+
+    def remove(self, path: Union[str, Path], remember: bool = True) -> None:
+        """
+        Forget a file.
+
+        Args:
+            path: Path to the file
+            remember: Keep its hash for rename detection (False once it was matched)
+        """
+        key = str(path)
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (key,))
+            self._conn.commit()
+            self._unindex(key, self._records.pop(key, None), remember=remember)
+
+    def prune(self, existing: Dict[Path, os.stat_result]) -> int:
+        """
+        Forget files that are no longer present.
+
+        Args:
+            existing: The files currently present, keyed by path
+
+        Returns:
+            int: Number of records removed
+        """
+        present = {str(path) for path in existing}
+        stale = [key for key in self._records if key not in present]
+        with self._lock:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(key,) for key in stale])
+            self._conn.commit()
+            for key in stale:
+                self._unindex(key, self._records.pop(key), remember=True)
+        return len(stale)
+
+    def rename(self, old_path: Union[str, Path], new_path: Union[str, Path],
+               stat: Optional[os.stat_result] = None) -> Optional[FileRecord]:
+        """
+        Move a record to a new path without re-hashing the file.
+
+        Args:
+            old_path: Previous path of the file
+            new_path: Current path of the file
+            stat: The file's current stat result (stat'ed if omitted)
+
+        Returns:
+            FileRecord: The moved record, or None if old_path was not journaled
+        """
+        old_key, new_key = str(old_path), str(new_path)
+        with self._lock:
+            record = self._records.get(old_key)
+        if record is None:
+            return None
+        stat = stat or os.stat(new_key)
+        moved = record._replace(inode=stat.st_ino, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (old_key,))
+            self._conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               (new_key, *moved, time.time()))
+            self._conn.commit()
+            self._unindex(old_key, self._records.pop(old_key, None))
+            self._unindex(new_key, self._records.get(new_key))
+            self._records[new_key] = moved
+            self._index(new_key, moved)
+        return moved
+
+    def find_renamed(self, content_hash: str) -> Optional[str]:
+        """
+        Find a processed file with these contents that has since disappeared.
+
+        Both removed records and records whose file no longer exists (the
+        deletion was not seen yet) count; a match is consumed.
+
+        Args:
+            content_hash: Content hash of the file under its new path
+
+        Returns:
+            str: The previous path, or None
+        """
+        with self._lock:
+            old_key = self._removed.pop(content_hash, None)
+            if old_key is not None:
+                return old_key
+            candidates = [key for key in self._by_hash.get(content_hash, ())
+                          if self._records[key].status == DONE]
+        for key in candidates:
+            if not os.path.exists(key):
+                return key
+        return None
+
+    def find_duplicate(self, content_hash: str, exclude: Optional[Union[str, Path]] = None) -> Optional[str]:
+        """
+        Find another processed file with identical contents.
+
+        Args:
+            content_hash: Content hash to look for
+            exclude: Path of the file itself
+
+        Returns:
+            str: Path of a processed copy, or None
+        """
+        exclude = str(exclude) if exclude is not None else None
+        with self._lock:
+            for key in self._by_hash.get(content_hash, ()):
+                if key != exclude and self._records[key].status == DONE:
+                    return key
+        return None
+
+    def changed_files(self, files: Dict[Path, os.stat_result]) -> List[Path]:
+        """
+        Find the files of a listing that still need processing.
+
+        Args:
+            files: Current stat result per file path
+
+        Returns:
+            list: Paths that are new, changed or not yet processed successfully
+        """
+        return [path for path, stat in files.items() if not self.is_unchanged(path, stat)]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,214 @@
+import json
+import re
+from typing import Optional, List, Dict, Any
+
+
+def _item_key(item: Any) -> str:
+    """Build a hashable, case-insensitive key for de-duplicating list items."""
+    if isinstance(item, str):
+        return item.strip().lower()
+    return json.dumps(item, sort_keys=True, default=str)
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge several tool results (e.g. one per section) into a single result.
+
+    Lists are concatenated and de-duplicated in order of first appearance, booleans
+    are OR-ed, nested dicts are merged recursively and for scalar values the first
+    non-empty value wins. Per-result ``error`` entries are collected under ``errors``.
+
+    Args:
+        results: Tool result dictionaries in document order
+
+    Returns:
+        Dict: The merged result
+    """
+    merged: Dict[str, Any] = {}
+    seen: Dict[str, set] = {}
+    errors = []
+
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        for key, value in result.items():
+            if key == "error":
+                errors.append(value)
+                continue
+            if key == "errors" and isinstance(value, list):
+                errors.extend(value)
+                continue
+
+            if isinstance(value, list):
+                target = merged.setdefault(key, [])
+                keys = seen.setdefault(key, set())
+                for item in value:
+                    item_key = _item_key(item)
+                    if item_key not in keys:
+                        keys.add(item_key)
+                        target.append(item)
+            elif isinstance(value, bool):
+                merged[key] = merged.get(key, False) or value
+            elif isinstance(value, dict):
+                existing = merged.get(key)
+                merged[key] = merge_results([existing, value]) if isinstance(existing, dict) else value
+            elif key not in merged or merged[key] in ("", None):
+                merged[key] = value
+
+    if errors:
+        merged["errors"] = errors
+    return merged
+
+
+# Rough average for English text with llama-style tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in text without a tokenizer.
+
+    Args:
+        text: The text to measure
+
+    Returns:
+        int: Approximate token count
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens (estimated).
+
+    Chunks are packed from paragraphs; a paragraph that is too large on its own
+    is split on sentence boundaries and, failing that, on words.
+
+    Args:
+        text: The text to split
+        max_tokens: Token budget per chunk
+
+    Returns:
+        list: Text chunks in document order
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                pieces.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            if sentence:
+                pieces.append(sentence)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 2 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+CODE_FENCE_LINE = re.compile(r'^\s*```[\w-]*\s*$', re.MULTILINE)
+BARE_WORD = re.compile(r'[A-Za-z_][\w-]*')
+# Python/JavaScript literals LLMs emit instead of JSON ones
+BARE_LITERALS = {"True": "true", "False": "false", "None": "null", "undefined": "null"}
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def repair_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the first JSON object in an LLM response, fixing common syntax slips.
+
+    Handles markdown code fences, trailing commas, unquoted keys, single-quoted
+    strings, raw newlines in strings, Python literals (True/False/None) and
+    objects cut off before they were closed.
+
+    Args:
+        text: Raw LLM response text
+
+    Returns:
+        Dict: The parsed object, or None if it could not be repaired
+    """
+    text = CODE_FENCE_LINE.sub("", text)
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    out: List[str] = []
+    closers: List[str] = []
+    quote = None
+    i = start
+    while i < len(text):
+        char = text[i]
+        if quote:
+            if char == "\\":
+                out.append(text[i:i + 2])
+                i += 2
+                continue
+            if char == quote:
+                out.append('"')
+                quote = None
+            elif char == '"':
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+        elif char in "\"'":
+            quote = char
+            out.append('"')
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if closers:
+                out.append(closers.pop())
+            if not closers:
+                break
+        elif char.isalpha() or char == "_":
+            word = BARE_WORD.match(text, i).group()
+            if text[i + len(word):].lstrip().startswith(":"):
+                out.append(f'"{word}"')
+            else:
+                out.append(BARE_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    # Close whatever a truncated response left open
+    if quote:
+        out.append('"')
+    if closers:
+        _drop_trailing_comma(out)
+        if out and out[-1] == ":":
+            out.append("null")
+        out.extend(reversed(closers))
+
+    try:
+        data = json.loads("".join(out))
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
@@ -0,0 +1,311 @@
+import json
+import math
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union
+
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9_+#.\-]*[A-Za-z0-9+#]|[A-Za-z]")
+PHRASE_BREAK_PATTERN = re.compile(r"[.,;:!?()\[\]{}\"'`|/\\<>=*\n\r\t]+|\s-\s")
+CAMEL_CASE_PATTERN = re.compile(r"[a-z][A-Z]")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+let me more most my myself no nor not now of off on once only or other our ours ourselves out over
+own same she should so some such than that the their theirs them themselves then there these they
+this those through to too under until up very was we were what when where which while who whom why
+will with would you your yours yourself yourselves get got make made use used using one two also may
+might must need new like well way many much even still yet however therefore thus via per etc
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-cased candidate terms, dropping stopwords.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        list: Terms in document order
+    """
+    return [
+        word.lower() for word in WORD_PATTERN.findall(text)
+        if len(word) > 1 and word.lower() not in STOPWORDS
+    ]
+
+
+def is_technical_term(word: str) -> bool:
+    """
+    Heuristically decide whether a surface form looks like a technical term.
+
+    Acronyms, camelCase, snake_case, dotted names and words with digits
+    (``HTTP``, ``getUser``, ``max_workers``, ``numpy.ndarray``, ``llama3``).
+
+    Args:
+        word: The term as it appears in the text
+
+    Returns:
+        bool: True if the term looks technical
+    """
+    return (
+        (word.isupper() and len(word) >= 2)
+        or bool(CAMEL_CASE_PATTERN.search(word))
+        or "_" in word
+        or ("." in word.strip("."))
+        or any(char.isdigit() for char in word)
+    )
+
+
+def rake_phrases(text: str, max_words: int = 3) -> Dict[str, float]:
+    """
+    Score candidate phrases with RAKE (Rapid Automatic Keyword Extraction).
+
+    Phrases are runs of non-stopwords between punctuation and stopwords; each
+    word scores degree/frequency and a phrase scores the sum of its words.
+
+    Args:
+        text: The text to analyze
+        max_words: Longest phrase to keep
+
+    Returns:
+        Dict: Phrase to RAKE score
+    """
+    phrases = []
+    for fragment in PHRASE_BREAK_PATTERN.split(text):
+        current = []
+        for word in WORD_PATTERN.findall(fragment):
+            lower = word.lower()
+            if lower in STOPWORDS or len(lower) < 2:
+                if current:
+                    phrases.append(current)
+                current = []
+            else:
+                current.append(lower)
+        if current:
+            phrases.append(current)
+
+    phrases = [phrase for phrase in phrases if len(phrase) <= max_words]
+    frequency = Counter()
+    degree = Counter()
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+
+    scores = {}
+    for phrase in phrases:
+        key = " ".join(phrase)
+        scores[key] = sum(degree[word] / frequency[word] for word in phrase)
+    return scores
+
+
+class DocumentFrequencyTable:
+    """Incrementally maintained document-frequency table for TF-IDF over a corpus."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the table, loading it from disk if the file exists.
+
+        Args:
+            path: Optional JSON file used by load/save
+        """
+        self.path = Path(path) if path else None
+        self.document_frequency: Counter = Counter()
+        self.documents: Dict[str, List[str]] = {}
+        self.anonymous_documents = 0
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            self.load()
+
+    @property
+    def document_count(self) -> int:
+        """Number of documents in the corpus."""
+        return len(self.documents) + self.anonymous_documents
+
+    def add_document(self, text: str, document_id: Optional[str] = None) -> None:
+        """
+        Add a document's terms to the table.
+
+        Re-adding a known document_id replaces its previous terms, so edited
+        documents are not double counted.
+
+        Args:
+            text: The document text
+            document_id: Optional stable identifier such as the file path
+        """
+        terms = sorted(set(tokenize(text)))
+        with self._lock:
+            if document_id is None:
+                self.anonymous_documents += 1
+            else:
+                previous = self.documents.get(document_id)
+                if previous:
+                    self.document_frequency.subtract(previous)
+                self.documents[document_id] = terms
+            self.document_frequency.update(terms)
+
+    def remove_document(self, document_id: str) -> None:
+        """
+        Remove a document's terms from the table.
+
+        Args:
+            document_id: The identifier the document was added with
+        """
+        with self._lock:
+            terms = self.documents.pop(document_id, None)
+            if terms:
+                self.document_frequency.subtract(terms)
+
+    def add_directory(self, directory: Union[str, Path], pattern: str = "**/*.md") -> int:
+        """
+        Add every matching file below a directory.
+
+        Args:
+            directory: The corpus root
+            pattern: Glob pattern of files to include
+
+        Returns:
+            int: Number of documents added
+        """
+        added = 0
+        for file_path in Path(directory).glob(pattern):
+            try:
+                text = file_path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+            self.add_document(text, document_id=str(file_path))
+            added += 1
+        return added
+
+    def idf(self, term: str) -> float:
+        """
+        Smoothed inverse document frequency of a term.
+
+        Args:
+            term: A lower-cased term
+
+        Returns:
+            float: The IDF weight
+        """
+        return math.log((1 + self.document_count) / (1 + self.document_frequency.get(term, 0))) + 1
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Persist the table as JSON.
+
+        Args:
+            path: Target file (defaults to the path given at construction)
+        """
+        path = Path(path) if path else self.path
+        if not path:
+            raise ValueError("No path given for saving the document-frequency table")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "anonymous_documents": self.anonymous_documents,
+                "documents": self.documents,
+                "document_frequency": {k: v for k, v in self.document_frequency.items() if v > 0}
+            }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def load(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Load the table from JSON.
+
+        Args:
+            path: Source file (defaults to the path given at construction)
+        """
+        path = Path(path) if path else self.path
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        with self._lock:
+            self.anonymous_documents = data.get("anonymous_documents", 0)
+            self.documents = data.get("documents", {})
+            self.document_frequency = Counter(data.get("document_frequency", {}))
+
+
+def extract_keywords_local(
+    text: str,
+    table: Optional[DocumentFrequencyTable] = None,
+    primary_count: int = 6,
+    secondary_count: int = 10,
+    min_corpus_documents: int = 20
+) -> Dict[str, Any]:
+    """
+    Extract keywords locally with TF-IDF weighted RAKE phrase scoring.
+
+    Args:
+        text: The document text
+        table: Corpus document-frequency table (without one IDF is uniform)
+        primary_count: Number of primary keywords to return
+        secondary_count: Number of secondary keywords to return
+        min_corpus_documents: Corpus size at which IDF is considered reliable
+
+    Returns:
+        Dict: primary_keywords, secondary_keywords, technical_terms, plus
+              the ranked ``candidates`` and a 0-1 ``confidence`` estimate
+    """
+    terms = tokenize(text)
+    if not terms:
+        return {
+            "primary_keywords": [],
+            "secondary_keywords": [],
+            "technical_terms": [],
+            "candidates": [],
+            "confidence": 0.0
+        }
+
+    term_counts = Counter(terms)
+    total = len(terms)
+    idf = table.idf if table is not None else (lambda term: 1.0)
+    tfidf = {term: (count / total) * idf(term) for term, count in term_counts.items()}
+
+    # Phrase score = RAKE score weighted by the mean TF-IDF of its words
+    scores = {}
+    for phrase, rake_score in rake_phrases(text).items():
+        words = phrase.split()
+        weight = sum(tfidf.get(word, 0.0) for word in words) / len(words)
+        scores[phrase] = rake_score * weight
+    for term, weight in tfidf.items():
+        scores[term] = max(scores.get(term, 0.0), weight)
+
+    ranked = sorted(scores, key=lambda phrase: (-scores[phrase], phrase))
+
+    # Prefer phrases over their own constituent words in the primary list
+    selected = []
+    covered = set()
+    for phrase in ranked:
+        if phrase in covered:
+            continue
+        selected.append(phrase)
+        covered.update(phrase.split())
+        if len(selected) >= primary_count + secondary_count:
+            break
+
+    surface_forms = {}
+    for word in WORD_PATTERN.findall(text):
+        surface_forms.setdefault(word.lower(), word)
+    technical_terms = []
+    for term in sorted(term_counts, key=lambda t: -tfidf[t]):
+        surface = surface_forms.get(term, term)
+        if is_technical_term(surface) and surface not in technical_terms:
+            technical_terms.append(surface)
+
+    # Confidence grows with document length and with corpus size (reliable IDF)
+    corpus_factor = 0.5
+    if table is not None:
+        corpus_factor = 0.5 + 0.5 * min(1.0, table.document_count / min_corpus_documents)
+    length_factor = min(1.0, len(term_counts) / 40)
+
+    return {
+        "primary_keywords": selected[:primary_count],
+        "secondary_keywords": selected[primary_count:primary_count + secondary_count],
+        "technical_terms": technical_terms[:10],
+        "candidates": ranked[:(primary_count + secondary_count) * 2],
+        "confidence": round(corpus_factor * length_factor, 3)
+    }
@@ -0,0 +1,156 @@
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+# Precompiled patterns for markdown structure
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+SETEXT_PATTERN = re.compile(r'^(=+|-+)\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+FRONTMATTER_PATTERN = re.compile(r'\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)', re.DOTALL)
+WORD_PATTERN = re.compile(r'\S+')
+
+
+def count_words(text: str) -> int:
+    """
+    Count whitespace-separated words in text.
+
+    Args:
+        text: The text to count
+
+    Returns:
+        int: Number of words
+    """
+    return len(WORD_PATTERN.findall(text))
+
+
+def strip_frontmatter(content: str) -> Tuple[str, str]:
+    """
+    Separate a leading frontmatter block from the document body.
+
+    Args:
+        content: The document content
+
+    Returns:
+        tuple: (frontmatter text without the --- markers, remaining body)
+    """
+    match = FRONTMATTER_PATTERN.match(content)
+    if not match:
+        return "", content
+    return match.group(1), content[match.end():]
+
+
+def _new_section(title: str, level: int, start_line: int) -> Dict[str, Any]:
+    return {
+        "section_title": title,
+        "section_level": level,
+        "start_line": start_line,
+        "lines": []
+    }
+
+
+def _finish_section(section: Dict[str, Any]) -> Dict[str, Any]:
+    lines = section.pop("lines")
+    section["content"] = "\n".join(lines).strip("\n")
+    section["word_count"] = count_words(section["content"])
+    section["end_line"] = section["start_line"] + len(lines)
+    return section
+
+
+def _split_large_section(section: Dict[str, Any], max_words: int) -> List[Dict[str, Any]]:
+    """Split an oversized section on paragraph boundaries."""
+    paragraphs = re.split(r'\n\s*\n', section["content"])
+    parts = []
+    current = []
+    current_words = 0
+
+    for paragraph in paragraphs:
+        words = count_words(paragraph)
+        if current and current_words + words > max_words:
+            parts.append("\n\n".join(current))
+            current, current_words = [], 0
+        current.append(paragraph)
+        current_words += words
+    if current:
+        parts.append("\n\n".join(current))
+
+    if len(parts) <= 1:
+        return [section]
+
+    result = []
+    for i, part in enumerate(parts, 1):
+        title = section["section_title"]
+        result.append({
+            "section_title": f"{title} (part {i})" if title else f"Part {i}",
+            "section_level": section["section_level"],
+            "start_line": section["start_line"],
+            "end_line": section["end_line"],
+            "content": part,
+            "word_count": count_words(part)
+        })
+    return result
+
+
+def split_sections(content: str, max_words: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Split markdown or plain text into sections by heading.
+
+    ATX (``# Title``) and setext (``Title`` underlined with ``===``/``---``)
+    headings are recognised; headings inside fenced code blocks are ignored.
+    Text before the first heading becomes a level 0 section with an empty title,
+    so plain text without headings comes back as a single section.
+
+    Args:
+        content: The document content
+        max_words: Optional cap; larger sections are split on paragraph boundaries
+
+    Returns:
+        list: Section dicts with section_title, section_level, content,
+              word_count, start_line and end_line (0-based, end exclusive)
+    """
+    _, body = strip_frontmatter(content)
+    offset = content.count("\n", 0, len(content) - len(body))
+    lines = body.split("\n")
+
+    sections = []
+    current = _new_section("", 0, offset)
+    in_fence = False
+
+    for i, line in enumerate(lines):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+            current["lines"].append(line)
+            continue
+
+        if not in_fence:
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                sections.append(_finish_section(current))
+                current = _new_section(heading.group(2), len(heading.group(1)), offset + i)
+                continue
+
+            # Setext heading: a non-blank paragraph line underlined with = or -
+            if (SETEXT_PATTERN.match(line) and current["lines"]
+                    and current["lines"][-1].strip()
+                    and (len(current["lines"]) == 1 or not current["lines"][-2].strip())):
+                title = current["lines"].pop()
+                sections.append(_finish_section(current))
+                level = 1 if line.lstrip().startswith("=") else 2
+                current = _new_section(title.strip(), level, offset + i - 1)
+                continue
+
+        current["lines"].append(line)
+
+    sections.append(_finish_section(current))
+
+    # Drop an empty preamble but keep empty headed sections (they are structure)
+    sections = [s for s in sections if s["section_level"] > 0 or s["content"]]
+
+    if max_words:
+        split = []
+        for section in sections:
+            if section["word_count"] > max_words:
+                split.extend(_split_large_section(section, max_words))
+            else:
+                split.append(section)
+        sections = split
+
+    return sections
@@ -0,0 +1,287 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from crew.utils.classification_rules import ClassificationRules, default_rules
+from crew.utils.note_scanner import scan_note
+from crew.utils.snapshot_scanner import iter_files
+
+# Chunks in flight per worker; bounds memory while keeping workers busy
+CHUNKS_PER_WORKER = 2
+
+
+def classify_note(file_path: Union[str, Path], rules: Optional[ClassificationRules] = None) -> Dict[str, Any]:
+    """
+    Classify a note by its hashtags, falling back to its extension.
+
+    Args:
+        file_path: Path to the note
+        rules: Classification rules (defaults to DEFAULT_CLASSIFICATION_RULES)
+
+    Returns:
+        dict: file_path, filename, content_type, hashtags, metadata and storage decisions
+    """
+    file_path = Path(file_path)
+    scan = scan_note(file_path)
+    decision = (rules or default_rules()).classify(scan.hashtags, file_path)
+    return {
+        "file_path": str(file_path),
+        "filename": file_path.name,
+        "content_type": decision["content_type"],
+        "hashtags": scan.hashtags,
+        "metadata": scan.metadata,
+        "storage": decision["storage"]
+    }
+
+
+def classify_record(file_path: Union[str, Path], rules: Optional[ClassificationRules] = None) -> Dict[str, Any]:
+    """
+    Classify a note into a compact record; errors are reported in the record.
+
+    Args:
+        file_path: Path to the note
+        rules: Classification rules (defaults to DEFAULT_CLASSIFICATION_RULES)
+
+    Returns:
+        dict: path, content_type, hashtags, metadata and storage, plus error on failure
+    """
+    rules = rules or default_rules()
+    try:
+        classification = classify_note(file_path, rules)
+    except Exception as e:
+        return {"path": str(file_path), "content_type": "unknown", "hashtags": [], "metadata": {},
+                "storage": rules.storage("unknown", []), "error": str(e)}
+    return {
+        "path": classification["file_path"],
+        "content_type": classification["content_type"],
+        "hashtags": classification["hashtags"],
+        "metadata": classification["metadata"],
+        "storage": classification["storage"]
+    }
+
+
+# Rules of this worker process, set by the pool initializer
+_worker_rules: Optional[ClassificationRules] = None
+
+
+def _init_worker(rules: Optional[ClassificationRules]) -> None:
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _classify_chunk(paths: List[str], rules: Optional[ClassificationRules] = None) -> List[Dict[str, Any]]:
+    rules = rules or _worker_rules
+    return [classify_record(path, rules) for path in paths]
+
+
+def _chunks(paths: Iterable, size: int) -> Iterator[List[str]]:
+    iterator = iter(paths)
+    while True:
+        chunk = [str(path) for path in islice(iterator, size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def _classify_stream(paths: Iterable, workers: int, chunk_size: int, ordered: bool,
+                     rules: Optional[ClassificationRules]) -> Iterator[Dict[str, Any]]:
+    if workers <= 1:
+        for chunk in _chunks(paths, chunk_size):
+            yield from _classify_chunk(chunk, rules)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules,)) as pool:
+        pending = deque()
+        for chunk in _chunks(paths, chunk_size):
+            pending.append(pool.submit(_classify_chunk, chunk))
+            if len(pending) < workers * CHUNKS_PER_WORKER:
+                continue
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class RecordWriter:
+    """Writes classification records to a JSONL or Parquet file as they arrive."""
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 10000):
+        """
+        Open a record file; the format follows the extension (.parquet or JSONL).
+
+        Args:
+            path: Output file path
+            batch_size: Records per Parquet row group
+        """
+        self.path = Path(path)
+        self.format = "parquet" if self.path.suffix.lower() in (".parquet", ".pq") else "jsonl"
+        self.batch_size = batch_size
+        self.count = 0
+        self._batch: List[Dict[str, Any]] = []
+        self._writer = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Parquet output requires pyarrow; install it or write .jsonl instead")
+            self._file = None
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Append a record.
+
+        Args:
+            record: A record from classify_record
+        """
+        self.count += 1
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = [{
+            "path": record["path"],
+            "content_type": record["content_type"],
+            "hashtags": record["hashtags"],
+            # Frontmatter keys vary per note, so metadata is kept as a JSON string
+            "metadata": json.dumps(record["metadata"], ensure_ascii=False),
+            # Stores are configurable, so they are kept as a JSON string as well
+            "storage": json.dumps(record["storage"]),
+            "error": record.get("error")
+        } for record in self._batch]
+        self._batch = []
+        schema = pa.schema([
+            ("path", pa.string()), ("content_type", pa.string()), ("hashtags", pa.list_(pa.string())),
+            ("metadata", pa.string()), ("storage", pa.string()), ("error", pa.string())
+        ])
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(str(self.path), schema)
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            return
+        if self._batch or (self._writer is None and self.format == "parquet"):
+            self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def read_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Read records written by RecordWriter back, e.g. to reclassify them.
+
+    Args:
+        path: A .jsonl or .parquet record file
+
+    Returns:
+        Iterator: The records, in file order
+    """
+    path = Path(path)
+    if path.suffix.lower() not in (".parquet", ".pq"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet records requires pyarrow")
+    for batch in pq.ParquetFile(str(path)).iter_batches():
+        for row in batch.to_pylist():
+            record = {
+                "path": row["path"],
+                "content_type": row["content_type"],
+                "hashtags": row["hashtags"] or [],
+                "metadata": json.loads(row["metadata"]),
+                "storage": json.loads(row["storage"])
+            }
+            if row["error"] is not None:
+                record["error"] = row["error"]
+            yield record
+
+
+def classify_many(
+    paths: Iterable[Union[str, Path]],
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    ordered: bool = False,
+    output: Optional[Union[str, Path]] = None,
+    rules: Optional[ClassificationRules] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Classify many notes across a process pool.
+
+    Paths are consumed lazily and submitted in chunks, with a bounded number of
+    chunks in flight, so memory stays flat for any number of files.
+
+    Args:
+        paths: Paths to classify (any iterable, e.g. a generator)
+        workers: Number of worker processes (defaults to the CPU count; 1 runs inline)
+        chunk_size: Paths per submitted chunk
+        ordered: Yield records in input order instead of as chunks complete
+        output: Optional .jsonl or .parquet file the records are written to as they are yielded
+        rules: Classification rules (defaults to DEFAULT_CLASSIFICATION_RULES)
+
+    Returns:
+        Iterator: Records from classify_record
+    """
+    workers = workers or os.cpu_count() or 1
+    records = _classify_stream(paths, workers, chunk_size, ordered, rules)
+    if output is None:
+        yield from records
+        return
+    with RecordWriter(output) as writer:
+        for record in records:
+            writer.write(record)
+            yield record
+
+
+def classify_directory(
+    root: Union[str, Path],
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Classify every note below a directory.
+
+    Args:
+        root: Directory to classify, recursively
+        include: File patterns to classify, e.g. ["*.md"]; None classifies every file
+        exclude: Directory and file patterns to skip (defaults to DEFAULT_EXCLUDES)
+        **kwargs: Options for classify_many (workers, chunk_size, ordered, output, rules)
+
+    Returns:
+        Iterator: Records from classify_record
+    """
+    return classify_many(iter_files(root, include=include, exclude=exclude), **kwargs)
@@ -0,0 +1,218 @@
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+# Frontmatter blocks larger than this are not parsed (the note is then
+# treated as having none, so its hashtags are scanned from the start)
+FRONTMATTER_MAX_BYTES = 64 * 1024
+# Bytes read per step when scanning the body for hashtags
+CHUNK_SIZE = 1024 * 1024
+# A tag cut by a chunk boundary is carried into the next chunk up to this length
+MAX_TAG_BYTES = 1024
+
+# Bytes patterns cannot match Unicode word characters, so non-ASCII bytes are
+# taken along and the decoded candidate is trimmed with TAG_WORD_PATTERN
+HASHTAG_BYTES_PATTERN = re.compile(rb'#((?:\w|[\x80-\xff])+)')
+TAG_WORD_PATTERN = re.compile(r'\w+')
+# A possibly incomplete hashtag at the end of a chunk, split UTF-8 sequences included
+TRAILING_TAG_PATTERN = re.compile(rb'#(?:\w|[\x80-\xff])*\Z')
+
+# A "key: value" line whose key and value YAML reads as plain strings, unless
+# the resolver says otherwise (numbers, booleans, null)
+SIMPLE_LINE_PATTERN = re.compile(
+    r'([A-Za-z_][\w.-]*):[ \t]+([^-?:,\[\]{}#&*!|>\'"%@`\s](?:(?!: | #)[^\t\r\n])*?)[ \t]*\Z'
+)
+
+_STR_TAG = 'tag:yaml.org,2002:str'
+_TIMESTAMP_TAG = 'tag:yaml.org,2002:timestamp'
+
+
+class _FrontmatterLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+    """Safe YAML loader that keeps dates as strings, so metadata stays JSON-serializable."""
+
+
+_FrontmatterLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag != _TIMESTAMP_TAG]
+    for first, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+}
+_resolver = yaml.resolver.Resolver()
+_resolver.yaml_implicit_resolvers = _FrontmatterLoader.yaml_implicit_resolvers
+
+
+class NoteScan(NamedTuple):
+    """Frontmatter and hashtags of a note, read in one pass."""
+
+    metadata: Dict[str, Any]
+    hashtags: List[str]
+    size: int
+
+
+def _parse_key_values(text: str) -> Dict[str, str]:
+    metadata = {}
+    for line in text.split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            metadata[key.strip()] = value.strip()
+    return metadata
+
+
+@lru_cache(maxsize=4096)
+def _is_plain_str(value: str) -> bool:
+    return _resolver.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG
+
+
+def _parse_simple(text: str) -> Optional[Dict[str, str]]:
+    """Parse flat "key: string" blocks without the YAML loader; None for anything else."""
+    metadata = {}
+    for line in text.split('\n'):
+        line = line.rstrip('\r')
+        if not line.strip():
+            continue
+        match = SIMPLE_LINE_PATTERN.match(line)
+        if not match or not _is_plain_str(match.group(1)) or not _is_plain_str(match.group(2)):
+            return None
+        metadata[match.group(1)] = match.group(2)
+    return metadata
+
+
+def parse_frontmatter(text: str) -> Dict[str, Any]:
+    """
+    Parse a frontmatter block as YAML.
+
+    Flat blocks of plain "key: string" lines, the common case, skip the YAML
+    loader with the same result. Blocks that are not valid YAML fall back to
+    splitting "key: value" lines, as Obsidian accepts some of those.
+
+    Args:
+        text: Frontmatter text without the --- markers
+
+    Returns:
+        Dict: Metadata by key; dates and times are kept as strings
+    """
+    simple = _parse_simple(text)
+    if simple is not None:
+        return simple
+    try:
+        data = yaml.load(text, Loader=_FrontmatterLoader)
+    except yaml.YAMLError:
+        return _parse_key_values(text)
+    if not isinstance(data, dict):
+        return {}
+    return {str(key): value for key, value in data.items()}
+
+
+def _is_marker(line: bytes) -> bool:
+    return line.rstrip(b'\r\n').rstrip(b' \t') == b'---'
+
+
+def read_frontmatter(f: BinaryIO, max_bytes: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Read the frontmatter block at the start of a file, and nothing more.
+
+    Args:
+        f: File opened in binary mode, positioned at the start
+        max_bytes: Largest frontmatter block that is parsed (defaults to FRONTMATTER_MAX_BYTES)
+
+    Returns:
+        Tuple: The metadata and the offset where the body starts (0 without frontmatter)
+    """
+    max_bytes = max_bytes or FRONTMATTER_MAX_BYTES
+    first = f.readline(max_bytes)
+    if not _is_marker(first) or not first.endswith(b'\n'):
+        return {}, 0
+    lines = []
+    consumed = len(first)
+    while consumed < max_bytes:
+        line = f.readline(max_bytes - consumed)
+        if not line:
+            break
+        consumed += len(line)
+        if _is_marker(line):
+            text = b''.join(lines).decode('utf-8', errors='replace')
+            return parse_frontmatter(text), consumed
+        if not line.endswith(b'\n'):
+            break
+        lines.append(line)
+    # Unterminated or larger than the cap
+    return {}, 0
+
+
+def _add_tags(tags: set, data) -> None:
+    # Repeated tags are decoded once
+    for raw in set(HASHTAG_BYTES_PATTERN.findall(data)):
+        word = TAG_WORD_PATTERN.match(raw.decode('utf-8', errors='replace'))
+        if word:
+            tags.add(word.group(0).lower())
+
+
+def find_hashtags(data) -> List[str]:
+    """
+    Find the hashtags in UTF-8 encoded content.
+
+    Args:
+        data: Bytes-like content
+
+    Returns:
+        list: Lowercased, deduplicated hashtags in sorted order
+    """
+    tags = set()
+    _add_tags(tags, data)
+    return sorted(tags)
+
+
+def stream_hashtags(f: BinaryIO, chunk_size: Optional[int] = None) -> List[str]:
+    """
+    Find the hashtags from a file's current position on, one chunk at a time.
+
+    A hashtag at the end of a chunk may continue in the next one, so it is
+    carried over and matched with the next chunk; this also keeps multi-byte
+    UTF-8 characters split by the boundary together.
+
+    Args:
+        f: File opened in binary mode
+        chunk_size: Bytes read per step (defaults to CHUNK_SIZE)
+
+    Returns:
+        list: Lowercased, deduplicated hashtags in sorted order
+    """
+    chunk_size = chunk_size or CHUNK_SIZE
+    tags = set()
+    carry = b''
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        data = carry + chunk if carry else chunk
+        tail = TRAILING_TAG_PATTERN.search(data, max(0, len(data) - MAX_TAG_BYTES))
+        cut = tail.start() if tail else len(data)
+        _add_tags(tags, memoryview(data)[:cut])
+        carry = data[cut:]
+    if carry:
+        _add_tags(tags, carry)
+    return sorted(tags)
+
+
+def scan_note(file_path: Union[str, Path]) -> NoteScan:
+    """
+    Extract frontmatter and hashtags from a note with a single streaming read.
+
+    Only the frontmatter block is read line by line (up to
+    FRONTMATTER_MAX_BYTES) and parsed as YAML; the body after it is scanned
+    for hashtags in CHUNK_SIZE chunks, directly on the bytes. Memory use is
+    bounded by the chunk size however large the note is.
+
+    Args:
+        file_path: Path to the note
+
+    Returns:
+        NoteScan: The frontmatter metadata, hashtags and file size
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        metadata, body_start = read_frontmatter(f)
+        f.seek(body_start)
+        return NoteScan(metadata, stream_hashtags(f), size)
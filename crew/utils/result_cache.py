@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union
+
+
+class ResultCache:
+    """Persistent key-value store for JSON-serialisable tool results, backed by SQLite."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Open (or create) a result cache.
+
+        Args:
+            path: Path to the SQLite database file; None keeps the cache in memory
+        """
+        self.path = str(path) if path else ":memory:"
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if not present
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several cached values in one query.
+
+        Args:
+            keys: The cache keys
+
+        Returns:
+            Dict: Values for the keys that are present
+        """
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            batch = unique[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({placeholders})", batch
+                ).fetchall()
+            found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: The cache key
+            value: A JSON-serialisable value
+        """
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        """
+        Store several values in one transaction.
+
+        Args:
+            items: Mapping of cache key to JSON-serialisable value
+        """
+        now = time.time()
+        rows = [(key, json.dumps(value), now) for key, value in items.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (key, value, updated_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """
+        Remove a value if present.
+
+        Args:
+            key: The cache key
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,241 @@
+import fnmatch
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Iterator, List, Union
+
+# Directories and files the watcher never processes
+DEFAULT_EXCLUDES = [".obsidian/", ".git/", ".trash/", ".crew/", ".DS_Store", "*.swp", "*.tmp"]
+
+# A directory modified this close to its listing may have changed again
+# within the same timestamp tick, so it is re-listed on the next scan
+RACY_WINDOW_NS = 1_000_000_000
+
+
+class PathFilter:
+    """
+    Include/exclude patterns for paths relative to a root.
+
+    Patterns ending in "/" match directories, others match files. Patterns
+    containing "/" match the relative path, others match the name at any depth.
+    """
+
+    def __init__(self, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        """
+        Initialize the filter.
+
+        Args:
+            include: File patterns to keep; None keeps every file
+            exclude: Directory and file patterns to skip (defaults to DEFAULT_EXCLUDES)
+        """
+        exclude = DEFAULT_EXCLUDES if exclude is None else exclude
+        self._dirs = self._compile([p.rstrip("/") for p in exclude if p.endswith("/")])
+        self._files = self._compile([p for p in exclude if not p.endswith("/")])
+        self._include = self._compile(include) if include else None
+
+    @staticmethod
+    def _compile(patterns: List[str]):
+        names = [fnmatch.translate(p) for p in patterns if "/" not in p]
+        paths = [fnmatch.translate(p.lstrip("/")) for p in patterns if "/" in p]
+        name_match = re.compile("|".join(names)).match if names else None
+        path_match = re.compile("|".join(paths)).match if paths else None
+        return name_match, path_match
+
+    @staticmethod
+    def _matches(compiled, name: str, relative: str) -> bool:
+        name_match, path_match = compiled
+        return bool((name_match and name_match(name)) or (path_match and path_match(relative)))
+
+    def dir_allowed(self, name: str, relative: str) -> bool:
+        """Check whether a directory should be descended into."""
+        return not self._matches(self._dirs, name, relative)
+
+    def file_allowed(self, name: str, relative: str) -> bool:
+        """Check whether a file should be reported."""
+        if self._matches(self._files, name, relative):
+            return False
+        return self._include is None or self._matches(self._include, name, relative)
+
+
+def iter_files(root: Union[str, Path], include: Optional[List[str]] = None,
+               exclude: Optional[List[str]] = None) -> Iterator[Path]:
+    """
+    Yield the files below a directory lazily, without keeping a snapshot.
+
+    Args:
+        root: Directory to walk
+        include: File patterns to keep; None keeps every file
+        exclude: Directory and file patterns to skip (defaults to DEFAULT_EXCLUDES)
+
+    Returns:
+        Iterator: Paths of the matching files
+    """
+    path_filter = PathFilter(include, exclude)
+    root = str(root)
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relative = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if path_filter.dir_allowed(entry.name, relative):
+                                stack.append(entry.path)
+                        elif entry.is_file() and path_filter.file_allowed(entry.name, relative):
+                            yield Path(entry.path)
+                    except FileNotFoundError:
+                        continue
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+
+@dataclass
+class SnapshotDiff:
+    """Files added, modified and removed between two snapshots."""
+
+    added: List[Path] = field(default_factory=list)
+    modified: List[Path] = field(default_factory=list)
+    removed: List[Path] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.modified) + len(self.removed)
+
+
+@dataclass
+class _DirState:
+    mtime_ns: int
+    listed_ns: int
+    files: Dict[str, os.stat_result]
+    subdirs: List[str]
+
+
+class SnapshotScanner:
+    """
+    Recursive directory snapshots built on os.scandir.
+
+    Each scan diffs the tree against the previous snapshot. A directory whose
+    mtime is unchanged has the same entries, so it is not listed again; its
+    known files are only stat'ed (if check_files is set) to catch in-place
+    modifications, which do not change the directory's mtime.
+    """
+
+    def __init__(self, root: Union[str, Path], include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None, check_files: bool = True):
+        """
+        Initialize the scanner.
+
+        Args:
+            root: Directory to snapshot
+            include: File patterns to keep; None keeps every file
+            exclude: Directory and file patterns to skip (defaults to DEFAULT_EXCLUDES)
+            check_files: Stat files in unchanged directories to detect modifications;
+                         disable when modifications are reported by another source
+        """
+        self.root = Path(root)
+        self.filter = PathFilter(include, exclude)
+        self.check_files = check_files
+        self._dirs: Dict[str, _DirState] = {}
+        self.stats = {"scans": 0, "dirs_listed": 0, "dirs_skipped": 0, "files_stated": 0}
+
+    @property
+    def files(self) -> Dict[Path, os.stat_result]:
+        """Stat result per file of the latest snapshot."""
+        return {
+            Path(directory, name): stat
+            for directory, state in self._dirs.items()
+            for name, stat in state.files.items()
+        }
+
+    def _relative(self, directory: str, name: str) -> str:
+        relative = os.path.relpath(os.path.join(directory, name), self.root)
+        return relative.replace(os.sep, "/")
+
+    def _forget(self, directory: str, diff: SnapshotDiff) -> None:
+        """Drop a directory that disappeared, reporting its files as removed."""
+        state = self._dirs.pop(directory, None)
+        if state is None:
+            return
+        diff.removed.extend(Path(directory, name) for name in state.files)
+        for subdir in state.subdirs:
+            self._forget(os.path.join(directory, subdir), diff)
+
+    def _list(self, directory: str, dir_stat: os.stat_result, previous: Optional[_DirState],
+              diff: SnapshotDiff) -> _DirState:
+        """List a directory and diff its files against its previous state."""
+        listed_ns = time.time_ns()
+        files: Dict[str, os.stat_result] = {}
+        subdirs: List[str] = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.filter.dir_allowed(entry.name, self._relative(directory, entry.name)):
+                            subdirs.append(entry.name)
+                    elif entry.is_file() and self.filter.file_allowed(entry.name,
+                                                                        self._relative(directory, entry.name)):
+                        files[entry.name] = entry.stat()
+                except FileNotFoundError:
+                    continue
+        self.stats["dirs_listed"] += 1
+        self.stats["files_stated"] += len(files)
+
+        old_files = previous.files if previous else {}
+        for name, stat in files.items():
+            old = old_files.get(name)
+            if old is None:
+                diff.added.append(Path(directory, name))
+            elif (old.st_ino, old.st_size, old.st_mtime_ns) != (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+                diff.modified.append(Path(directory, name))
+        diff.removed.extend(Path(directory, name) for name in old_files.keys() - files.keys())
+        if previous:
+            for subdir in set(previous.subdirs) - set(subdirs):
+                self._forget(os.path.join(directory, subdir), diff)
+        return _DirState(dir_stat.st_mtime_ns, listed_ns, files, subdirs)
+
+    def _recheck(self, directory: str, state: _DirState, diff: SnapshotDiff) -> None:
+        """Stat the known files of an unchanged directory."""
+        for name, old in list(state.files.items()):
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except FileNotFoundError:
+                del state.files[name]
+                diff.removed.append(Path(directory, name))
+                continue
+            if (old.st_ino, old.st_size, old.st_mtime_ns) != (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+                state.files[name] = stat
+                diff.modified.append(Path(directory, name))
+        self.stats["files_stated"] += len(state.files)
+
+    def scan(self) -> SnapshotDiff:
+        """
+        Take a new snapshot and diff it against the previous one.
+
+        Returns:
+            SnapshotDiff: Changes since the previous scan (everything is added on the first)
+        """
+        diff = SnapshotDiff()
+        stack = [str(self.root)]
+        while stack:
+            directory = stack.pop()
+            previous = self._dirs.get(directory)
+            try:
+                dir_stat = os.stat(directory)
+                if (previous and previous.mtime_ns == dir_stat.st_mtime_ns
+                        and previous.listed_ns - previous.mtime_ns > RACY_WINDOW_NS):
+                    self.stats["dirs_skipped"] += 1
+                    state = previous
+                    if self.check_files:
+                        self._recheck(directory, state, diff)
+                else:
+                    state = self._list(directory, dir_stat, previous, diff)
+            except (FileNotFoundError, NotADirectoryError):
+                self._forget(directory, diff)
+                continue
+            self._dirs[directory] = state
+            stack.extend(os.path.join(directory, subdir) for subdir in state.subdirs)
+        self.stats["scans"] += 1
+        return diff
@@ -0,0 +1,208 @@
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Dict
+
+WORKER_MODES = ("thread", "process")
+
+_STOP = object()
+
+
+class WorkQueue:
+    """
+    Bounded queue of work items consumed by a pool of workers.
+
+    submit() blocks while the queue is full, so a slow downstream stage slows
+    its producer down instead of letting work pile up in memory. Items run in
+    worker threads, or in a process pool for CPU-bound handlers (the handler
+    and items must then be picklable; on_result still runs in this process).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Any],
+        workers: int = 4,
+        max_queue_size: int = 64,
+        mode: str = "thread",
+        name: str = "work",
+        on_result: Optional[Callable[[Any, Any], None]] = None
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            handler: Function called with each item
+            workers: Number of concurrent workers
+            max_queue_size: Maximum number of items waiting for a worker
+            mode: "thread" or "process"
+            name: Stage name used in thread names and error messages
+            on_result: Optional callback with (item, result) after each successful item
+        """
+        if mode not in WORKER_MODES:
+            raise ValueError(f"Unknown worker mode: {mode}")
+        self.handler = handler
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.mode = mode
+        self.name = name
+        self.on_result = on_result
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._threads = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._started_at: Optional[float] = None
+        self.stats = {
+            "submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "dropped": 0,
+            "in_flight": 0, "max_queue_depth": 0, "backpressure_waits": 0,
+            "blocked_seconds": 0.0, "busy_seconds": 0.0
+        }
+
+    def start(self) -> "WorkQueue":
+        """Start the workers."""
+        if self.mode == "process":
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._started_at = time.monotonic()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def __enter__(self) -> "WorkQueue":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            started = time.monotonic()
+            with self._lock:
+                self.stats["in_flight"] += 1
+            try:
+                if self._pool is not None:
+                    result = self._pool.submit(self.handler, item).result()
+                else:
+                    result = self.handler(item)
+                if self.on_result:
+                    self.on_result(item, result)
+                outcome = "completed"
+            except Exception as e:
+                print(f"Error in {self.name} worker: {e}")
+                outcome = "failed"
+            with self._lock:
+                self.stats["in_flight"] -= 1
+                self.stats[outcome] += 1
+                self.stats["busy_seconds"] += time.monotonic() - started
+            self._queue.task_done()
+
+    def full(self) -> bool:
+        """Check whether submit() would block."""
+        return self._queue.full()
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Queue an item, waiting while the queue is full.
+
+        Args:
+            item: The work item
+            timeout: Maximum number of seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: False if the queue stayed full for the whole timeout
+        """
+        if self._closed or not self._threads:
+            raise RuntimeError(f"Work queue {self.name} is not running")
+        started = time.monotonic()
+        blocked = self._queue.full()
+        try:
+            self._queue.put(item, timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self.stats["rejected"] += 1
+                self.stats["blocked_seconds"] += time.monotonic() - started
+            return False
+        with self._lock:
+            self.stats["submitted"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._queue.qsize())
+            if blocked:
+                self.stats["backpressure_waits"] += 1
+                self.stats["blocked_seconds"] += time.monotonic() - started
+        return True
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued item has been handled.
+
+        Args:
+            timeout: Maximum number of seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: True if the queue drained within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting items and shut the workers down.
+
+        Args:
+            drain: Finish queued items first; otherwise they are dropped
+            timeout: Maximum number of seconds to wait for queued items
+
+        Returns:
+            bool: True if every accepted item was handled
+        """
+        if self._closed:
+            return True
+        self._closed = True
+        if not drain:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._queue.task_done()
+                with self._lock:
+                    self.stats["dropped"] += 1
+        drained = self.drain(timeout)
+
+        if drained:
+            for _ in self._threads:
+                self._queue.put(_STOP)
+            for thread in self._threads:
+                thread.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=drained, cancel_futures=not drained)
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue metrics.
+
+        Returns:
+            Dict: Item counters, current and maximum queue depth, in-flight items,
+                  time producers spent blocked, throughput (items per second since
+                  start) and mean seconds per item
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats["queue_depth"] = self._queue.qsize()
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        stats["throughput"] = stats["completed"] / elapsed if elapsed else 0.0
+        handled = stats["completed"] + stats["failed"]
+        stats["mean_seconds"] = stats["busy_seconds"] / handled if handled else 0.0
+        return stats
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# tests/crew/test_batch_extraction.py
+
+import sys
+import os
+import re
+import json
+import threading
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.tools.batch_extraction import BatchExtractor
+from crew.utils.content_diet import TokenDiet
+
+NOTES = {f"notes/{i}.md": f"Short note {i} about topic{i}." for i in range(10)}
+
+
+class PackedClient:
+    """Mock LLM client answering packed prompts per document header."""
+
+    def __init__(self, skip=()):
+        self.skip = set(skip)
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, model=None, options=None):
+        with self.lock:
+            self.prompts.append(prompt)
+        if '"results"' in prompt:
+            results = []
+            for alias, topic in re.findall(r'^### (doc\d+)\nShort note \d+ about (\w+)', prompt, re.MULTILINE):
+                if topic not in self.skip:
+                    results.append({"document_id": alias, "primary_keywords": [topic]})
+            return "```json\n" + json.dumps({"results": results}) + "\n```"
+        topic = re.search(r'about (\w+)', prompt).group(1)
+        return json.dumps({"primary_keywords": [topic], "source": "single"})
+
+
+class TestBatchExtraction(unittest.TestCase):
+    """Test cases for multi-document packing."""
+
+    def test_short_notes_are_packed_and_demultiplexed(self):
+        client = PackedClient()
+        extractor = BatchExtractor(client, "keyword_extraction", max_documents=4)
+        results = extractor.extract(NOTES)
+
+        self.assertEqual(list(results), list(NOTES))
+        for i, doc_id in enumerate(NOTES):
+            self.assertEqual(results[doc_id]["primary_keywords"], [f"topic{i}"])
+            self.assertEqual(results[doc_id]["source"], "batch")
+        self.assertEqual(len(client.prompts), 3)
+        self.assertEqual(extractor.get_stats()["prompts_saved"], 7)
+
+    def test_failed_items_fall_back_to_single_calls(self):
+        client = PackedClient(skip={"topic3"})
+        extractor = BatchExtractor(client, "keyword_extraction", max_documents=4)
+        results = extractor.extract(NOTES)
+
+        self.assertEqual(results["notes/3.md"]["primary_keywords"], ["topic3"])
+        self.assertEqual(results["notes/3.md"]["source"], "single")
+        stats = extractor.get_stats()
+        self.assertEqual(stats["fallbacks"], 1)
+        self.assertEqual(stats["batched_documents"], 9)
+
+    def test_budgets_limit_batch_size(self):
+        extractor = BatchExtractor(PackedClient(), "entity_extraction", max_output_tokens=1000,
+                                   document_output_tokens=250)
+        self.assertTrue(all(len(batch) <= 4 for batch in extractor.pack(NOTES)))
+
+        long_document = {"long": "word " * 2000, **NOTES}
+        batches = BatchExtractor(PackedClient(), "keyword_extraction").pack(long_document)
+        self.assertEqual(batches[0], ["long"])
+
+    def test_packed_documents_are_dieted_and_use_base_tool_generate(self):
+        notes = {doc_id: f"---\ntitle: {doc_id}\n---\n{content}<!-- draft -->\n" for doc_id, content in NOTES.items()}
+        client = PackedClient()
+        tool_types = []
+
+        def generate_for_tool(prompt, tool_type, options=None):
+            tool_types.append((tool_type, options["num_predict"]))
+            return client.generate(prompt, options=options)
+
+        client.generate_for_tool = generate_for_tool
+        diet = TokenDiet()
+        extractor = BatchExtractor(client, "keyword_extraction", max_documents=5, document_output_tokens=100,
+                                   diet=diet)
+        results = extractor.extract(notes)
+
+        self.assertEqual([r["source"] for r in results.values()], ["batch"] * 10)
+        self.assertEqual(tool_types, [("keyword_extraction/batch", 500)] * 2)
+        self.assertFalse(any("title:" in prompt or "draft" in prompt for prompt in client.prompts))
+        self.assertEqual(len(diet.history), 10)
+
+    def test_unsupported_tool_type(self):
+        with self.assertRaises(ValueError):
+            BatchExtractor(PackedClient(), "summary_generation")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# tests/crew/test_cascade_client.py
+
+import sys
+import os
+import json
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.interfaces.cascade_client import CascadeClient, parse_parameter_size
+from crew.tools.schemas import validate_tool_output
+from crew.tools.LLM_keyword_extractor_tool import create_keyword_extraction_tool
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../test_models_config.yaml'))
+
+GOOD_KEYWORDS = json.dumps({"primary_keywords": ["cascade", "routing"], "secondary_keywords": []})
+EMPTY_KEYWORDS = json.dumps({"primary_keywords": []})
+
+
+class ModelClient:
+    """Mock LLM client returning a fixed response per model."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def generate(self, prompt, model=None, options=None):
+        self.calls.append(model)
+        return self.responses.get(model, "")
+
+    def get_embeddings(self, text, model=None):
+        return [1.0]
+
+
+class TestCascadeClient(unittest.TestCase):
+    """Test cases for small-model-first cascade routing."""
+
+    def test_parse_parameter_size(self):
+        self.assertEqual(parse_parameter_size("3.2B"), 3.2)
+        self.assertEqual(parse_parameter_size("137M"), 0.137)
+        self.assertEqual(parse_parameter_size("14b"), 14.0)
+        self.assertIsNone(parse_parameter_size("latest"))
+
+    def test_small_model_answer_is_kept(self):
+        client = ModelClient({"small:3b": GOOD_KEYWORDS, "large:14b": GOOD_KEYWORDS})
+        cascade = CascadeClient(client, ["small:3b", "large:14b"])
+        response = cascade.generate_for_tool("prompt", "keyword_extraction")
+
+        self.assertEqual(response, GOOD_KEYWORDS)
+        self.assertEqual(client.calls, ["small:3b"])
+        stats = cascade.stats()
+        self.assertEqual(stats["escalations"], 0)
+        self.assertGreater(stats["compute_saved"], 0)
+
+    def test_escalates_on_quality_failure(self):
+        client = ModelClient({"small:3b": EMPTY_KEYWORDS, "large:14b": GOOD_KEYWORDS})
+        cascade = CascadeClient(client, ["small:3b", "large:14b"])
+        response = cascade.generate_for_tool("prompt", "keyword_extraction")
+
+        self.assertEqual(response, GOOD_KEYWORDS)
+        self.assertEqual(client.calls, ["small:3b", "large:14b"])
+        tool_stats = cascade.stats()["tools"]["keyword_extraction"]
+        self.assertEqual(tool_stats["escalation_rate"], 1.0)
+        self.assertEqual(tool_stats["served_by"], {"large:14b": 1})
+        self.assertLess(tool_stats["compute_saved"], 0)
+
+    def test_last_model_response_returned_when_all_fail(self):
+        client = ModelClient({"small:3b": "not json", "large:14b": "still not json"})
+        cascade = CascadeClient(client, ["small:3b", "large:14b"])
+        self.assertEqual(cascade.generate_for_tool("prompt", "theme_extraction"), "still not json")
+        self.assertEqual(cascade.stats()["tools"]["theme_extraction"]["failures"], 1)
+
+    def test_tools_route_through_cascade(self):
+        client = ModelClient({"small:3b": "{}", "large:14b": GOOD_KEYWORDS})
+        cascade = CascadeClient(client, ["small:3b", "large:14b"])
+        tool = create_keyword_extraction_tool(cascade)
+        result = tool.func("Some content about cascade routing.")
+        self.assertEqual(result["primary_keywords"], ["cascade", "routing"])
+        self.assertEqual(cascade.stats()["tools"]["keyword_extraction"]["escalations"], 1)
+
+    def test_from_models_config(self):
+        cascade = CascadeClient.from_models_config(ModelClient({}), CONFIG_PATH)
+        self.assertEqual(cascade.models, ["llama3.2:latest", "qwen2.5:14b"])
+        self.assertEqual(cascade.model_sizes["llama3.2:latest"], 3.2)
+        self.assertEqual(cascade.model_sizes["qwen2.5:14b"], 14.8)
+
+    def test_delegates_other_methods(self):
+        cascade = CascadeClient(ModelClient({}), ["small:3b"])
+        self.assertEqual(cascade.get_embeddings("text"), [1.0])
+
+    def test_schema_validation_reports_fields(self):
+        problems = validate_tool_output("code_analysis", {"language": "Python", "components": "none"})
+        self.assertTrue(any(p.startswith("purpose") for p in problems))
+        self.assertTrue(any(p.startswith("components") for p in problems))
+        self.assertEqual(validate_tool_output("entity_extraction", {"people": []}), [])
+        self.assertTrue(validate_tool_output("entity_extraction", {}))
+        self.assertEqual(validate_tool_output("summary_generation/technical", {"technical_summary": "word " * 30}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# tests/crew/test_classification_rules.py
+
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.classification_rules import ClassificationRules
+from crew.utils.note_classifier import classify_many, read_records
+
+
+class TestClassificationRules(unittest.TestCase):
+    """Test cases for the compiled classification rules."""
+
+    def setUp(self):
+        self.rules = ClassificationRules()
+
+    def test_defaults_follow_rule_order(self):
+        self.assertEqual(self.rules.content_type(["workflow", "blog"], "a.md"), "article")
+        self.assertEqual(self.rules.content_type(["book", "youtube"], "a.md"), "video")
+        self.assertEqual(self.rules.content_type(["idea"], "a.TXT"), "note")
+        self.assertEqual(self.rules.content_type([], "a.pdf"), "document")
+        self.assertEqual(self.rules.content_type([], "a.png"), "unknown")
+
+    def test_default_storage_matrix(self):
+        self.assertEqual(self.rules.classify(["workflow"], "a.md"), {
+            "content_type": "process",
+            "storage": {"obsidian": True, "vector_db": True, "sql_db": True}
+        })
+        self.assertEqual(self.rules.storage("note", []), {"obsidian": True, "vector_db": False, "sql_db": False})
+
+    def test_priority_overrides_list_order(self):
+        rules = ClassificationRules({"rules": [
+            {"content_type": "video", "hashtags": ["video"]},
+            {"content_type": "meeting", "hashtags": ["Meeting", "video"], "priority": 10}
+        ]})
+        self.assertEqual(rules.content_type(["video"], "a.md"), "meeting")
+        self.assertEqual(rules.content_type(["meeting", "video"], "a.md"), "meeting")
+
+    def test_configured_stores_and_extensions(self):
+        rules = ClassificationRules({
+            "extensions": {"org": "note"},
+            "storage": {"graph_db": {"hashtags": ["person"]}, "sql_db": {"content_types": ["note"]}}
+        })
+        self.assertEqual(rules.classify(["person"], "x.org"), {
+            "content_type": "note", "storage": {"graph_db": True, "sql_db": True}
+        })
+        self.assertEqual(rules.storage("video", ["idea"]), {"graph_db": False, "sql_db": False})
+
+    def test_rule_without_content_type(self):
+        with self.assertRaises(ValueError):
+            ClassificationRules({"rules": [{"hashtags": ["x"]}]})
+
+    def test_from_yaml(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "rules.yaml"
+            path.write_text("rules:\n  - content_type: recipe\n    hashtags: [cooking]\n")
+            rules = ClassificationRules.from_yaml(path)
+        self.assertEqual(rules.content_type(["cooking", "video"], "a.md"), "recipe")
+        self.assertEqual(rules.content_type(["video"], "a.md"), "note")
+
+    def test_reclassify_records_without_reading_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            note = Path(tmp) / "dinner.md"
+            note.write_text("Made pasta #cooking\n")
+            output = Path(tmp) / "records.jsonl"
+            list(classify_many([note, Path(tmp) / "missing.md"], workers=1, output=output))
+            records = list(read_records(output))
+            rules = ClassificationRules({"rules": [{"content_type": "recipe", "hashtags": ["cooking"]}]})
+            with mock.patch("builtins.open", side_effect=AssertionError("file read")):
+                updated = list(rules.reclassify(records))
+        self.assertEqual(records[0]["content_type"], "note")
+        self.assertEqual(updated[0]["content_type"], "recipe")
+        self.assertEqual(updated[0]["metadata"], records[0]["metadata"])
+        self.assertEqual(updated[1], records[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# tests/crew/test_code_units.py
+
+import sys
+import os
+import threading
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.code_units import extract_code_units, cyclomatic_complexity
+from crew.tools.LLM_code_analysis_tool import create_code_analysis_tool
+from crew.utils.content_diet import TokenDiet
+
+SAMPLE_SOURCE = '''"""Utilities for sample processing."""
+import os
+from typing import List
+
+LIMIT = 10
+
+
+def simple(x):
+    return x + 1
+
+
+def branchy(items: List[str]):
+    total = 0
+    for item in items:
+        if item and os.path.exists(item):
+            total += 1
+        elif item.startswith("#"):
+            continue
+    return total
+
+
+class Worker:
+    """A worker."""
+
+    def run(self):
+        return [i for i in range(LIMIT) if i % 2]
+'''
+
+
+class UnitClient:
+    """Mock LLM client returning a per-unit analysis."""
+
+    def __init__(self):
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, model=None, options=None):
+        with self.lock:
+            self.prompts.append(prompt)
+        return ('{"language": "Python", "purpose": "does work", '
+                '"quality_issues": [{"issue": "naming", "importance": "Low"}], '
+                '"strengths": ["readable"]}')
+
+
+class TestCodeUnits(unittest.TestCase):
+    """Test cases for AST-based code unit extraction."""
+
+    def test_units_and_metrics(self):
+        code = extract_code_units(SAMPLE_SOURCE)
+        names = [unit["name"] for unit in code["units"]]
+        self.assertEqual(names, ["<module>", "simple", "branchy", "Worker"])
+
+        by_name = {unit["name"]: unit for unit in code["units"]}
+        self.assertEqual(by_name["simple"]["cyclomatic_complexity"], 1)
+        # for + if + and + elif
+        self.assertEqual(by_name["branchy"]["cyclomatic_complexity"], 5)
+        self.assertEqual(by_name["branchy"]["uses_imports"], ["os", "typing"])
+        self.assertEqual(code["imports"], {"os": ["os"], "typing": ["List"]})
+        self.assertEqual(code["docstring"], "Utilities for sample processing.")
+
+    def test_large_class_split_into_methods(self):
+        code = extract_code_units(SAMPLE_SOURCE, max_unit_lines=3)
+        names = [unit["name"] for unit in code["units"]]
+        self.assertIn("Worker.run", names)
+
+    def test_invalid_python(self):
+        self.assertIsNone(extract_code_units("def broken(:"))
+
+    def test_comprehension_complexity(self):
+        import ast
+        tree = ast.parse("x = [i for i in y if i]")
+        self.assertEqual(cyclomatic_complexity(tree), 3)
+
+
+class TestChunkedCodeAnalysis(unittest.TestCase):
+    """Test cases for change-only code analysis."""
+
+    def test_only_changed_units_are_sent(self):
+        client = UnitClient()
+        tool = create_code_analysis_tool(client, max_chunk_lines=5)
+
+        first = tool.func(SAMPLE_SOURCE)
+        self.assertEqual(len(client.prompts), 4)
+        self.assertEqual(first["units_analyzed"], 4)
+        self.assertEqual(first["language"], "Python")
+        self.assertEqual(first["purpose"], "Utilities for sample processing.")
+        self.assertEqual(first["complexity"], "Low")
+        self.assertEqual(first["strengths"], ["readable"])
+        self.assertEqual(len(first["components"]), 4)
+        self.assertEqual(first["quality_issues"][0]["component"], "<module>")
+
+        client.prompts = []
+        edited = SAMPLE_SOURCE.replace("return x + 1", "return x + 2")
+        second = tool.func(edited)
+        self.assertEqual(len(client.prompts), 1)
+        self.assertIn("def simple", client.prompts[0])
+        self.assertEqual(second["units_cached"], 3)
+
+    def test_unit_sources_are_dieted(self):
+        client = UnitClient()
+        diet = TokenDiet()
+        tool = create_code_analysis_tool(client, max_chunk_lines=5, diet=diet)
+        tool.func(SAMPLE_SOURCE.replace("return x + 1", "return x + 1   "))
+        self.assertEqual(len(diet.history), 4)
+        self.assertTrue(all(h["tool_type"] == "code_analysis" for h in diet.history))
+        simple = next(p for p in client.prompts if "def simple" in p)
+        self.assertIn("return x + 1\n", simple)
+        self.assertNotIn("return x + 1   ", simple)
+
+    def test_failed_unit_is_reported_and_retried(self):
+        client = UnitClient()
+        generate = client.generate
+
+        def failing_generate(prompt, model=None, options=None):
+            if "def simple" in prompt:
+                raise RuntimeError("connection reset")
+            return generate(prompt, model, options)
+
+        client.generate = failing_generate
+        tool = create_code_analysis_tool(client, max_chunk_lines=5)
+        first = tool.func(SAMPLE_SOURCE)
+        self.assertEqual(len(first["components"]), 4)
+        self.assertEqual(len(first["errors"]), 1)
+        self.assertEqual(first["errors"][0]["component"], "simple")
+        self.assertIn("connection reset", first["errors"][0]["error"])
+
+        client.generate = generate
+        client.prompts = []
+        second = tool.func(SAMPLE_SOURCE)
+        self.assertEqual(len(client.prompts), 1)
+        self.assertEqual(second["units_cached"], 3)
+        self.assertNotIn("errors", second)
+
+    def test_small_files_use_single_prompt(self):
+        client = UnitClient()
+        tool = create_code_analysis_tool(client)
+        result = tool.func(SAMPLE_SOURCE)
+        self.assertEqual(len(client.prompts), 1)
+        self.assertEqual(result["metrics"]["max_complexity"], 5)
+        self.assertEqual(result["metrics"]["import_graph"], {"os": ["os"], "typing": ["List"]})
+        self.assertEqual(result["complexity"], "Low")
+
+        # Unchanged files are answered from the cache
+        self.assertEqual(tool.func(SAMPLE_SOURCE), result)
+        self.assertEqual(len(client.prompts), 1)
+
+    def test_non_python_content_has_no_metrics(self):
+        client = UnitClient()
+        result = create_code_analysis_tool(client).func("function add(a, b) { return a + b; }")
+        self.assertNotIn("metrics", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
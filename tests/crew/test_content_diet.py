@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# tests/crew/test_content_diet.py
+
+import sys
+import os
+import json
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.content_diet import TokenDiet
+from crew.tools.LLM_summary_generation_tool import create_summary_generation_tool
+from crew.tools.LLM_code_analysis_tool import create_code_analysis_tool
+
+NOTE = """---
+title: Weekly review
+tags: [review]
+---
+# Weekly   review
+
+<!-- template: weekly -->
+Read https://example.com/articles/2024/very/long/path/to/an/article?utm_source=newsletter&utm_medium=email today.
+![chart](data:image/png;base64,""" + "iVBORw0KGgo" * 60 + """)
+
+
+
+```python
+def total(items):
+    return  sum(items)
+```
+%% reminder to self %%
+Done.
+"""
+
+
+class PromptClient:
+    """Mock LLM client recording prompts."""
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def generate(self, prompt, model=None, options=None):
+        self.prompts.append(prompt)
+        return self.response
+
+
+class TestTokenDiet(unittest.TestCase):
+    """Test cases for token-diet preprocessing."""
+
+    def test_noise_is_removed(self):
+        cleaned, stats = TokenDiet().apply(NOTE, "summary_generation")
+        self.assertNotIn("tags:", cleaned)
+        self.assertNotIn("base64", cleaned)
+        self.assertNotIn("template: weekly", cleaned)
+        self.assertNotIn("reminder to self", cleaned)
+        self.assertNotIn("utm_source", cleaned)
+        self.assertNotIn("\n\n\n", cleaned)
+        self.assertIn("# Weekly review", cleaned)
+        self.assertIn("https://example.com/...", cleaned)
+        self.assertIn("[image: chart]", cleaned)
+        self.assertIn("[code block: python, 2 lines]", cleaned)
+        self.assertEqual(stats["tokens_removed"], stats["tokens_before"] - stats["tokens_after"])
+        self.assertGreater(stats["removed_by_rule"]["base64"], 100)
+
+    def test_code_kept_for_code_analysis(self):
+        cleaned, _ = TokenDiet().apply(NOTE, "code_analysis")
+        self.assertIn("    return  sum(items)", cleaned)
+        self.assertIn("<!-- template: weekly -->", cleaned)
+
+        source = "x  = 1\ny  = 2   \n\n\n\nz = 3\n"
+        cleaned, _ = TokenDiet().apply(source, "code_analysis")
+        self.assertEqual(cleaned, "x  = 1\ny  = 2\n\nz = 3")
+
+    def test_configurable_rules(self):
+        diet = TokenDiet({"summary_generation": {"code_blocks": "drop", "frontmatter": False,
+                                                 "boilerplate_patterns": [r"^Done\.$"]}})
+        cleaned, _ = diet.apply(NOTE, "summary_generation/technical")
+        self.assertIn("title: Weekly review", cleaned)
+        self.assertNotIn("code block", cleaned)
+        self.assertNotIn("Done.", cleaned)
+
+    def test_report_and_latency_estimate(self):
+        diet = TokenDiet()
+        diet.apply(NOTE, "theme_extraction")
+        diet.observe("theme_extraction", 1000, 2.0)
+        diet.observe("theme_extraction", 3000, 4.0)
+
+        report = diet.report()["theme_extraction"]
+        self.assertEqual(report["documents"], 1)
+        self.assertAlmostEqual(report["seconds_per_prompt_token"], 0.001)
+        self.assertAlmostEqual(report["estimated_seconds_saved"], report["tokens_removed"] * 0.001)
+        self.assertEqual(diet.history[-1]["tool_type"], "theme_extraction")
+
+    def test_tools_prompt_with_cleaned_content(self):
+        diet = TokenDiet()
+        client = PromptClient(json.dumps({"executive_summary": "A week of reviews. " * 10}))
+        create_summary_generation_tool(client, diet=diet).func(NOTE)
+        self.assertNotIn("base64", client.prompts[0])
+        self.assertIn("summary_generation", diet.report())
+        self.assertEqual(len(diet._observations["summary_generation"]), 1)
+
+        client = PromptClient(json.dumps({"language": "Python", "purpose": "Sums items"}))
+        create_code_analysis_tool(client, diet=diet).func("def total(items):\n    return  sum(items)\n")
+        self.assertIn("    return  sum(items)", client.prompts[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# tests/crew/test_content_repurposing.py
+
+import sys
+import os
+import time
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.tools.LLM_content_repurposing_tool import (
+    create_content_repurposing_tool,
+    stream_repurposing_formats
+)
+from crew.utils.content_diet import TokenDiet
+
+
+class FormatClient:
+    """Mock LLM client with per-format latency and failures."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompt, model=None, options=None):
+        self.prompts.append(prompt)
+        if "newsletter" in prompt:
+            time.sleep(0.05)
+            return ('{"content_type": "article", "format": "Email Newsletter", "audience": "subscribers", '
+                    '"value_potential": "Medium", "modification_needed": "Low"}')
+        if "video script" in prompt:
+            return "Sorry, I cannot do that"
+        return '{"audience": "readers", "value_potential": "High", "modification_needed": "Medium"}'
+
+
+class TestParallelRepurposing(unittest.TestCase):
+    """Test cases for per-format repurposing."""
+
+    def test_stream_yields_fast_formats_first(self):
+        events = list(stream_repurposing_formats(FormatClient(), "Some content",
+                                                 ["newsletter", "blog post"], max_workers=2))
+        self.assertEqual([event["format"] for event in events], ["blog post", "newsletter"])
+
+    def test_prompts_share_content_prefix(self):
+        client = FormatClient()
+        list(stream_repurposing_formats(client, "Some content", ["newsletter", "blog post"]))
+        prefixes = {prompt.split("Assess how")[0] for prompt in client.prompts}
+        self.assertEqual(len(prefixes), 1)
+
+    def test_stream_applies_diet_and_observes_calls(self):
+        client = FormatClient()
+        diet = TokenDiet()
+        list(stream_repurposing_formats(client, "Some   content\n\n\n\nmore", ["newsletter", "blog post"],
+                                        diet=diet))
+        self.assertEqual(len(diet.history), 1)
+        self.assertTrue(all("Some content\n\nmore" in prompt for prompt in client.prompts))
+        self.assertEqual(len(diet._observations["content_repurposing"]), 2)
+
+    def test_failures_keep_successful_formats(self):
+        tool = create_content_repurposing_tool(FormatClient())
+        result = tool.func("Some content", target_formats=["newsletter", "video script", "blog post"])
+
+        formats = [o["format"] for o in result["repurposing_opportunities"]]
+        self.assertEqual(formats, ["newsletter", "blog post"])
+        self.assertEqual(result["failed_formats"][0]["format"], "video script")
+        self.assertEqual(result["recommended_approach"]["format"], "blog post")
+        self.assertEqual(result["content_type"], "article")
+        self.assertNotIn("error", result)
+
+    def test_default_mode_single_prompt(self):
+        client = FormatClient()
+        create_content_repurposing_tool(client).func("Some content")
+        self.assertEqual(len(client.prompts), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
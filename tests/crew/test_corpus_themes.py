@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# tests/crew/test_corpus_themes.py
+
+import sys
+import os
+import json
+import unittest
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.pipelines.corpus_themes import CorpusThemeEngine, spherical_kmeans
+from crew.tools.LLM_primary_theme_extractor_tool import create_theme_extraction_tool
+
+TOPICS = ["cooking", "finance", "hiking"]
+
+
+class EmbeddingClient:
+    """Mock client embedding texts by topic word counts and naming clusters."""
+
+    def __init__(self):
+        self.batches = []
+        self.prompts = []
+
+    def get_embeddings_batch(self, texts, model=None):
+        self.batches.append(len(texts))
+        return [[text.count(topic) + 0.1 * (i % 3) for i, topic in enumerate(TOPICS)] for text in texts]
+
+    def generate(self, prompt, model=None, options=None):
+        self.prompts.append(prompt)
+        topic = max(TOPICS, key=prompt.count)
+        return json.dumps({"theme_name": topic.title(), "description": "", "keywords": [topic]})
+
+
+def corpus(n_per_topic=4):
+    return {
+        f"{topic}-{i}.md": f"notes about {topic} " * (i + 1)
+        for topic in TOPICS for i in range(n_per_topic)
+    }
+
+
+class TestSphericalKMeans(unittest.TestCase):
+    """Test cases for the NumPy clustering."""
+
+    def test_separates_orthogonal_groups(self):
+        vectors = np.array([[1, 0], [0.9, 0.1], [0, 1], [0.1, 0.9]], dtype=float)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        centroids = spherical_kmeans(vectors, 2)
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        self.assertEqual(labels[0], labels[1])
+        self.assertEqual(labels[2], labels[3])
+        self.assertNotEqual(labels[0], labels[2])
+
+
+class TestCorpusThemeEngine(unittest.TestCase):
+    """Test cases for corpus theme discovery."""
+
+    def test_one_naming_call_per_cluster(self):
+        client = EmbeddingClient()
+        engine = CorpusThemeEngine(client, n_clusters=3, batch_size=5)
+        engine.add_documents(corpus())
+
+        themes = engine.themes()
+        self.assertEqual(client.batches, [5, 5, 2])
+        self.assertEqual(len(client.prompts), 3)
+        self.assertEqual(sorted(theme["theme_name"] for theme in themes), ["Cooking", "Finance", "Hiking"])
+        self.assertTrue(all(theme["size"] == 4 for theme in themes))
+
+        # Naming is not repeated once clusters have names
+        engine.themes()
+        self.assertEqual(len(client.prompts), 3)
+
+    def test_primary_theme_is_centroid_lookup(self):
+        client = EmbeddingClient()
+        engine = CorpusThemeEngine(client, n_clusters=3)
+        engine.add_documents(corpus())
+        engine.name_clusters()
+        calls = len(client.prompts)
+
+        self.assertEqual(engine.primary_theme(document_id="finance-2.md")["primary_theme"], "Finance")
+        self.assertEqual(engine.primary_theme(text="hiking hiking trip")["primary_theme"], "Hiking")
+        self.assertEqual(len(client.prompts), calls)
+
+    def test_incremental_documents(self):
+        client = EmbeddingClient()
+        engine = CorpusThemeEngine(client, n_clusters=3)
+        engine.add_documents(corpus(2))
+        engine.add_documents({"new.md": "cooking cooking"})
+        self.assertEqual(len(engine.document_ids), 7)
+        self.assertEqual(engine.primary_theme(document_id="new.md")["primary_theme"], "Cooking")
+
+    def test_re_added_documents_are_not_counted_twice(self):
+        engine = CorpusThemeEngine(EmbeddingClient(), n_clusters=3)
+        engine.add_documents(corpus(2))
+        counts = engine.counts.copy()
+        engine.add_documents({"cooking-0.md": "notes about cooking "})
+        np.testing.assert_array_equal(engine.counts, counts)
+        engine.add_documents({"new.md": "cooking cooking"})
+        self.assertEqual(engine.counts.sum(), counts.sum() + 1)
+
+    def test_empty_embeddings(self):
+        client = EmbeddingClient()
+        client.get_embeddings_batch = lambda texts, model=None: [[] for _ in texts]
+        engine = CorpusThemeEngine(client, n_clusters=3)
+        with self.assertRaises(ValueError):
+            engine.add_documents(corpus(1))
+        self.assertEqual(engine.document_ids, [])
+
+    def test_too_few_documents(self):
+        engine = CorpusThemeEngine(EmbeddingClient(), n_clusters=5)
+        engine.add_documents({"a.md": "cooking"})
+        self.assertEqual(engine.themes(), [])
+        self.assertIn("error", engine.primary_theme(document_id="a.md"))
+
+    def test_theme_tool_uses_engine(self):
+        client = EmbeddingClient()
+        engine = CorpusThemeEngine(client, n_clusters=3)
+        engine.add_documents(corpus())
+        engine.name_clusters()
+        calls = len(client.prompts)
+
+        result = create_theme_extraction_tool(client, theme_engine=engine).func("finance finance")
+        self.assertEqual(result["primary_theme"], "Finance")
+        self.assertEqual(result["source"], "corpus_clusters")
+        self.assertEqual(len(client.prompts), calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# tests/crew/test_debouncer.py
+
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.debouncer import Debouncer
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDebouncer(unittest.TestCase):
+    """Test cases for write-stability debouncing."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = self.root / name
+        path.write_text(text)
+        return path
+
+    def test_bursts_collapse_into_one_release(self):
+        debouncer = Debouncer(quiet_period=2.0, batch_size=1, clock=self.clock)
+        path = self.write("note.md", "a")
+        for _ in range(5):
+            debouncer.add(path)
+            self.clock.now += 0.5
+        self.assertIsNone(debouncer.next_batch())
+
+        self.clock.now += 2.0
+        self.assertEqual(debouncer.next_batch(), [path])
+        self.assertIsNone(debouncer.next_batch())
+        self.assertEqual(debouncer.stats["collapsed"], 4)
+
+    def test_file_still_being_written_is_held_back(self):
+        debouncer = Debouncer(quiet_period=2.0, batch_size=1, clock=self.clock)
+        path = self.write("upload.pdf", "part")
+        debouncer.add(path)
+
+        # Grew without producing an event (e.g. a sync client writing in place)
+        self.clock.now += 2.0
+        self.write("upload.pdf", "part two")
+        self.assertIsNone(debouncer.next_batch())
+        self.assertAlmostEqual(debouncer.next_timeout(), 1.0)
+
+        self.clock.now += 2.0
+        self.assertEqual(debouncer.next_batch(), [path])
+
+    def test_micro_batches(self):
+        debouncer = Debouncer(quiet_period=1.0, batch_size=3, max_batch_delay=0.5, clock=self.clock)
+        paths = [self.write(f"{i}.md", str(i)) for i in range(5)]
+        for path in paths:
+            debouncer.add(path)
+
+        self.clock.now += 1.0
+        self.assertEqual(debouncer.next_batch(), paths[:3])
+        # The remainder waits for its batch to fill, up to max_batch_delay
+        self.assertIsNone(debouncer.next_batch())
+        self.clock.now += 0.5
+        self.assertEqual(debouncer.next_batch(), paths[3:])
+        self.assertEqual(len(debouncer), 0)
+
+    def test_deleted_and_vanished_files_are_dropped(self):
+        debouncer = Debouncer(quiet_period=1.0, max_batch_delay=0.0, clock=self.clock)
+        kept, deleted, temporary = (self.write(name, name) for name in ["kept.md", "deleted.md", "tmp.md"])
+        for path in (kept, deleted, temporary):
+            debouncer.add(path)
+        debouncer.discard(deleted)
+        os.remove(temporary)
+
+        self.clock.now += 1.0
+        self.assertEqual(debouncer.next_batch(), [kept])
+        self.assertEqual(debouncer.stats["vanished"], 1)
+
+    def test_max_wait_releases_files_that_never_settle(self):
+        debouncer = Debouncer(quiet_period=1.0, max_batch_delay=0.0, max_wait=3.0, clock=self.clock)
+        path = self.write("log.txt", "")
+        debouncer.add(path)
+        for i in range(3):
+            self.clock.now += 1.0
+            self.write("log.txt", "x" * (i + 1))
+            batch = debouncer.next_batch()
+        self.assertEqual(batch, [path])
+        self.assertEqual(debouncer.stats["forced"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# tests/crew/test_entity_gazetteer.py
+
+import sys
+import os
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.entity_gazetteer import AhoCorasickAutomaton, EntityGazetteer
+from crew.tools.LLM_entity_extraction_tool import create_entity_extraction_tool
+
+
+class EntityClient:
+    """Mock LLM client that confirms one new organization."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompt, model=None, options=None):
+        self.prompts.append(prompt)
+        return '{"people": [], "organizations": ["Globex"], "locations": [], "relationships": []}'
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """Test cases for the Aho-Corasick automaton."""
+
+    def test_overlapping_patterns(self):
+        automaton = AhoCorasickAutomaton()
+        for pattern in ["he", "she", "his", "hers"]:
+            automaton.add(pattern, pattern)
+        found = sorted((start, pattern) for start, _, pattern, _ in automaton.search("ushers"))
+        self.assertEqual(found, [(1, "she"), (2, "he"), (2, "hers")])
+
+    def test_incremental_insertion(self):
+        automaton = AhoCorasickAutomaton()
+        automaton.add("Berlin", "locations")
+        self.assertEqual(len(automaton.search("Paris and Berlin")), 1)
+        automaton.add("Paris", "locations")
+        self.assertEqual(len(automaton.search("Paris and Berlin")), 2)
+        self.assertFalse(automaton.add("Paris", "locations"))
+        self.assertEqual(len(automaton), 2)
+
+
+class TestEntityGazetteer(unittest.TestCase):
+    """Test cases for local entity resolution."""
+
+    def setUp(self):
+        self.gazetteer = EntityGazetteer()
+        self.gazetteer.add_entity("Alice Smith", "people")
+        self.gazetteer.add_entity("Acme Corp", "organizations")
+        self.gazetteer.add_entity("New York", "locations")
+        self.gazetteer.add_entity("New York Times", "organizations")
+
+    def test_resolves_known_entities(self):
+        result = self.gazetteer.resolve("Alice Smith wrote for the New York Times about Acme Corp.")
+        self.assertEqual(result["known"]["people"], ["Alice Smith"])
+        self.assertEqual(result["known"]["organizations"], ["New York Times", "Acme Corp"])
+        self.assertEqual(result["known"]["locations"], [])
+        self.assertEqual(result["unresolved"], [])
+
+    def test_word_boundaries(self):
+        result = self.gazetteer.resolve("Acme Corporation is different.")
+        self.assertEqual(result["known"]["organizations"], [])
+
+    def test_unresolved_candidates_and_dates(self):
+        result = self.gazetteer.resolve("On 2024-03-01 we met Bob Jones at Globex. Yesterday was fine.")
+        texts = [candidate["text"] for candidate in result["unresolved"]]
+        self.assertEqual(result["dates"], ["2024-03-01"])
+        self.assertIn("Bob Jones", texts)
+        self.assertIn("Globex", texts)
+        self.assertNotIn("Yesterday", texts)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "entities.json")
+            self.gazetteer.save(path)
+            loaded = EntityGazetteer(path)
+            self.assertEqual(len(loaded), 4)
+            self.assertEqual(loaded.resolve("Acme Corp")["known"]["organizations"], ["Acme Corp"])
+
+
+class TestEntityToolPrePass(unittest.TestCase):
+    """Test cases for the entity tool's gazetteer pre-pass."""
+
+    def test_known_only_document_skips_llm(self):
+        client = EntityClient()
+        gazetteer = EntityGazetteer()
+        gazetteer.add_entity("Acme Corp", "organizations")
+        tool = create_entity_extraction_tool(client, gazetteer=gazetteer)
+
+        result = tool.func("the report from Acme Corp is ready.")
+        self.assertEqual(client.prompts, [])
+        self.assertTrue(result["llm_skipped"])
+        self.assertEqual(result["organizations"], ["Acme Corp"])
+
+    def test_unresolved_spans_sent_and_learned(self):
+        client = EntityClient()
+        gazetteer = EntityGazetteer()
+        gazetteer.add_entity("Acme Corp", "organizations")
+        tool = create_entity_extraction_tool(client, gazetteer=gazetteer)
+
+        content = ("the report from Acme Corp is ready. " * 5) + "we also spoke with Globex."
+        result = tool.func(content)
+        self.assertEqual(len(client.prompts), 1)
+        self.assertIn("Globex", client.prompts[0])
+        self.assertEqual(client.prompts[0].count("Acme Corp"), 0)
+        self.assertEqual(result["organizations"], ["Acme Corp", "Globex"])
+
+        # Globex is now confirmed, so the same document resolves locally
+        client.prompts = []
+        self.assertTrue(tool.func(content)["llm_skipped"])
+        self.assertEqual(client.prompts, [])
+
+    def test_without_gazetteer_behaviour_is_unchanged(self):
+        client = EntityClient()
+        result = create_entity_extraction_tool(client).func("Acme Corp")
+        self.assertEqual(len(client.prompts), 1)
+        self.assertNotIn("llm_skipped", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# tests/crew/test_field_repair.py
+
+import sys
+import os
+import json
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.helpers import repair_json
+from crew.tools.field_repair import invalid_fields, repair_response
+from crew.tools.LLM_code_analysis_tool import create_code_analysis_tool
+
+
+class RepairClient:
+    """Mock LLM client returning queued responses and recording prompts."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+        self.options = []
+
+    def generate(self, prompt, model=None, options=None):
+        self.prompts.append(prompt)
+        self.options.append(options)
+        return self.responses.pop(0)
+
+
+class TestRepairJson(unittest.TestCase):
+    """Test cases for local JSON syntax repair."""
+
+    def test_common_syntax_slips(self):
+        text = "```json\n{language: 'Python', components: ['a', 'b',], tested: True, owner: None,}\n```"
+        self.assertEqual(repair_json(text), {
+            "language": "Python", "components": ["a", "b"], "tested": True, "owner": None
+        })
+
+    def test_strings_are_left_alone(self):
+        text = '{"purpose": "Parses key: value pairs, {braces} and it\'s quotes",}'
+        self.assertEqual(repair_json(text), {"purpose": "Parses key: value pairs, {braces} and it's quotes"})
+
+    def test_truncated_object_is_closed(self):
+        self.assertEqual(repair_json('{"language": "Go", "strengths": ["fast", "sim'),
+                         {"language": "Go", "strengths": ["fast", "sim"]})
+        self.assertEqual(repair_json('{"language": "Go", "purpose":'), {"language": "Go", "purpose": None})
+
+    def test_no_object(self):
+        self.assertIsNone(repair_json("I could not analyze this."))
+
+
+class TestFieldRepair(unittest.TestCase):
+    """Test cases for targeted follow-up prompts."""
+
+    def test_invalid_fields(self):
+        self.assertEqual(invalid_fields("code_analysis", {"language": "Python", "components": "x"}),
+                         ["purpose", "components"])
+        self.assertEqual(invalid_fields("code_analysis", {"language": "Python", "purpose": "p"}), [])
+
+    def test_valid_response_is_untouched(self):
+        response = 'Here you go: {"language": "Python", "purpose": "p"}'
+        client = RepairClient([])
+        self.assertEqual(repair_response(client, "prompt", "code_analysis", response), response)
+        self.assertEqual(client.prompts, [])
+
+    def test_only_missing_fields_are_requested(self):
+        client = RepairClient(['{"purpose": "Computes totals", "language": "ignored"}'])
+        repaired = repair_response(client, "ORIGINAL PROMPT", "code_analysis",
+                                   "{language: 'Python', strengths: ['clear',],}")
+
+        self.assertEqual(json.loads(repaired), {
+            "language": "Python", "strengths": ["clear"], "purpose": "Computes totals"
+        })
+        follow_up = client.prompts[0]
+        self.assertTrue(follow_up.startswith("ORIGINAL PROMPT"))
+        self.assertIn("- purpose: string", follow_up)
+        self.assertNotIn("- language", follow_up)
+        self.assertLess(client.options[0]["num_predict"], 200)
+
+    def test_failed_follow_up_keeps_partial_result(self):
+        client = RepairClient(["Error: connection refused"])
+        repaired = repair_response(client, "prompt", "code_analysis", "{language: 'Python'")
+        self.assertEqual(json.loads(repaired), {
+            "language": "Python", "error": "Missing or invalid fields after repair: purpose"
+        })
+
+    def test_incomplete_follow_up_reports_remaining_fields(self):
+        client = RepairClient(['{"components": ["parser"]}'])
+        repaired = json.loads(repair_response(client, "prompt", "code_analysis", '{"components": "parser"}'))
+        self.assertEqual(repaired["components"], ["parser"])
+        self.assertEqual(repaired["error"], "Missing or invalid fields after repair: language, purpose")
+
+    def test_tool_returns_repaired_result(self):
+        client = RepairClient(["```json\n{\"language\": \"Python\", \"strengths\": [\"small\",],}\n```",
+                               '{"purpose": "Adds numbers"}'])
+        result = create_code_analysis_tool(client).func("def add(a, b):\n    return a + b\n")
+        self.assertEqual(result["purpose"], "Adds numbers")
+        self.assertEqual(result["strengths"], ["small"])
+        self.assertNotIn("error", result)
+
+
+if __name__ == '__main__':
+    unittest.main()
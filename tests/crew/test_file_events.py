@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# tests/crew/test_file_events.py
+
+import sys
+import os
+import errno
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.file_events import (
+    PollingEventSource, InotifyEventSource, create_event_source, inotify_available
+)
+
+
+def collect(source, kinds, timeout=2.0):
+    """Poll until events of every kind arrived or the timeout passed."""
+    events = []
+    remaining = int(timeout / 0.05)
+    while remaining and not kinds <= {event.kind for event in events}:
+        events.extend(source.poll(0.05))
+        remaining -= 1
+    return events
+
+
+class TestPollingEventSource(unittest.TestCase):
+    """Test cases for the polling fallback."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "existing.md").write_text("old")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_diff_between_listings(self):
+        source = PollingEventSource(self.root, poll_interval=0.01)
+        source.start()
+        (self.root / "sub").mkdir()
+        (self.root / "sub" / "new.md").write_text("new")
+        os.remove(self.root / "existing.md")
+
+        events = collect(source, {"created", "deleted"})
+        self.assertIn(("created", self.root / "sub" / "new.md"), [(e.kind, e.path) for e in events])
+        self.assertIn(("deleted", self.root / "existing.md"), [(e.kind, e.path) for e in events])
+        source.close()
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            create_event_source(self.root, mode="fsevents")
+        self.assertIsInstance(create_event_source(self.root, mode="polling"), PollingEventSource)
+
+
+@unittest.skipUnless(inotify_available(), "inotify is not available")
+class TestInotifyEventSource(unittest.TestCase):
+    """Test cases for the inotify event source."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.source = InotifyEventSource(self.root)
+        self.source.start()
+
+    def tearDown(self):
+        self.source.close()
+        self.tmp.cleanup()
+
+    def test_created_after_write_then_modified(self):
+        path = self.root / "note.md"
+        with open(path, "w") as f:
+            f.write("first")
+            f.flush()
+            self.assertEqual(self.source.poll(0.05), [])
+        events = collect(self.source, {"created"})
+        self.assertEqual([(e.kind, e.path) for e in events], [("created", path)])
+
+        path.write_text("second")
+        events = collect(self.source, {"modified"})
+        self.assertEqual([(e.kind, e.path) for e in events], [("modified", path)])
+
+    def test_moves_and_deletes(self):
+        (self.root / "a.md").write_text("a")
+        collect(self.source, {"created"})
+
+        os.rename(self.root / "a.md", self.root / "b.md")
+        events = collect(self.source, {"moved"})
+        self.assertEqual([(e.kind, e.path, e.dest_path) for e in events],
+                         [("moved", self.root / "a.md", self.root / "b.md")])
+
+        os.remove(self.root / "b.md")
+        events = collect(self.source, {"deleted"})
+        self.assertEqual([(e.kind, e.path) for e in events], [("deleted", self.root / "b.md")])
+
+    def test_new_directories_are_watched(self):
+        (self.root / "notes" / "deep").mkdir(parents=True)
+        (self.root / "notes" / "deep" / "README").write_text("no extension")
+        (self.root / ".obsidian").mkdir()
+        (self.root / ".obsidian" / "workspace.json").write_text("{}")
+        events = collect(self.source, {"created"})
+        self.assertEqual([e.path for e in events], [self.root / "notes" / "deep" / "README"])
+
+        (self.root / "notes" / "deep" / "later.md").write_text("x")
+        events = collect(self.source, {"created"})
+        self.assertEqual([e.path for e in events], [self.root / "notes" / "deep" / "later.md"])
+
+    def test_unwatchable_directory_falls_back_to_rescans(self):
+        add_watch = self.source._add_watch
+
+        def limited(directory):
+            if directory.name == "full":
+                raise OSError(errno.ENOSPC, "No space left on device")
+            add_watch(directory)
+
+        self.source.rescan_interval = 0.2
+        with mock.patch.object(self.source, "_add_watch", side_effect=limited), \
+                mock.patch("builtins.print"):
+            (self.root / "full").mkdir()
+            (self.root / "full" / "n.md").write_text("x")
+            events = collect(self.source, {"created", "overflow"})
+            self.assertIn(("created", self.root / "full" / "n.md"), [(e.kind, e.path) for e in events])
+            # Still unwatched: further changes are found by periodic rescans
+            events = collect(self.source, {"overflow"})
+            self.assertEqual([e.kind for e in events], ["overflow"])
+
+        # Once a watch can be added, events flow again
+        collect(self.source, {"overflow"})
+        (self.root / "full" / "m.md").write_text("y")
+        events = collect(self.source, {"created"})
+        self.assertEqual([e.path for e in events], [self.root / "full" / "m.md"])
+
+    def test_directory_moves(self):
+        (self.root / "a").mkdir()
+        (self.root / "a" / "n.md").write_text("x")
+        collect(self.source, {"created"})
+
+        os.rename(self.root / "a", self.root / "b")
+        events = collect(self.source, {"moved"})
+        self.assertEqual([(e.kind, e.path, e.dest_path) for e in events],
+                         [("moved", self.root / "a" / "n.md", self.root / "b" / "n.md")])
+        (self.root / "b" / "n.md").write_text("y")
+        events = collect(self.source, {"modified"})
+        self.assertEqual([e.path for e in events], [self.root / "b" / "n.md"])
+
+        with tempfile.TemporaryDirectory() as outside:
+            os.rename(self.root / "b", Path(outside) / "b")
+            events = collect(self.source, {"overflow"})
+            self.assertEqual([e.kind for e in events], ["overflow"])
+
+
+if __name__ == '__main__':
+    unittest.main()
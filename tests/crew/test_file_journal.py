@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# tests/crew/test_file_journal.py
+
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.file_journal import FileJournal, DONE, FAILED
+from crew.utils.snapshot_scanner import SnapshotScanner
+
+
+class TestFileJournal(unittest.TestCase):
+    """Test cases for the persistent watcher journal."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.db = self.root / ".crew" / "journal.db"
+        self.note = self.root / "note.md"
+        self.note.write_text("# Note\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_processed_file_is_unchanged_without_hashing(self):
+        journal = FileJournal(self.db)
+        self.assertFalse(journal.is_unchanged(self.note))
+        journal.mark(self.note, DONE)
+        hashes = journal.stats["hashes"]
+
+        self.assertTrue(journal.is_unchanged(self.note))
+        self.assertEqual(journal.stats["hashes"], hashes)
+        journal.close()
+
+    def test_hash_decides_when_stat_changes(self):
+        journal = FileJournal(self.db)
+        journal.mark(self.note, DONE)
+
+        # Same contents, new mtime: hashed once, then the refreshed record matches by stat
+        os.utime(self.note, ns=(1, 1))
+        self.assertTrue(journal.is_unchanged(self.note))
+        self.assertEqual(journal.stats["content_unchanged"], 1)
+        self.assertEqual(journal.get(self.note).mtime_ns, 1)
+        hashes = journal.stats["hashes"]
+        self.assertTrue(journal.is_unchanged(self.note))
+        self.assertEqual(journal.stats["hashes"], hashes)
+
+        self.note.write_text("# Note\nEdited\n")
+        self.assertFalse(journal.is_unchanged(self.note))
+        journal.close()
+
+    def test_state_survives_restart(self):
+        journal = FileJournal(self.db)
+        other = self.root / "other.md"
+        other.write_text("other")
+        journal.mark_many([(self.note, DONE, None, None), (other, FAILED, None, None)])
+        journal.close()
+
+        journal = FileJournal(self.db)
+        self.assertEqual(len(journal), 2)
+        new = self.root / "new.md"
+        new.write_text("new")
+        scanner = SnapshotScanner(self.root)
+        scanner.scan()
+        files = scanner.files
+        self.assertEqual(sorted(journal.changed_files(files)), [new, other])
+
+        os.remove(other)
+        del files[other]
+        self.assertEqual(journal.prune(files), 1)
+        self.assertIsNone(journal.get(other))
+        journal.close()
+
+    def test_renames_and_duplicates_by_content(self):
+        journal = FileJournal(self.db)
+        copy = self.root / "copy.md"
+        copy.write_text(self.note.read_text())
+        record = journal.mark(self.note, DONE)
+
+        self.assertEqual(journal.find_duplicate(record.content_hash, exclude=copy), str(self.note))
+        self.assertIsNone(journal.find_duplicate(record.content_hash, exclude=self.note))
+
+        # Deleted before the new path was seen: matched through the removed history, once
+        journal.remove(self.note)
+        self.assertEqual(journal.find_renamed(record.content_hash), str(self.note))
+        self.assertIsNone(journal.find_renamed(record.content_hash))
+
+        # Moved while the deletion was not seen yet
+        journal.mark(copy, DONE)
+        moved = self.root / "moved.md"
+        os.rename(copy, moved)
+        self.assertEqual(journal.find_renamed(record.content_hash), str(copy))
+
+        journal.rename(copy, moved)
+        self.assertIsNone(journal.get(copy))
+        self.assertTrue(journal.is_unchanged(moved))
+        self.assertEqual(journal.find_duplicate(record.content_hash), str(moved))
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
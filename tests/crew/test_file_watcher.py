@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# tests/crew/test_file_watcher.py
+
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Settings are loaded at import time and require Supabase credentials
+os.environ.setdefault("SUPABASE_URL", "http://localhost:3000")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+from crew.agents.file_watcher import FileWatchingAgent
+from crew.utils.file_journal import FileJournal
+from crew.utils.debouncer import Debouncer
+from crew.utils.result_cache import ResultCache
+
+
+def make_watcher():
+    """Build the watcher state used by the agent methods without constructing a CrewAI agent."""
+    watcher = SimpleNamespace(
+        journal=FileJournal(),
+        debouncer=Debouncer(),
+        result_cache=ResultCache(),
+        dedupe_stats=Counter(),
+        stats_lock=threading.Lock(),
+        event_counts=Counter(),
+        work_queue=None,
+        processed=[]
+    )
+
+    def process_new_file(file_path):
+        watcher.processed.append(file_path.name)
+        return dict(FileWatchingAgent._file_metadata(file_path), analysis=f"analysis of {file_path.read_text()}")
+
+    watcher.process_new_file = process_new_file
+    return watcher
+
+
+class TestFileWatcherDedupe(unittest.TestCase):
+    """Test cases for content-hash identity in the watcher."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.watcher = make_watcher()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def process(self, *names):
+        return FileWatchingAgent._process_batch(self.watcher, [self.root / name for name in names])
+
+    def test_copies_reuse_results(self):
+        (self.root / "a.md").write_text("alpha")
+        self.process("a.md")
+        (self.root / "b.md").write_text("alpha")
+        result, = self.process("b.md")
+
+        self.assertEqual(self.watcher.processed, ["a.md"])
+        self.assertEqual(result["analysis"], "analysis of alpha")
+        self.assertEqual((result["filename"], result["duplicate_of"]), ("b.md", str(self.root / "a.md")))
+        self.assertTrue(self.watcher.journal.is_unchanged(self.root / "b.md"))
+
+    def test_renames_update_metadata_only(self):
+        (self.root / "a.md").write_text("alpha")
+        self.process("a.md")
+        os.rename(self.root / "a.md", self.root / "renamed.md")
+        self.watcher.journal.remove(self.root / "a.md")
+        result, = self.process("renamed.md")
+
+        self.assertEqual(self.watcher.processed, ["a.md"])
+        self.assertEqual(result["renamed_from"], str(self.root / "a.md"))
+        self.assertIsNone(self.watcher.journal.get(self.root / "a.md"))
+
+        (self.root / "c.md").write_text("gamma")
+        self.process("c.md")
+        self.assertEqual(self.watcher.processed, ["a.md", "c.md"])
+        dedupe = FileWatchingAgent._get_metrics(self.watcher)["dedupe"]
+        self.assertEqual(dedupe, {"processed": 2, "renamed": 1, "duplicate": 0, "hit_rate": 1 / 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# tests/crew/test_keyword_stats.py
+
+import sys
+import os
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.keyword_stats import (
+    DocumentFrequencyTable,
+    extract_keywords_local,
+    rake_phrases,
+    tokenize
+)
+from crew.tools.LLM_keyword_extractor_tool import create_keyword_extraction_tool
+
+DOCUMENT = """
+Vector databases store embeddings for semantic search. The vector database
+indexes each embedding with HNSW so that semantic search over embeddings stays fast.
+We benchmarked pgvector and Qdrant against a FAISS baseline on llama3 embeddings.
+"""
+
+CORPUS = [
+    "Meeting notes about the quarterly budget and hiring plan.",
+    "Recipe for bread: flour, water, salt and yeast.",
+    "Notes on the hiring plan for the search team.",
+]
+
+
+class CountingClient:
+    """Mock LLM client that records prompts."""
+
+    def __init__(self, response='{"primary_keywords": ["vector database"], "secondary_keywords": []}'):
+        self.response = response
+        self.prompts = []
+
+    def generate(self, prompt, model=None, options=None):
+        self.prompts.append(prompt)
+        return self.response
+
+
+class TestKeywordStats(unittest.TestCase):
+    """Test cases for the local keyword extractor."""
+
+    def test_tokenize_drops_stopwords(self):
+        self.assertEqual(tokenize("The cat and the HAT"), ["cat", "hat"])
+
+    def test_rake_scores_phrases(self):
+        scores = rake_phrases("semantic search is fast. semantic search scales.")
+        self.assertIn("semantic search", scores)
+        self.assertGreater(scores["semantic search"], scores.get("fast", 0))
+
+    def test_idf_downweights_common_terms(self):
+        table = DocumentFrequencyTable()
+        for text in CORPUS:
+            table.add_document(text)
+        self.assertGreater(table.idf("embeddings"), table.idf("hiring"))
+
+    def test_readding_document_replaces_terms(self):
+        table = DocumentFrequencyTable()
+        table.add_document("alpha beta", document_id="a.md")
+        table.add_document("alpha gamma", document_id="a.md")
+        self.assertEqual(table.document_count, 1)
+        self.assertEqual(table.document_frequency["beta"], 0)
+        self.assertEqual(table.document_frequency["gamma"], 1)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "df.json")
+            table = DocumentFrequencyTable(path)
+            table.add_document("alpha beta", document_id="a.md")
+            table.save()
+            self.assertEqual(DocumentFrequencyTable(path).document_frequency["alpha"], 1)
+
+    def test_local_structure(self):
+        table = DocumentFrequencyTable()
+        for text in CORPUS:
+            table.add_document(text)
+        result = extract_keywords_local(DOCUMENT, table)
+        self.assertTrue(any("semantic search" in k for k in result["primary_keywords"]))
+        self.assertIn("HNSW", result["technical_terms"])
+        self.assertIn("llama3", result["technical_terms"])
+        self.assertGreater(result["confidence"], 0)
+
+    def test_empty_content(self):
+        result = extract_keywords_local("", DocumentFrequencyTable())
+        self.assertEqual(result["primary_keywords"], [])
+        self.assertEqual(result["confidence"], 0.0)
+
+
+class TestTieredKeywordTool(unittest.TestCase):
+    """Test cases for the keyword tool's local and tiered modes."""
+
+    def test_local_mode_skips_llm(self):
+        client = CountingClient()
+        tool = create_keyword_extraction_tool(client, mode="local")
+        result = tool.func(DOCUMENT)
+        self.assertEqual(client.prompts, [])
+        self.assertEqual(result["source"], "local")
+        for key in ("primary_keywords", "secondary_keywords", "technical_terms"):
+            self.assertIn(key, result)
+
+    def test_tiered_refines_low_confidence(self):
+        client = CountingClient()
+        tool = create_keyword_extraction_tool(client, mode="tiered", confidence_threshold=0.99)
+        result = tool.func(DOCUMENT)
+        self.assertEqual(len(client.prompts), 1)
+        self.assertIn("Candidates:", client.prompts[0])
+        self.assertEqual(result["source"], "llm_refined")
+        self.assertEqual(result["primary_keywords"], ["vector database"])
+
+    def test_tiered_skips_llm_when_confident(self):
+        client = CountingClient()
+        tool = create_keyword_extraction_tool(client, mode="tiered", confidence_threshold=0.0)
+        self.assertEqual(tool.func(DOCUMENT)["source"], "local")
+        self.assertEqual(client.prompts, [])
+
+    def test_refine_failure_keeps_local_result(self):
+        tool = create_keyword_extraction_tool(CountingClient("not json"), mode="tiered",
+                                              confidence_threshold=0.99)
+        result = tool.func(DOCUMENT)
+        self.assertEqual(result["source"], "local")
+        self.assertIn("refine_error", result)
+        self.assertTrue(result["primary_keywords"])
+
+    def test_corpus_updated_incrementally(self):
+        table = DocumentFrequencyTable()
+        tool = create_keyword_extraction_tool(CountingClient(), mode="local", frequency_table=table)
+        tool.func(DOCUMENT, document_id="a.md")
+        tool.func(DOCUMENT, document_id="a.md")
+        tool.func(CORPUS[0], document_id="b.md")
+        self.assertEqual(table.document_count, 2)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            create_keyword_extraction_tool(CountingClient(), mode="fast")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# tests/crew/test_note_classifier.py
+
+import sys
+import os
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.note_classifier import classify_many, classify_directory, classify_record, read_records
+from crew.agents.classification_agent import ClassificationAgent
+
+NOTES = {
+    "talk.md": "---\ntitle: Talk\n---\nWatched a #YouTube talk\n",
+    "howto.md": "Steps of the #workflow\n",
+    "plain.txt": "Nothing tagged here\n",
+    "nested/book.md": "Reading a #book\n",
+    ".obsidian/workspace.md": "#video\n",
+}
+
+
+class TestNoteClassifier(unittest.TestCase):
+    """Test cases for bulk note classification."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for name, text in NOTES.items():
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _types(self, records):
+        return {Path(r["path"]).relative_to(self.root).as_posix(): r["content_type"] for r in records}
+
+    def test_classify_directory_applies_excludes(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            records = list(classify_directory(self.root, workers=1, chunk_size=2))
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(self._types(records), {
+            "talk.md": "video", "howto.md": "process", "plain.txt": "note", "nested/book.md": "book"
+        })
+        talk = next(r for r in records if r["path"].endswith("talk.md"))
+        self.assertEqual(talk["metadata"], {"title": "Talk"})
+        self.assertEqual(talk["storage"], {"obsidian": True, "vector_db": True, "sql_db": False})
+
+    def test_process_pool_matches_inline_and_keeps_order(self):
+        paths = sorted(self.root.glob("*.*")) * 3
+        inline = list(classify_many(paths, workers=1))
+        pooled = list(classify_many(paths, workers=2, chunk_size=1, ordered=True))
+        self.assertEqual(pooled, inline)
+        self.assertEqual([r["path"] for r in pooled], [str(p) for p in paths])
+
+    def test_missing_file_is_reported_in_its_record(self):
+        record = classify_record(self.root / "missing.md")
+        self.assertIn("error", record)
+        self.assertEqual(record["storage"], {"obsidian": True, "vector_db": False, "sql_db": False})
+
+    def test_jsonl_output(self):
+        output = self.root / ".crew" / "records.jsonl"
+        records = list(classify_directory(self.root, workers=1, output=output))
+        with open(output, encoding="utf-8") as f:
+            written = [json.loads(line) for line in f]
+        self.assertEqual(written, records)
+
+    def test_parquet_output(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        output = self.root / ".crew" / "records.parquet"
+        records = list(classify_directory(self.root, workers=1, output=output))
+        table = pq.read_table(str(output)).to_pylist()
+        self.assertEqual([row["path"] for row in table], [r["path"] for r in records])
+        talk = next(row for row in table if row["path"].endswith("talk.md"))
+        self.assertEqual((talk["hashtags"], json.loads(talk["metadata"])), (["youtube"], {"title": "Talk"}))
+        self.assertEqual(list(read_records(output)), records)
+
+    def test_agent_classify_content_matches_records(self):
+        with redirect_stdout(io.StringIO()):
+            classification = ClassificationAgent._classify_content(None, self.root / "howto.md")
+        record = next(ClassificationAgent._classify_many(None, [self.root / "howto.md"], workers=1))
+        self.assertEqual(classification["content_type"], record["content_type"])
+        self.assertEqual(classification["storage"], record["storage"])
+
+
+if __name__ == '__main__':
+    unittest.main()
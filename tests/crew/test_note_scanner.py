@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# tests/crew/test_note_scanner.py
+
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils import note_scanner
+from crew.utils.note_scanner import scan_note, find_hashtags, parse_frontmatter
+from crew.agents.classification_agent import ClassificationAgent
+
+NOTE = """---
+title: Weekly review
+color: "#ff0000"
+---
+# Review
+
+Watched a #YouTube talk on #Café—culture, see #video and #video again.
+"""
+
+
+class TestNoteScanner(unittest.TestCase):
+    """Test cases for the single-pass note scanner."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "note.md"
+        self.path.write_text(NOTE, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_frontmatter_and_body_hashtags(self):
+        scan = scan_note(self.path)
+        self.assertEqual(scan.metadata, {"title": "Weekly review", "color": "#ff0000"})
+        # Tags come from the body only, lowercased and deduplicated
+        self.assertEqual(scan.hashtags, ["café", "video", "youtube"])
+        self.assertEqual(scan.size, len(NOTE.encode("utf-8")))
+
+    def test_unicode_tags_match_str_semantics(self):
+        self.assertEqual(find_hashtags("#naïve #東京 #tag—rest #a_b".encode("utf-8")),
+                         ["a_b", "naïve", "tag", "東京"])
+
+    def test_hashtags_split_across_chunks(self):
+        # Every chunk size cuts some tag, or a multi-byte character in one
+        for chunk_size in range(1, 24):
+            with mock.patch.object(note_scanner, "CHUNK_SIZE", chunk_size):
+                self.assertEqual(scan_note(self.path).hashtags, ["café", "video", "youtube"], chunk_size)
+
+    def test_frontmatter_is_parsed_as_yaml(self):
+        self.assertEqual(parse_frontmatter("tags: [a, b]\ncreated: 2024-01-05\ncount: 3\nnested:\n  key: value"), {
+            "tags": ["a", "b"], "created": "2024-01-05", "count": 3, "nested": {"key": "value"}
+        })
+        # Invalid YAML falls back to key: value lines
+        self.assertEqual(parse_frontmatter("title: a: b\nlink: [[Note]"), {"title": "a: b", "link": "[[Note]"})
+
+    def test_frontmatter_larger_than_the_cap_is_skipped(self):
+        with mock.patch.object(note_scanner, "FRONTMATTER_MAX_BYTES", 16):
+            scan = scan_note(self.path)
+        self.assertEqual(scan.metadata, {})
+        self.assertEqual(scan.hashtags, ["café", "ff0000", "video", "youtube"])
+
+    def test_file_without_frontmatter(self):
+        self.path.write_text("Plain note #Idea\n---\nnot: frontmatter\n---\n")
+        scan = scan_note(self.path)
+        self.assertEqual((scan.metadata, scan.hashtags), ({}, ["idea"]))
+
+    def test_classification_reads_the_file_once(self):
+        with mock.patch("builtins.open", wraps=open) as opened:
+            classification = ClassificationAgent._classify_content(None, self.path)
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(classification["content_type"], "video")
+        self.assertEqual(classification["metadata"]["title"], "Weekly review")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# tests/crew/test_output_budgets.py
+
+import sys
+import os
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.interfaces.ollama_llm_client import OllamaClient
+from crew.tools.base_tool import BaseTool
+from crew.tools.schemas import output_budget, is_truncated, TOOL_SCHEMAS, BUDGET_RETRY_FACTOR
+from crew.tools.LLM_primary_theme_extractor_tool import create_theme_extraction_tool
+
+THEME = json.dumps({"primary_theme": "Local inference", "secondary_themes": ["cost"]})
+
+
+class BudgetClient:
+    """Mock LLM client returning queued responses and recording options."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.options = []
+
+    def generate(self, prompt, model=None, options=None):
+        self.options.append(options)
+        return self.responses.pop(0)
+
+
+class TestOutputBudgets(unittest.TestCase):
+    """Test cases for schema-derived output budgets."""
+
+    def test_every_schema_has_a_budget(self):
+        for tool_type in TOOL_SCHEMAS:
+            budget = output_budget(tool_type)
+            self.assertGreater(budget["num_predict"], 0, tool_type)
+            self.assertTrue(budget["stop"])
+
+        # Short outputs get smaller budgets than long ones
+        self.assertLess(output_budget("keyword_extraction")["num_predict"],
+                        output_budget("summary_generation/executive")["num_predict"])
+        self.assertIsNone(output_budget("unknown_tool"))
+
+    def test_is_truncated(self):
+        self.assertTrue(is_truncated('{"primary_theme": "Local'))
+        self.assertTrue(is_truncated('```json\n{"a": ["x", {"b": 1}'))
+        self.assertFalse(is_truncated('{"a": "}{"} and some trailing text'))
+        self.assertFalse(is_truncated("no json at all"))
+
+    def test_tool_call_carries_budget(self):
+        client = BudgetClient([THEME])
+        result = create_theme_extraction_tool(client).func("Some content")
+        self.assertEqual(result["primary_theme"], "Local inference")
+        self.assertEqual(client.options, [output_budget("theme_extraction")])
+
+    def test_truncated_response_retried_once_with_larger_budget(self):
+        client = BudgetClient(['{"primary_theme": "Loc', THEME])
+        response = BaseTool.generate(client, "prompt", "theme_extraction")
+        self.assertEqual(response, THEME)
+        first, second = client.options
+        self.assertEqual(second["num_predict"], first["num_predict"] * BUDGET_RETRY_FACTOR)
+
+        client = BudgetClient(['{"primary_theme": "Loc', '{"primary_theme": "Loca'])
+        BaseTool.generate(client, "prompt", "theme_extraction")
+        self.assertEqual(len(client.options), 2)
+
+    def test_caller_options_without_budget_are_not_retried(self):
+        client = BudgetClient(['{"primary_theme": "Loc'])
+        response = BaseTool.generate(client, "prompt", "theme_extraction", options={"temperature": 0.2})
+        self.assertEqual(client.options, [{"temperature": 0.2}])
+        self.assertEqual(json.loads(response)["primary_theme"], "Loc")
+
+    def test_ollama_nests_model_options(self):
+        client = OllamaClient(auto_detect_models=False)
+        response = MagicMock()
+        response.json.return_value = {"response": "ok"}
+        with patch("crew.interfaces.ollama_llm_client.requests.post", return_value=response) as post:
+            client.generate("prompt", options={"num_predict": 128, "stop": ["\n\n\n"], "format": "json"})
+
+        payload = post.call_args.kwargs["json"]
+        self.assertEqual(payload["format"], "json")
+        self.assertEqual(payload["options"]["num_predict"], 128)
+        self.assertEqual(payload["options"]["stop"], ["\n\n\n"])
+        self.assertEqual(payload["options"]["temperature"], client.temperature)
+
+
+if __name__ == '__main__':
+    unittest.main()
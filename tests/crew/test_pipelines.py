@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# tests/crew/test_pipelines.py
+
+import sys
+import os
+import time
+import threading
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.pipelines.dag_pipeline import DAGPipeline, PipelineStage
+from crew.pipelines.document_analysis import analyze_document, stream_document_analysis
+from crew.pipelines.incremental_analysis import IncrementalAnalyzer
+from crew.tools.LLM_section_analyzer_tool import create_section_analyzer_tool
+from crew.utils.markdown_splitter import split_sections
+from crew.utils.helpers import merge_results
+from crew.utils.result_cache import ResultCache
+
+
+SAMPLE_DOCUMENT = """---
+title: Sample
+---
+Intro paragraph before any heading.
+
+# Overview
+Alice works at Acme Corp in Berlin.
+
+## Setup
+1. Install the package
+2. Run the tests
+
+```python
+# not a heading
+print("hello")
+```
+
+# Results
+The results were good.
+"""
+
+
+class SectionKeywordClient:
+    """Mock LLM client returning a keyword list derived from the prompt."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, model=None, options=None):
+        with self.lock:
+            self.calls.append(prompt)
+        if "Berlin" in prompt:
+            return '{"primary_keywords": ["acme", "berlin"], "people": ["Alice"]}'
+        return '{"primary_keywords": ["acme", "results"], "people": []}'
+
+
+class TestMarkdownSplitter(unittest.TestCase):
+    """Test cases for the local markdown splitter."""
+
+    def test_headings_and_levels(self):
+        sections = split_sections(SAMPLE_DOCUMENT)
+        titles = [(s["section_title"], s["section_level"]) for s in sections]
+        self.assertEqual(titles, [("", 0), ("Overview", 1), ("Setup", 2), ("Results", 1)])
+
+    def test_frontmatter_and_code_fences(self):
+        sections = split_sections(SAMPLE_DOCUMENT)
+        self.assertNotIn("title: Sample", sections[0]["content"])
+        self.assertIn("# not a heading", sections[2]["content"])
+
+    def test_word_count(self):
+        sections = split_sections("# Title\none two three\n\nfour")
+        self.assertEqual(sections[0]["word_count"], 4)
+
+    def test_plain_text_is_single_section(self):
+        sections = split_sections("just some text\nwithout headings")
+        self.assertEqual(len(sections), 1)
+        self.assertEqual(sections[0]["section_level"], 0)
+
+    def test_max_words_splits_on_paragraphs(self):
+        content = "# Big\n" + "\n\n".join(["word " * 10] * 5)
+        sections = split_sections(content, max_words=20)
+        self.assertEqual(len(sections), 3)
+        self.assertTrue(all(s["word_count"] <= 20 for s in sections))
+
+
+class TestLocalSectionAnalyzer(unittest.TestCase):
+    """Test cases for the section analyzer's local outline."""
+
+    def test_counts_are_local_and_key_points_merged(self):
+        class OutlineClient:
+            prompts = []
+
+            def generate(self, prompt, model=None, options=None):
+                self.prompts.append(prompt)
+                return ('{"document_type": "note", "structure_quality": "Good", "suggestions": [], '
+                        '"section_key_points": [{"section": 2, "key_points": ["Alice at Acme"]}]}')
+
+        client = OutlineClient()
+        result = create_section_analyzer_tool(client).func(SAMPLE_DOCUMENT)
+
+        self.assertIn("2. [H1] Overview (7 words)", client.prompts[0])
+        self.assertEqual([s["section_title"] for s in result["sections"]], ["", "Overview", "Setup", "Results"])
+        self.assertEqual(result["sections"][1]["word_count"], 7)
+        self.assertEqual(result["sections"][1]["key_points"], ["Alice at Acme"])
+        self.assertEqual(result["sections"][2]["key_points"], [])
+        self.assertEqual(result["structure_quality"], "Good")
+
+
+class TestDAGPipeline(unittest.TestCase):
+    """Test cases for the DAG pipeline engine."""
+
+    def test_map_and_reduce(self):
+        pipeline = DAGPipeline([
+            PipelineStage("items", lambda ctx: list(range(ctx["n"]))),
+            PipelineStage("squares", lambda item, ctx: item * item, map_over="items"),
+            PipelineStage("total", lambda ctx: sum(ctx["squares"]), depends_on=["squares"])
+        ], max_workers=3)
+
+        results = pipeline.run({"n": 4})
+        self.assertEqual(results["squares"], [0, 1, 4, 9])
+        self.assertEqual(results["total"], 14)
+
+    def test_streams_items_before_later_stages(self):
+        pipeline = DAGPipeline([
+            PipelineStage("items", lambda ctx: [0.05, 0.0]),
+            PipelineStage("slept", lambda item, ctx: time.sleep(item) or item, map_over="items"),
+            PipelineStage("done", lambda ctx: True, depends_on=["slept"])
+        ], max_workers=2)
+
+        events = [(e["event"], e.get("stage"), e.get("index")) for e in pipeline.stream()]
+        self.assertEqual(events[1], ("item_completed", "slept", 1))
+        self.assertLess(events.index(("item_completed", "slept", 0)),
+                        events.index(("stage_completed", "done", None)))
+        self.assertEqual(events[-1][0], "pipeline_completed")
+
+    def test_bounded_parallelism(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def work(item, ctx):
+            with lock:
+                active.append(item)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(item)
+
+        DAGPipeline([
+            PipelineStage("items", lambda ctx: list(range(8))),
+            PipelineStage("work", work, map_over="items")
+        ], max_workers=2).run()
+        self.assertLessEqual(max(peak), 2)
+
+    def test_stage_errors_are_reported(self):
+        def fail(ctx):
+            raise RuntimeError("boom")
+
+        results = DAGPipeline([PipelineStage("bad", fail)]).run()
+        self.assertIn("error", results["bad"])
+
+    def test_cycle_rejected(self):
+        with self.assertRaises(ValueError):
+            DAGPipeline([
+                PipelineStage("a", lambda ctx: 1, depends_on=["b"]),
+                PipelineStage("b", lambda ctx: 1, depends_on=["a"])
+            ])
+
+
+class TestDocumentAnalysis(unittest.TestCase):
+    """Test cases for the document analysis pipeline."""
+
+    def test_fan_out_and_merge(self):
+        client = SectionKeywordClient()
+        result = analyze_document(client, SAMPLE_DOCUMENT, max_workers=4)
+
+        # 4 non-empty sections x 3 tools
+        self.assertEqual(len(client.calls), 12)
+        self.assertEqual(result["keywords"]["primary_keywords"], ["acme", "results", "berlin"])
+        self.assertEqual(result["entities"]["people"], ["Alice"])
+        self.assertEqual(len(result["sections"]), 4)
+
+    def test_stream_yields_partial_results(self):
+        events = list(stream_document_analysis(SectionKeywordClient(), SAMPLE_DOCUMENT))
+        item_events = [e for e in events if e["event"] == "item_completed"]
+        self.assertEqual(len(item_events), 12)
+        self.assertEqual(events[-1]["event"], "pipeline_completed")
+
+    def test_merge_results(self):
+        merged = merge_results([
+            {"tags": ["A", "b"], "has_processes": False, "title": ""},
+            {"tags": ["a", "c"], "has_processes": True, "title": "x", "error": "bad"}
+        ])
+        self.assertEqual(merged["tags"], ["A", "b", "c"])
+        self.assertTrue(merged["has_processes"])
+        self.assertEqual(merged["title"], "x")
+        self.assertEqual(merged["errors"], ["bad"])
+
+
+class TestIncrementalAnalysis(unittest.TestCase):
+    """Test cases for section-hash incremental analysis."""
+
+    def test_only_changed_sections_are_reanalyzed(self):
+        client = SectionKeywordClient()
+        analyzer = IncrementalAnalyzer(client, cache=ResultCache())
+
+        first = analyzer.analyze(SAMPLE_DOCUMENT, document_id="note.md")
+        self.assertEqual(first["incremental"]["llm_calls"], 12)
+        self.assertEqual(first["incremental"]["skipped_fraction"], 0.0)
+
+        edited = SAMPLE_DOCUMENT.replace("The results were good.", "The results were great.")
+        client.calls = []
+        second = analyzer.analyze(edited, document_id="note.md")
+
+        self.assertEqual(len(client.calls), 3)
+        self.assertEqual(second["incremental"]["changed_sections"], 1)
+        self.assertAlmostEqual(second["incremental"]["skipped_fraction"], 0.75)
+        self.assertEqual(second["entities"]["people"], ["Alice"])
+
+    def test_cache_persists_between_instances(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sections.db")
+            IncrementalAnalyzer(SectionKeywordClient(), cache_path=path).analyze(SAMPLE_DOCUMENT)
+
+            client = SectionKeywordClient()
+            result = IncrementalAnalyzer(client, cache_path=path).analyze(SAMPLE_DOCUMENT)
+            self.assertEqual(client.calls, [])
+            self.assertEqual(result["incremental"]["skipped_fraction"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# tests/crew/test_snapshot_scanner.py
+
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.snapshot_scanner import SnapshotScanner, PathFilter
+
+
+def age(root):
+    """Backdate every directory so the scanner trusts unchanged mtimes."""
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, ns=(1_000_000_000, 1_000_000_000))
+
+
+class TestSnapshotScanner(unittest.TestCase):
+    """Test cases for recursive snapshots."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for relative in ["inbox/a.md", "inbox/deep/b.md", "README", ".obsidian/app.json",
+                         ".git/HEAD", "archive/old.md.swp"]:
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(relative)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_first_scan_finds_nested_files_and_applies_excludes(self):
+        scanner = SnapshotScanner(self.root)
+        diff = scanner.scan()
+        self.assertEqual(sorted(diff.added), [self.root / "README", self.root / "inbox/a.md",
+                                              self.root / "inbox/deep/b.md"])
+        self.assertEqual(sorted(scanner.files), sorted(diff.added))
+
+    def test_unchanged_directories_are_not_listed(self):
+        scanner = SnapshotScanner(self.root)
+        scanner.scan()
+        age(self.root)
+        scanner.scan()
+        listed = scanner.stats["dirs_listed"]
+
+        self.assertEqual(len(scanner.scan()), 0)
+        self.assertEqual(scanner.stats["dirs_listed"], listed)
+        self.assertGreater(scanner.stats["dirs_skipped"], 0)
+
+        # In-place edits do not touch the directory, but are still seen
+        (self.root / "inbox/deep/b.md").write_text("edited contents")
+        diff = scanner.scan()
+        self.assertEqual(diff.modified, [self.root / "inbox/deep/b.md"])
+        self.assertEqual(scanner.stats["dirs_listed"], listed)
+
+    def test_added_and_removed_entries(self):
+        scanner = SnapshotScanner(self.root)
+        scanner.scan()
+        (self.root / "inbox/deep/c.md").write_text("new")
+        os.remove(self.root / "README")
+        for name in os.listdir(self.root / "inbox/deep"):
+            if name == "b.md":
+                os.remove(self.root / "inbox/deep" / name)
+
+        diff = scanner.scan()
+        self.assertEqual(diff.added, [self.root / "inbox/deep/c.md"])
+        self.assertEqual(sorted(diff.removed), [self.root / "README", self.root / "inbox/deep/b.md"])
+
+        os.remove(self.root / "inbox/deep/c.md")
+        os.rmdir(self.root / "inbox/deep")
+        self.assertEqual(scanner.scan().removed, [self.root / "inbox/deep/c.md"])
+
+    def test_path_filter(self):
+        path_filter = PathFilter(include=["*.md", "docs/*.txt"], exclude=["templates/", "drafts/*.md"])
+        self.assertTrue(path_filter.file_allowed("a.md", "notes/a.md"))
+        self.assertTrue(path_filter.file_allowed("x.txt", "docs/x.txt"))
+        self.assertFalse(path_filter.file_allowed("x.txt", "notes/x.txt"))
+        self.assertFalse(path_filter.file_allowed("d.md", "drafts/d.md"))
+        self.assertFalse(path_filter.dir_allowed("templates", "notes/templates"))
+        self.assertTrue(path_filter.dir_allowed(".git", ".git"))
+
+
+if __name__ == '__main__':
+    unittest.main()
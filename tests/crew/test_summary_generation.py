@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# tests/crew/test_summary_generation.py
+
+import sys
+import os
+import threading
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.tools.LLM_summary_generation_tool import create_summary_generation_tool, DEFAULT_CHUNK_MODEL
+from crew.utils.helpers import chunk_text, estimate_tokens
+
+
+class SummaryClient:
+    """Mock LLM client: short text for chunk prompts, JSON for final prompts."""
+
+    def __init__(self, failing=None):
+        self.calls = []
+        self.lock = threading.Lock()
+        # Chunk prompts containing this text fail like an unreachable server
+        self.failing = failing
+
+    def generate(self, prompt, model=None, options=None):
+        with self.lock:
+            self.calls.append({"prompt": prompt, "model": model})
+        if "EXCERPT:" in prompt:
+            if self.failing is not None and self.failing in prompt:
+                return "Error: connection refused"
+            return "condensed part."
+        if "technical_summary" in prompt:
+            return '{"technical_summary": "done", "next_steps": ["a"]}'
+        return '{"executive_summary": "done", "key_points": ["a"]}'
+
+    def chunk_calls(self):
+        return [call for call in self.calls if "EXCERPT:" in call["prompt"]]
+
+
+BOOK = "\n\n".join(f"Paragraph {i} " + "lorem ipsum dolor " * 40 for i in range(60))
+
+
+class TestChunking(unittest.TestCase):
+    """Test cases for token-based chunking."""
+
+    def test_chunks_respect_budget(self):
+        chunks = chunk_text(BOOK, 500)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(estimate_tokens(chunk) <= 500 for chunk in chunks))
+
+    def test_oversized_paragraph_is_split(self):
+        chunks = chunk_text("word " * 1000, 100)
+        self.assertTrue(all(estimate_tokens(chunk) <= 100 for chunk in chunks))
+        self.assertEqual(" ".join(chunks).split(), ["word"] * 1000)
+
+
+class TestHierarchicalSummary(unittest.TestCase):
+    """Test cases for map-reduce summarization."""
+
+    def test_short_content_single_prompt(self):
+        client = SummaryClient()
+        result = create_summary_generation_tool(client).func("A short note.")
+        self.assertEqual(len(client.calls), 1)
+        self.assertNotIn("hierarchical", result)
+        self.assertEqual(result["executive_summary"], "done")
+
+    def test_long_content_map_reduce(self):
+        client = SummaryClient()
+        tool = create_summary_generation_tool(client, chunk_model="llama3.2:latest",
+                                              hierarchical_threshold_tokens=1000, chunk_tokens=800)
+        result = tool.func(BOOK)
+
+        chunk_calls = client.chunk_calls()
+        self.assertEqual(len(chunk_calls), result["hierarchical"]["chunks"])
+        self.assertTrue(all(call["model"] == "llama3.2:latest" for call in chunk_calls))
+        self.assertIsNone(client.calls[-1]["model"])
+        self.assertIn("[Part 1]", client.calls[-1]["prompt"])
+
+    def test_chunks_default_to_small_model(self):
+        client = SummaryClient()
+        tool = create_summary_generation_tool(client, hierarchical_threshold_tokens=1000, chunk_tokens=800)
+        tool.func(BOOK)
+        self.assertTrue(all(call["model"] == DEFAULT_CHUNK_MODEL for call in client.chunk_calls()))
+
+    def test_failed_chunks_are_left_out(self):
+        client = SummaryClient(failing="Paragraph 1 ")
+        tool = create_summary_generation_tool(client, hierarchical_threshold_tokens=1000, chunk_tokens=800)
+        result = tool.func(BOOK)
+
+        self.assertEqual(result["hierarchical"]["chunks_failed"], 1)
+        self.assertNotIn("Error:", client.calls[-1]["prompt"])
+        self.assertEqual(result["executive_summary"], "done")
+
+        # Failed chunks are not cached, so they are retried
+        client.failing = None
+        client.calls = []
+        tool.func(BOOK)
+        self.assertEqual(len(client.chunk_calls()), 1)
+
+    def test_all_chunks_failed(self):
+        client = SummaryClient(failing="EXCERPT:")
+        tool = create_summary_generation_tool(client, hierarchical_threshold_tokens=1000, chunk_tokens=800)
+        result = tool.func(BOOK)
+
+        self.assertIn("error", result)
+        self.assertEqual(result["hierarchical"]["chunks_failed"], result["hierarchical"]["chunks"])
+        self.assertEqual(client.calls, client.chunk_calls())
+
+    def test_variant_switch_reuses_map_stage(self):
+        client = SummaryClient()
+        tool = create_summary_generation_tool(client, hierarchical_threshold_tokens=1000, chunk_tokens=800)
+        tool.func(BOOK, "executive")
+
+        client.calls = []
+        result = tool.func(BOOK, "technical")
+        self.assertEqual(client.chunk_calls(), [])
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(result["hierarchical"]["chunks_cached"], result["hierarchical"]["chunks"])
+
+    def test_invalid_json_reports_error(self):
+        class BadClient:
+            def generate(self, prompt, model=None, options=None):
+                return "not json"
+
+        result = create_summary_generation_tool(BadClient()).func("text", "technical")
+        self.assertIn("error", result)
+        self.assertIn("technical_summary", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# tests/crew/test_tool_plans.py
+
+import sys
+import os
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.pipelines.tool_plans import ToolPlanner, TOOL_FACTORIES
+
+NOTE = "word " * 200
+
+
+class JSONClient:
+    """Mock LLM client returning an empty JSON object."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompt, model=None, options=None):
+        self.prompts.append(prompt)
+        return '{"ok": true}'
+
+
+class TestToolPlanner(unittest.TestCase):
+    """Test cases for content-type driven tool plans."""
+
+    def test_tiny_note_has_no_llm_tools(self):
+        planner = ToolPlanner()
+        plan = planner.plan({"content_type": "note", "hashtags": []}, "short note")
+        self.assertEqual(plan["tools"], {"keyword_extraction": {"mode": "local"}})
+
+        client = JSONClient()
+        results = planner.execute(plan, "short note", llm_client=client)
+        self.assertEqual(client.prompts, [])
+        self.assertEqual(results["keyword_extraction"]["source"], "local")
+
+    def test_process_extraction_only_for_processes(self):
+        planner = ToolPlanner()
+        article = planner.plan({"content_type": "article", "hashtags": []}, NOTE)
+        self.assertNotIn("process_extraction", article["tools"])
+        self.assertIn("process_extraction", article["skipped"])
+
+        tagged = planner.plan({"content_type": "note", "hashtags": ["workflow"]}, NOTE)
+        self.assertIn("process_extraction", tagged["tools"])
+
+    def test_code_analysis_only_when_code_detected(self):
+        planner = ToolPlanner()
+        plain = planner.plan({"content_type": "note", "hashtags": []}, NOTE)
+        self.assertNotIn("code_analysis", plain["tools"])
+
+        fenced = planner.plan({"content_type": "note", "hashtags": []}, NOTE + "\n```\nx = 1\n```")
+        self.assertIn("code_analysis", fenced["tools"])
+
+        source = planner.plan({"content_type": "unknown", "hashtags": [], "file_path": "a.py"}, NOTE)
+        self.assertIn("code_analysis", source["tools"])
+
+    def test_hashtag_changes_variant(self):
+        plan = ToolPlanner().plan({"content_type": "article", "hashtags": ["technical"]}, NOTE)
+        self.assertEqual(plan["tools"]["summary_generation"], {"variant": "technical"})
+
+    def test_stats(self):
+        planner = ToolPlanner()
+        planner.plan({"content_type": "note", "hashtags": []}, "tiny")
+        planner.plan({"content_type": "process", "hashtags": []}, NOTE)
+        stats = planner.stats()
+        self.assertEqual(stats["documents"], 2)
+        self.assertEqual(stats["tiny_documents"], 1)
+        self.assertEqual(stats["tools_run"]["process_extraction"], 1)
+        self.assertEqual(stats["tools_skipped"]["process_extraction"], 1)
+        self.assertAlmostEqual(stats["skip_rate"], (7 + 5) / (2 * len(TOOL_FACTORIES)))
+
+    def test_execute_drops_unsupported_options(self):
+        planner = ToolPlanner({"tiny_note_words": 0})
+        plan = planner.plan({"content_type": "process", "hashtags": []}, NOTE)
+        plan["tools"]["process_extraction"] = {"variant": "detailed"}
+        client = JSONClient()
+        results = planner.execute(plan, NOTE, llm_client=client)
+        self.assertEqual(set(results), {"process_extraction", "section_analyzer", "summary_generation"})
+        self.assertTrue(results["process_extraction"]["ok"])
+
+    def test_execute_reuses_tools_per_client(self):
+        planner = ToolPlanner({"tiny_note_words": 0})
+        plan = planner.plan({"content_type": "note", "hashtags": []}, NOTE)
+        client = JSONClient()
+        planner.execute(plan, NOTE, llm_client=client)
+        tool = planner.get_tool("keyword_extraction", client)
+        planner.execute(plan, NOTE, llm_client=client)
+        self.assertIs(planner.get_tool("keyword_extraction", client), tool)
+        self.assertIsNot(planner.get_tool("keyword_extraction", JSONClient()), tool)
+
+    def test_from_yaml(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plans.yaml")
+            with open(path, "w") as f:
+                f.write("tiny_note_words: 5\ncontent_types:\n  note:\n    theme_extraction: {}\n")
+            plan = ToolPlanner.from_yaml(path).plan({"content_type": "note", "hashtags": []}, NOTE)
+            self.assertEqual(plan["tools"], {"theme_extraction": {}})
+
+    def test_content_type_override_keeps_other_defaults(self):
+        planner = ToolPlanner({"content_types": {"note": {"theme_extraction": {}}}})
+        note = planner.plan({"content_type": "note", "hashtags": []}, NOTE)
+        video = planner.plan({"content_type": "video", "hashtags": []}, NOTE)
+        self.assertEqual(note["tools"], {"theme_extraction": {}})
+        self.assertIn("content_repurposing", video["tools"])
+
+
+if __name__ == "__main__":
+    unittest.main()
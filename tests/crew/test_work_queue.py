@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# tests/crew/test_work_queue.py
+
+import sys
+import os
+import threading
+import unittest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from crew.utils.work_queue import WorkQueue
+
+
+def square(value):
+    """Module-level handler so process workers can pickle it."""
+    return value * value
+
+
+class TestWorkQueue(unittest.TestCase):
+    """Test cases for the bounded worker pool."""
+
+    def test_items_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+        results = []
+
+        def handler(item):
+            # Only passes if three items are in flight at once
+            barrier.wait()
+            return item
+
+        with WorkQueue(handler, workers=3, on_result=lambda item, result: results.append(result)) as work:
+            for i in range(3):
+                work.submit(i)
+            self.assertTrue(work.drain(timeout=5))
+        self.assertEqual(sorted(results), [0, 1, 2])
+        self.assertEqual(work.get_stats()["completed"], 3)
+
+    def test_backpressure_when_full(self):
+        release = threading.Event()
+        work = WorkQueue(lambda item: release.wait(5), workers=1, max_queue_size=2).start()
+        self.assertTrue(work.submit("running"))
+        while work.get_stats()["in_flight"] == 0:
+            pass
+        self.assertTrue(work.submit("queued 1"))
+        self.assertTrue(work.submit("queued 2"))
+
+        self.assertTrue(work.full())
+        self.assertFalse(work.submit("rejected", timeout=0.05))
+        stats = work.get_stats()
+        self.assertEqual((stats["queue_depth"], stats["rejected"]), (2, 1))
+
+        release.set()
+        self.assertTrue(work.stop(timeout=5))
+        stats = work.get_stats()
+        self.assertEqual((stats["completed"], stats["max_queue_depth"]), (3, 2))
+        self.assertGreater(stats["blocked_seconds"], 0)
+
+    def test_stop_without_drain_drops_queued_items(self):
+        release = threading.Event()
+        work = WorkQueue(lambda item: release.wait(5), workers=1, max_queue_size=4).start()
+        for i in range(4):
+            work.submit(i)
+        while work.get_stats()["in_flight"] == 0:
+            pass
+        release.set()
+        work.stop(drain=False, timeout=5)
+        stats = work.get_stats()
+        self.assertEqual(stats["completed"] + stats["dropped"], 4)
+        with self.assertRaises(RuntimeError):
+            work.submit(5)
+
+    def test_failures_are_counted(self):
+        with WorkQueue(lambda item: 1 / item, workers=2) as work:
+            for i in range(4):
+                work.submit(i)
+        self.assertEqual((work.get_stats()["completed"], work.get_stats()["failed"]), (3, 1))
+
+    def test_process_workers(self):
+        results = {}
+        with WorkQueue(square, workers=2, mode="process",
+                       on_result=lambda item, result: results.update({item: result})) as work:
+            for i in range(5):
+                work.submit(i)
+        self.assertEqual(results, {i: i * i for i in range(5)})
+
+
+if __name__ == '__main__':
+    unittest.main()